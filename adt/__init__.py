@@ -1,37 +1,78 @@
 __all__ = ("ADT", "ADTMeta", "adt", "fieldmethod", "is_adt", "is_adt_field")
 __version__ = "0.0.2"
 
+import collections
+import collections.abc
+import copyreg
 import functools
+import importlib
+import itertools
+import operator
+import os
 import re
+import sys
 import types
-from typing import Callable, Tuple, Type, TypeVar
+import typing
+import weakref
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+
+# Default for the number of generic specialisations kept alive per ADT class.
+_GENERIC_CACHE_SIZE = 128
+# Default for the number of elements type checked in container field args, set
+# per ADT class with a '__container_sample_size__' attribute (None for all).
+_CONTAINER_SAMPLE_SIZE = 16
+
+# All ADT classes, including generic specialisations.
+_adt_classes: "weakref.WeakSet[ADTMeta]" = weakref.WeakSet()
+# Functions called with each new ADT class, e.g. for instrumentation.
+_class_hooks: List[Callable[["ADTMeta"], None]] = []
 
 
 class _FieldBase:
 
+    __slots__ = ("_args", "_hash")
+
     __arg_types__: Tuple
     __adtbase__: "ADTMeta"
+    # Index of the field in the declaration order of the ADT class.
+    _tag: int
+    # Whether the arg types allow nested fields, see _may_nest().
+    _nests: bool = True
 
     def __init__(self, *args):
-        if not hasattr(self, "__arg_types__"):
-            raise TypeError("Cannot instantiate base field class")
-        if len(args) != len(self.__arg_types__):
-            raise TypeError(
-                "Expected {} arg(s) for {!r} field, got {}".format(
-                    len(self.__arg_types__), type(self).__name__, len(args)
-                )
-            )
-        for f, t in zip(args, self.__arg_types__):
-            if not (f is t is None) and type(t) is not TypeVar and not isinstance(f, t):
-                raise TypeError(
-                    f"Expected instance of type {t.__name__!r}, got {type(f).__name__!r}"
-                )
-        self._args = args
+        # Field classes get a generated __init__, see _make_init().
+        raise TypeError("Cannot instantiate base field class")
+
+    @classmethod
+    def _unchecked(cls, *args):
+        """
+        Create an instance without checking the types of the args.
+
+        For use on hot paths where the args are already known to be valid.
+        """
+        # Field classes override this, see _make_field().
+        raise TypeError("Cannot instantiate base field class")
 
     def __repr__(self):
-        return (
-            f"{self.__class__.__qualname__}({', '.join(repr(x) for x in self._args)})"
-        )
+        args = self._args
+        if self._nests:
+            for arg in args:
+                if type(arg) is tuple or isinstance(arg, _FieldBase):
+                    # Nested fields may be arbitrarily deep, so avoid recursion.
+                    return _repr_nested(self)
+        return f"{self.__class__.__qualname__}({', '.join(repr(x) for x in args)})"
 
     def __iter__(self):
         return iter(self._args)
@@ -40,20 +81,638 @@ class _FieldBase:
         return self._args[idx]
 
     def __eq__(self, other):
-        if not (isinstance(other, type(self)) or isinstance(self, type(other))):
+        if self is other:
+            return True
+        cls = type(self)
+        other_cls = type(other)
+        # Generic specialisations and subclasses of a field compare equal to
+        # the field.
+        if cls is not other_cls and not (
+            issubclass(other_cls, cls) or issubclass(cls, other_cls)
+        ):
+            return False
+        args = self._args
+        if self._nests:
+            for arg in args:
+                if type(arg) is tuple or isinstance(arg, _FieldBase):
+                    return _eq_nested(args, other._args)
+        return args == other._args
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        args = self._args
+        if self._nests:
+            for arg in args:
+                if type(arg) is tuple or isinstance(arg, _FieldBase):
+                    _hash_nested(args)
+                    break
+        # Generic specialisations and subclasses of a field compare equal to the
+        # field, so hash on its tag (which they share) rather than the class.
+        h = hash((self._tag, args))
+        _set_hash(self, h)
+        return h
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Cannot set attribute {name!r} on immutable field")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Cannot delete attribute {name!r} on immutable field")
+
+    def __reduce__(self):
+        cls = type(self)
+        adt_cls = cls.__adtbase__
+        if adt_cls._fields.get(cls.__name__) is not cls:
+            # Subclass of a field class, pickled by reference.
+            return cls._unchecked, self._args
+        # Field classes can't be pickled by reference, so go via the ADT class.
+        return _load_field, (adt_cls, cls.__name__, self._args)
+
+
+# Slot setters that bypass the immutability of field instances.
+_set_args = _FieldBase._args.__set__
+_set_hash = _FieldBase._hash.__set__
+
+
+# Field args are compared, hashed and repr'd with explicit stacks when they
+# nest other fields, directly or in tuples, rather than recursing through each
+# nested field's methods. Fields overriding these methods are left to them.
+
+
+def _eq_nested(args: Tuple, other_args: Tuple) -> bool:
+    # Pairs of args or tuples still to compare.
+    stack = [(args, other_args)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        args, other_args = pop()
+        if len(args) != len(other_args):
             return False
-        return all(x == y for x, y in zip(iter(self), iter(other)))
+        for x, y in zip(args, other_args):
+            if x is y:
+                continue
+            x_cls = type(x)
+            if x_cls is tuple:
+                if type(y) is tuple:
+                    push((x, y))
+                    continue
+            elif x_cls.__eq__ is _field_eq:
+                y_cls = type(y)
+                if x_cls is not y_cls and not (
+                    issubclass(y_cls, x_cls) or issubclass(x_cls, y_cls)
+                ):
+                    return False
+                if x._nests:
+                    push((x._args, y._args))
+                elif x._args != y._args:
+                    return False
+                continue
+            if not x == y:
+                return False
+    return True
+
+
+def _hash_nested(args: Tuple) -> None:
+    """Cache the hashes of nested fields, innermost first."""
+    stack = [args]
+    fields = {}
+    while stack:
+        for arg in stack.pop():
+            if type(arg) is tuple:
+                stack.append(arg)
+            elif (
+                isinstance(arg, _FieldBase)
+                and type(arg).__hash__ is _field_hash
+                and not hasattr(arg, "_hash")
+                and id(arg) not in fields
+            ):
+                fields[id(arg)] = arg
+                stack.append(arg._args)
+    for field in reversed(fields.values()):
+        _set_hash(field, hash((field._tag, field._args)))
+
+
+def _repr_nested(value: _FieldBase) -> str:
+    # The stack has the fields and tuples still to expand, and the reprs of
+    # other args to output as they are.
+    stack = [value]
+    pop = stack.pop
+    push = stack.append
+    parts = []
+    while stack:
+        x = pop()
+        x_cls = type(x)
+        if x_cls is str:
+            parts.append(x)
+            continue
+        if x_cls is tuple:
+            args = x
+            parts.append("(")
+            push(",)" if len(args) == 1 else ")")
+        else:
+            args = x._args
+            parts.append(f"{x_cls.__qualname__}(")
+            push(")")
+        for i in range(len(args) - 1, -1, -1):
+            arg = args[i]
+            arg_cls = type(arg)
+            if arg_cls is tuple or (arg_cls.__repr__ is _field_repr and arg._nests):
+                push(arg)
+            else:
+                push(repr(arg))
+            if i:
+                push(", ")
+    return "".join(parts)
+
+
+_field_eq = _FieldBase.__eq__
+_field_hash = _FieldBase.__hash__
+_field_repr = _FieldBase.__repr__
+
+
+def _new_unchecked(cls, *args):
+    self = object.__new__(cls)
+    _set_args(self, args)
+    return self
+
+
+def _new_nullary(cls, *args):
+    # Fields without args are interchangeable, so share a single instance.
+    if args:
+        raise TypeError(
+            f"Expected 0 arg(s) for {cls.__name__!r} field, got {len(args)}"
+        )
+    self = cls._singleton
+    if type(self) is not cls:
+        # Subclass of a field class.
+        self = _new_unchecked(cls)
+    return self
+
+
+# Args are checked in __new__() for fields that share instances. As a slot
+# wrapper, object.__init__() is cheaper to call than a Python function, and
+# accepts the args since the field classes override __new__().
+_init_nothing = object.__init__
+
+
+_nullary_unchecked_classmethod = classmethod(_new_nullary)
+
+# Map of field classes sharing instances to their original __init__.
+_flyweight_inits: "weakref.WeakKeyDictionary[type, Callable]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _new_object(cls, *args):
+    return object.__new__(cls)
+
+
+def _make_flyweight_new(field_cls: Type, maxsize: int) -> Callable:
+    """Make a __new__ that shares instances with equal args, see flyweight()."""
+
+    # The original __init__ is looked up when instances are created, so it can
+    # be wrapped (e.g. by instrumentation) after this.
+    inits = _flyweight_inits
+
+    # Typed, so that equal args of different types (e.g. 1 and True) aren't
+    # shared.
+    @functools.lru_cache(maxsize=maxsize, typed=True)
+    def make(*args):
+        self = object.__new__(field_cls)
+        inits[field_cls](self, *args)
+        return self
+
+    def __new__(cls, *args):
+        if cls is field_cls:
+            try:
+                return make(*args)
+            except TypeError:
+                try:
+                    hash(args)
+                except TypeError:
+                    # Unhashable args, so not shared.
+                    pass
+                else:
+                    raise
+        self = object.__new__(cls)
+        # Subclasses with their own __init__ check the args themselves.
+        if cls.__init__ is _init_nothing:
+            inits[field_cls](self, *args)
+        return self
+
+    return __new__
+
+
+def _set_flyweight(field_cls: Type, maxsize: int) -> None:
+    """Share instances of a field class, see ADTMeta.flyweight()."""
+    init = _flyweight_inits.pop(field_cls, None)
+    if init is not None:
+        field_cls.__init__ = init
+        # Deleting __new__ would leave the class calling object.__new__() with
+        # the args, which raises.
+        field_cls.__new__ = _new_object
+    if maxsize > 0:
+        _flyweight_inits[field_cls] = field_cls.__init__
+        field_cls.__new__ = _make_flyweight_new(field_cls, maxsize)
+        field_cls.__init__ = _init_nothing
+
+
+def _type_name(typ) -> str:
+    if isinstance(typ, type) and typing.get_origin(typ) is None:
+        return typ.__name__
+    return repr(typ).replace("typing.", "")
+
+
+_NoneType = type(None)
+_UNION_TYPES = {typing.Union}
+if sys.version_info >= (3, 10):
+    _UNION_TYPES.add(types.UnionType)
+
+
+def _isinstance_types(typ) -> Optional[Union[type, Tuple[type, ...]]]:
+    """Get the class(es) to check a type annotation with isinstance(), if any."""
+    if typ is None:
+        return _NoneType
+    origin = typing.get_origin(typ)
+    if origin is None:
+        # Any is a class from Python 3.11.
+        return typ if isinstance(typ, type) and typ is not typing.Any else None
+    if origin in _UNION_TYPES:
+        classes = []
+        for arg in typing.get_args(typ):
+            arg_classes = _isinstance_types(arg)
+            if arg_classes is None:
+                return None
+            classes += arg_classes if type(arg_classes) is tuple else [arg_classes]
+        return tuple(classes)
+    return None
+
+
+# Compiled checks by type annotation and sample size. They're shared between
+# the fields using them, and freed along with those fields (and so with any
+# types in the annotation).
+_checks: "weakref.WeakValueDictionary[Tuple, Callable]" = weakref.WeakValueDictionary()
+
+
+def _get_check(typ, sample_size: Optional[int]) -> Optional[Callable]:
+    key = (typ, sample_size)
+    try:
+        check = _checks.get(key)
+    except TypeError:
+        # Unhashable type annotation.
+        return _compile_check(typ, sample_size)
+    if check is None:
+        check = _compile_check(typ, sample_size)
+        if check is not None:
+            _checks[key] = check
+    return check
+
+
+def _compile_check(typ, sample_size: Optional[int]) -> Optional[Callable]:
+    """
+    Compile a function checking whether a value matches a type annotation.
+
+    Returns None if any value matches. Supports classes (including ADT
+    classes), None, unions, Literal, Annotated and parametrised containers,
+    where up to sample_size elements are checked (all if None).
+    """
+    if type(typ) is TypeVar or typ is typing.Any:
+        return None
+    classes = _isinstance_types(typ)
+    if classes is not None:
+        return lambda value: isinstance(value, classes)
+    origin = typing.get_origin(typ)
+    args = typing.get_args(typ)
+    if origin is None:
+        # Not a type, so isinstance() raises as before.
+        return lambda value: isinstance(value, typ)
+    if origin is typing.Annotated:
+        return _get_check(args[0], sample_size)
+    if origin in _UNION_TYPES:
+        checks = [_get_check(arg, sample_size) for arg in args]
+        if None in checks:
+            return None
+        return lambda value: any(check(value) for check in checks)
+    if origin is typing.Literal:
+        return lambda value: any(
+            type(value) is type(arg) and value == arg for arg in args
+        )
+    if not isinstance(origin, type):
+        # E.g. ClassVar, Final.
+        return _get_check(args[0], sample_size) if args else None
+
+    if args == ((),) or (not args and typ in (Tuple[()], tuple[()])):
+        # Empty tuple, with args depending on the Python version.
+        return lambda value: isinstance(value, tuple) and not value
+    if origin is tuple and args and args[-1] is not ...:
+        checks = [_get_check(arg, sample_size) for arg in args]
+        nargs = len(args)
+        return lambda value: (
+            isinstance(value, tuple)
+            and len(value) == nargs
+            and all(c is None or c(v) for c, v in zip(checks, value))
+        )
+
+    def sample(items):
+        if sample_size is None or len(items) <= sample_size:
+            return items
+        if type(items) is list or type(items) is tuple:
+            return items[:sample_size]
+        return itertools.islice(items, sample_size)
+
+    if issubclass(origin, collections.abc.Mapping) and len(args) == 2:
+        keys_check = _all_check(args[0], sample_size)
+        values_check = _all_check(args[1], sample_size)
+        return lambda value: (
+            isinstance(value, origin)
+            and (keys_check is None or keys_check(sample(value.keys())))
+            and (values_check is None or values_check(sample(value.values())))
+        )
+    if issubclass(origin, (collections.abc.Sequence, collections.abc.Set)) and (
+        len(args) == 1 or (origin is tuple and len(args) == 2)
+    ):
+        items_check = _all_check(args[0], sample_size)
+        if items_check is not None:
+            return lambda value: isinstance(value, origin) and items_check(
+                sample(value)
+            )
+    # Other generics (e.g. Iterator, Callable) can't be checked any further
+    # without consuming or calling the value.
+    return lambda value: isinstance(value, origin)
+
+
+def _all_check(typ, sample_size: Optional[int]) -> Optional[Callable]:
+    """Compile a function checking whether all items match a type annotation."""
+    classes = _isinstance_types(typ)
+    if classes is not None:
+        # The repeat iterator is endless, so can be shared between calls.
+        repeat_classes = itertools.repeat(classes)
+        return lambda items: all(map(isinstance, items, repeat_classes))
+    check = _get_check(typ, sample_size)
+    if check is None:
+        return None
+    return lambda items: all(map(check, items))
+
+
+# Kinds of field arg types, which determine the checks in a generated __init__.
+_ARG_UNCHECKED, _ARG_NONE, _ARG_TYPE, _ARG_CHECK = range(4)
+
+
+def _make_init(arg_types: Tuple, sample_size: Optional[int]) -> Callable:
+    """
+    Generate an __init__ for a field class, unrolled for its argument types.
+
+    TypeVar entries are left unchecked, None only accepts None, and classes
+    (or unions of them) are checked with isinstance(). Other annotations are
+    checked by functions from _compile_check(). Fields without args are
+    checked by _new_nullary() instead.
+    """
+    if not arg_types:
+        return _init_nothing
+    kinds = []
+    params = [_set_args]
+    for typ in arg_types:
+        if typ is None:
+            kinds.append(_ARG_NONE)
+            params.append("Expected None, got {!r}")
+            continue
+        if type(typ) is TypeVar or typ is typing.Any:
+            kinds.append(_ARG_UNCHECKED)
+            continue
+        msg = f"Expected instance of type {_type_name(typ)!r}, got {{!r}}"
+        classes = _isinstance_types(typ)
+        if classes is not None or typing.get_origin(typ) is None:
+            # Non-types are passed to isinstance() as before, which raises.
+            kinds.append(_ARG_TYPE)
+            params += [typ if classes is None else classes, msg]
+            continue
+        check = _get_check(typ, sample_size)
+        if check is None:
+            kinds.append(_ARG_UNCHECKED)
+        else:
+            kinds.append(_ARG_CHECK)
+            params += [check, msg]
+    return _init_factory(tuple(kinds))(*params)
+
+
+def _substitute(typ, mapping: Dict[TypeVar, object]):
+    """Substitute TypeVars in a type annotation, including within generics."""
+    if type(typ) is TypeVar:
+        return mapping.get(typ, typ)
+    params = getattr(typ, "__parameters__", None)
+    if params and typing.get_origin(typ) is not None:
+        return typ[tuple(mapping.get(p, p) for p in params)]
+    return typ
+
+
+@functools.lru_cache(maxsize=None)
+def _init_factory(kinds: Tuple[int, ...]) -> Callable:
+    """
+    Compile a function that makes an __init__ for args of the given kinds.
+
+    Fields with the same kinds of args share the compiled code, with the
+    types and error messages bound as closure variables.
+    """
+    nargs = len(kinds)
+    names = [f"a{i}" for i in range(nargs)]
+    params = ["_set_args"]
+    lines = [
+        "    def __init__(self, *args):",
+        f"        if len(args) != {nargs}:",
+        "            raise TypeError(",
+        f'                "Expected {nargs} arg(s) for {{!r}} field, got {{}}".format(',
+        "                    type(self).__name__, len(args)",
+        "                )",
+        "            )",
+    ]
+    if nargs:
+        lines.append(f"        {', '.join(names)}, = args")
+    for i, (name, kind) in enumerate(zip(names, kinds)):
+        if kind == _ARG_UNCHECKED:
+            continue
+        if kind == _ARG_NONE:
+            params.append(f"msg{i}")
+            cond = f"{name} is not None"
+        elif kind == _ARG_TYPE:
+            params += [f"t{i}", f"msg{i}"]
+            cond = f"not isinstance({name}, t{i})"
+        else:
+            params += [f"check{i}", f"msg{i}"]
+            cond = f"not check{i}({name})"
+        lines += [
+            f"        if {cond}:",
+            f"            raise TypeError(msg{i}.format(type({name}).__name__))",
+        ]
+    lines += ["        _set_args(self, args)", "    return __init__"]
+    lines.insert(0, f"def factory({', '.join(params)}):")
+    globs = {}
+    exec("\n".join(lines), globs)
+    return globs["factory"]
+
+
+@functools.lru_cache(maxsize=None)
+def _make_unchecked(nargs: int) -> classmethod:
+    """
+    Compile the _unchecked() classmethod for fields with the given number of args.
+
+    Shared by fields with the same number of args. The args are packed straight
+    into the args tuple, with object.__new__() and the slot setter bound as
+    closure variables.
+    """
+    names = ", ".join(f"a{i}" for i in range(nargs))
+    lines = [
+        "def factory(new, _set_args):",
+        f"    def _unchecked(cls, {names}):",
+        "        self = new(cls)",
+        f"        _set_args(self, ({names},))",
+        "        return self",
+        "    return _unchecked",
+    ]
+    globs = {}
+    exec("\n".join(lines), globs)
+    func = globs["factory"](object.__new__, _set_args)
+    func.__doc__ = _FieldBase._unchecked.__doc__
+    return classmethod(func)
+
+
+def _may_nest(arg_types: Tuple) -> bool:
+    """
+    Whether args of the given types may be fields or tuples.
 
+    Fields whose args can't nest other fields are compared, hashed and repr'd
+    without checking for nested fields.
+    """
+    for typ in arg_types:
+        origin = typing.get_origin(typ)
+        if origin is typing.Annotated:
+            typ = typing.get_args(typ)[0]
+        elif isinstance(origin, type) and origin not in _UNION_TYPES:
+            # Parametrised containers, e.g. List[int].
+            typ = origin
+        classes = _isinstance_types(typ)
+        if classes is None:
+            return True
+        for cls in classes if type(classes) is tuple else (classes,):
+            if (
+                isinstance(cls, ADTMeta)
+                or issubclass(tuple, cls)
+                or issubclass(cls, tuple)
+                or issubclass(_FieldBase, cls)
+                or issubclass(cls, _FieldBase)
+            ):
+                return True
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _arg_property(idx: int) -> property:
+    """Property for accessing a field arg by position, shared between fields."""
+
+    def getter(self):
+        return self._args[idx]
 
-def _make_field(name: str, field_base_cls: Type, arg_types: Tuple):
-    field_cls = types.new_class(name, (field_base_cls,))
-    field_cls.__module__ = field_base_cls.__module__
-    field_cls.__arg_types__ = arg_types
+    getter.__name__ = f"_{idx}"
+    return property(getter, doc=f"Field arg at position {idx}.")
+
+
+def _make_field(
+    name: str,
+    field_base_cls: Type,
+    arg_types: Tuple,
+    qualname: str,
+    tag: int,
+    sample_size: Optional[int],
+):
+    # Positional attributes '_0', '_1', ... for use in match statements.
+    match_args = _match_args(len(arg_types))
+    ns = {
+        "__module__": field_base_cls.__module__,
+        "__qualname__": qualname,
+        "__slots__": (),
+        "_tag": tag,
+        "_nests": _may_nest(arg_types),
+        "__init__": _make_init(arg_types, sample_size),
+        "__arg_types__": arg_types,
+        "__match_args__": match_args,
+    }
+    ns.update((attr, _arg_property(i)) for i, attr in enumerate(match_args))
+    if arg_types:
+        ns["_unchecked"] = _make_unchecked(len(arg_types))
+    else:
+        ns["__new__"] = _new_nullary
+        ns["_unchecked"] = _nullary_unchecked_classmethod
+    # The field base class has no metaclass, so use type() directly.
+    field_cls = type(name, (field_base_cls,), ns)
+    if not arg_types:
+        field_cls._singleton = _new_unchecked(field_cls)
     return field_cls
 
 
+@functools.lru_cache(maxsize=None)
+def _match_args(nargs: int) -> Tuple[str, ...]:
+    return tuple(f"_{i}" for i in range(nargs))
+
+
+_CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+class _GenericCache:
+    """
+    Cache of the generic specialisations of an ADT class.
+
+    The most recently used specialisations are kept alive, up to maxsize. All
+    others are weakly referenced, so they stay cached only while in use
+    elsewhere and don't keep their type args alive.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_recent", "_live")
+
+    def __init__(self, maxsize: Optional[int]):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._recent = collections.OrderedDict()
+        self._live = weakref.WeakValueDictionary()
+
+    def get(self, key: Tuple) -> Optional["ADTMeta"]:
+        try:
+            value = self._recent[key]
+        except KeyError:
+            value = self._live.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._keep(key, value)
+        else:
+            self._recent.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Tuple, value: "ADTMeta") -> None:
+        self._live[key] = value
+        self._keep(key, value)
+
+    def _keep(self, key: Tuple, value: "ADTMeta") -> None:
+        self._recent[key] = value
+        if self.maxsize is not None and len(self._recent) > self.maxsize:
+            self._recent.popitem(last=False)
+
+    def info(self) -> _CacheInfo:
+        return _CacheInfo(self.hits, self.misses, self.maxsize, len(self._live))
+
+    def clear(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._recent.clear()
+        self._live.clear()
+
+
 class ADTMeta(type):
-    def __new__(mcs, name, bases, namespace):
+    def __new__(mcs, name, bases, namespace, *, order: bool = False):
         fieldmethods = {}
         generic_types = {}
         for attr_name, obj in list(namespace.items()):
@@ -66,62 +725,317 @@ class ADTMeta(type):
 
         namespace = dict(namespace)
         annotations = namespace.pop("__annotations__", {})
-        field_base_cls = types.new_class("_FieldBase", (_FieldBase,))
-        field_base_cls.__module__ = namespace["__module__"]
+        qualname = namespace.get("__qualname__", name)
+        if generic_types:
+            qualname += "[{}]".format(
+                ",".join(t.__name__ for t in generic_types.values())
+            )
+        field_base_cls = type(
+            "_FieldBase",
+            (_FieldBase,),
+            {
+                "__slots__": (),
+                "__module__": namespace["__module__"],
+                "__qualname__": qualname + "._FieldBase",
+            },
+        )
+
+        # Make the field classes based on the ADT class annotations, before the
+        # ADT class so that they can go in its namespace.
+        sample_size = namespace.get("__container_sample_size__", _CONTAINER_SAMPLE_SIZE)
         fields = {}
+        for tag, (field_name, arg_types) in enumerate(annotations.items()):
+            if type(arg_types) is not tuple:
+                raise TypeError(
+                    f"{field_name!r} is a badly declared field - should use a tuple of types"
+                )
+            fields[field_name] = _make_field(
+                field_name,
+                field_base_cls,
+                arg_types,
+                f"{qualname}.{field_name}",
+                tag,
+                sample_size,
+            )
+        if order:
+            _add_ordering(field_base_cls)
 
         # Make the ADT base class.
         def __new__(cls, *args, **kwargs):
             raise TypeError(f"Cannot instantiate ADT class {cls.__name__!r}")
 
+        namespace.update(fields)
         namespace.update(
             {
                 "__new__": __new__,
+                "__qualname__": qualname,
                 "_fields": fields,
                 "_generic_types": generic_types,
+                # Maximum sizes of the fields sharing instances, see flyweight().
+                "_flyweights": {},
                 "_FieldBase": field_base_cls,
+                # Index of the field classes for constant-time membership checks.
+                "_field_classes": frozenset(fields.values()),
+                # Names of the cases passed to match() that have been checked,
+                # shared with generic specialisations since they have the same
+                # fields.
+                "_checked_cases": set(),
             }
         )
         cls = super().__new__(mcs, name, bases, namespace)
-        if generic_types:
-            cls.__qualname__ += "[{}]".format(
-                ",".join(t.__name__ for t in generic_types.values())
-            )
+        cls._generic_cache = _GenericCache(
+            getattr(cls, "__generic_cache_size__", _GENERIC_CACHE_SIZE)
+        )
         field_base_cls.__adtbase__ = cls
-        field_base_cls.__qualname__ = cls.__qualname__ + "." + field_base_cls.__name__
 
-        # Make the field classes based on the ADT class annotations.
-        for field_name, arg_types in annotations.items():
-            if type(arg_types) is not tuple:
-                raise TypeError(
-                    f"{field_name!r} is a badly declared field - should use a tuple of types"
-                )
-            f = _make_field(field_name, field_base_cls, arg_types)
-            f.__qualname__ = cls.__qualname__ + "." + f.__name__
-            for method_name, method in fieldmethods.items():
-                setattr(f, method_name, _fieldmethod(method, cls, f))
-            fields[field_name] = f
-            setattr(cls, field_name, f)
+        # Fieldmethods are inherited by all the field classes from their base.
+        for method_name, method in fieldmethods.items():
+            setattr(field_base_cls, method_name, _make_fieldmethod(method, cls))
 
+        _register(cls)
         return cls
 
     def __contains__(cls, item):
-        return item in cls._fields.values() or type(item) in cls._fields.values()
+        fields = cls._field_classes
+        # Check the type first, since items may be unhashable.
+        return type(item) in fields or (isinstance(item, type) and item in fields)
+
+    def match(cls, value, **cases):
+        """
+        Call the case for the value's field with the field's args.
+
+        A case must be given for every field, keyed by field name, which is
+        checked once for each set of names. See also matcher(), which compiles
+        the cases into a reusable function.
+        """
+        names = tuple(cases)
+        if names not in cls._checked_cases:
+            _check_cases(cls, cases)
+            cls._checked_cases.add(names)
+        field_cls = type(value)
+        if field_cls not in cls._field_classes:
+            field_cls = _resolve_field(cls, field_cls)
+        return cases[field_cls.__name__](*value._args)
+
+    # Key for sorting values by field declaration order, then args, for use as
+    # e.g. sorted(values, key=MyADT.sort_key) whether or not the ADT class is
+    # ordered. Not a descriptor, so isn't bound to the ADT class.
+    sort_key = operator.attrgetter("_tag", "_args")
+
+    def matcher(cls, **cases) -> Callable:
+        """
+        Compile cases into a reusable function of a value, see match().
+
+        Dispatch is a dict lookup on the field class of the value.
+        """
+        return _make_matcher(cls, cases)
+
+    def fold(cls, value, **cases):
+        """
+        Reduce a recursive value bottom up, without recursion.
+
+        Cases are given for every field as for match(), and are called with the
+        field's args where each nested value of the ADT class, also as an item
+        of a tuple arg, has been replaced by the result of folding it.
+        """
+        dispatch, resolve = _case_table(cls, cases)
+        base = _root_field_base(cls)
+        nodes, counts = _preorder(base, value)
+        results = []
+        push = results.append
+        for node, count in zip(reversed(nodes), reversed(counts)):
+            try:
+                func = dispatch[type(node)]
+            except KeyError:
+                func = resolve(type(node))
+            if count == 0:
+                push(func(*node._args))
+                continue
+            args = node._args
+            children = results[-abs(count) :]
+            del results[-abs(count) :]
+            if count == len(args):
+                # All the args are nested values.
+                push(func(*children))
+            else:
+                push(func(*_replace_children(base, args, iter(children))))
+        return results[0]
+
+    def walk(cls, value) -> Iterator:
+        """
+        Iterate over a recursive value and its nested values, depth first.
+
+        Nested values of the ADT class are found in args as for fold(), and
+        each value is yielded before those nested in it.
+        """
+        base = _root_field_base(cls)
+        if not isinstance(value, base):
+            raise _not_a_field(cls, value)
+        return _walk(base, value)
+
+    def transform(cls, value, func: Callable):
+        """
+        Rebuild a recursive value bottom up, without recursion.
+
+        The func is called with each nested value once the values nested in it
+        have been transformed, and returns a replacement. Values with no
+        replaced args are passed on as they are rather than recreated.
+        """
+        base = _root_field_base(cls)
+        nodes, counts = _preorder(base, value)
+        results = []
+        push = results.append
+        for node, count in zip(reversed(nodes), reversed(counts)):
+            if count:
+                args = node._args
+                children = results[-abs(count) :]
+                del results[-abs(count) :]
+                if count == len(args):
+                    new_args = children
+                else:
+                    new_args = _replace_children(base, args, iter(children))
+                if any(map(operator.is_not, new_args, args)):
+                    node = type(node)(*new_args)
+            push(func(node))
+        return results[0]
+
+    def bulk_map(
+        cls,
+        values: Iterable,
+        func,
+        *args,
+        executor: Optional["concurrent.futures.Executor"] = None,
+        chunksize: Optional[int] = None,
+    ) -> List:
+        """
+        Apply func to each of the values, in chunks on an executor.
+
+        The func is one of:
+         - the name of a method or fieldmethod, called with args;
+         - a dict of cases as for matcher(), called with the field's args;
+         - a callable, called with the value and args.
+
+        Results are returned in order. With no executor the values are
+        processed in the current thread. For executors other than a
+        ThreadPoolExecutor, values of a single ADT class are sent as their
+        field tags and args, which pickle much faster than field instances.
+        """
+        if isinstance(func, dict):
+            if args:
+                raise TypeError("Args are not supported with a dict of cases")
+            _check_cases(cls, func)
+        elif not isinstance(func, str) and not callable(func):
+            raise TypeError(
+                f"Expected a method name, dict of cases or callable, got {func!r}"
+            )
+        if executor is None:
+            return list(map(_bulk_map_op(cls, func, args), values))
+
+        values = list(values)
+        if chunksize is None:
+            chunksize = -(-len(values) // (4 * (os.cpu_count() or 1))) or 1
+        chunks = (values[i : i + chunksize] for i in range(0, len(values), chunksize))
+        # Imported here since it's slow to import and pulls in logging, and
+        # is already imported wherever there's an executor.
+        import concurrent.futures
+
+        if isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            futures = [
+                executor.submit(_bulk_map_chunk, cls, func, args, chunk)
+                for chunk in chunks
+            ]
+            unpack = lambda results: results
+        else:
+            futures = [
+                executor.submit(
+                    _bulk_map_packed_chunk, cls, func, args, _pack_values(chunk)
+                )
+                for chunk in chunks
+            ]
+            unpack = _unpack_values
+        try:
+            return list(
+                itertools.chain.from_iterable(unpack(f.result()) for f in futures)
+            )
+        finally:
+            for f in futures:
+                f.cancel()
 
-    @functools.lru_cache()
     def __getitem__(cls, items):
-        """Create subclass of given class with generics filled in."""
+        """
+        Get subclass of given class with generics filled in.
+
+        Specialisations are cached per ADT class, see generic_cache_info().
+        """
         if not isinstance(items, tuple):
             items = (items,)
-        if len(items) != len(cls._generic_types):
-            raise TypeError(f"Expected exactly {len(items)} generic types")
+        new_cls = cls._generic_cache.get(items)
+        if new_cls is None:
+            if len(items) != len(cls._generic_types):
+                raise TypeError(
+                    f"Expected exactly {len(cls._generic_types)} generic types"
+                )
+            new_cls = cls._specialize(items)
+            cls._generic_cache.put(items, new_cls)
+        return new_cls
+
+    def generic_cache_info(cls) -> "_CacheInfo":
+        """
+        Get statistics for the cache of generic specialisations of the class.
+
+        The size of the cache can be set with a '__generic_cache_size__' class
+        attribute (None for unbounded). Specialisations beyond this size are
+        only weakly referenced, so may be freed and then recreated.
+        """
+        return cls._generic_cache.info()
+
+    def generic_cache_clear(cls) -> None:
+        """Clear the cache of generic specialisations of the class."""
+        cls._generic_cache.clear()
 
+    def flyweight(cls, field_name: str, maxsize: int = 128) -> None:
+        """
+        Share instances of a field between calls with equal args.
+
+        Instances are looked up by their args and the types of the args, and
+        up to maxsize are kept, evicting the least recently used. Args that
+        aren't hashable are never shared. A maxsize of 0 stops sharing.
+
+        Fields without args always share a single instance. Generic
+        specialisations of the class, existing and new, share instances of
+        their own.
+        """
+        try:
+            field_cls = cls._fields[field_name]
+        except KeyError:
+            raise KeyError(f"No field {field_name!r} in {cls.__qualname__!r}") from None
+        if not field_cls.__arg_types__:
+            return
+        adt_classes = [cls]
+        for adt_cls in adt_classes:
+            if maxsize > 0:
+                adt_cls._flyweights[field_name] = maxsize
+            else:
+                adt_cls._flyweights.pop(field_name, None)
+            _set_flyweight(adt_cls._fields[field_name], maxsize)
+            adt_classes += [
+                c
+                for c in list(_adt_classes)
+                if c.__dict__.get("_generic_origin", (None,))[0] is adt_cls
+            ]
+
+    def _specialize(cls, items: Tuple) -> "ADTMeta":
+        """Create subclass of given class with generics filled in."""
         # TODO: Send this through the main __new__() flow, fieldmethods need
         #       creating from scratch.
 
         namespace = cls.__dict__.copy()
+        namespace["_generic_types"] = namespace["_generic_types"].copy()
+        namespace["_generic_cache"] = _GenericCache(cls._generic_cache.maxsize)
+        namespace["_generic_origin"] = (cls, items)
+        namespace["_flyweights"] = cls._flyweights.copy()
         base_qualname = re.sub(r"(\[.*\])", "", cls.__qualname__)
-        item_names = "[{}]".format(",".join(x.__name__ for x in items))
+        item_names = "[{}]".format(",".join(_type_name(x) for x in items))
         namespace["__qualname__"] = f"{base_qualname}{item_names}"
 
         # Get mapping of typevars to concrete types.
@@ -136,56 +1050,73 @@ class ADTMeta(type):
             "_FieldBase",
             (cls._FieldBase,),
             {
+                "__slots__": (),
                 "__module__": cls._FieldBase.__module__,
                 "__qualname__": f"{namespace['__qualname__']}._FieldBase",
             },
         )
         namespace["_FieldBase"] = new_base_field_cls
+        sample_size = getattr(cls, "__container_sample_size__", _CONTAINER_SAMPLE_SIZE)
         new_fields = {}
         for field_name, field_cls in namespace["_fields"].items():
             __arg_types__ = tuple(
-                typevar_mapping.get(t, t) for t in field_cls.__arg_types__
+                _substitute(t, typevar_mapping) for t in field_cls.__arg_types__
             )
             new_field_cls = type(field_cls)(
                 field_name,
                 (new_base_field_cls, field_cls),
                 {
+                    "__slots__": (),
+                    "__init__": _make_init(__arg_types__, sample_size),
                     "__module__": field_cls.__module__,
                     "__qualname__": f"{namespace['__qualname__']}.{field_name}",
                     "__arg_types__": __arg_types__,
+                    "_nests": _may_nest(__arg_types__),
                 },
             )
+            if not __arg_types__:
+                new_field_cls._singleton = _new_unchecked(new_field_cls)
             new_fields[field_name] = new_field_cls
             namespace[field_name] = new_field_cls
         namespace["_fields"] = new_fields
+        namespace["_field_classes"] = frozenset(new_fields.values())
 
         new_cls = super().__new__(type(cls), cls.__name__, (cls,), namespace)
         new_cls._FieldBase.__adtbase__ = new_cls
         for f in new_cls._fields.values():
-            f.__adtbase__ = cls
+            f.__adtbase__ = new_cls
+        for field_name, maxsize in new_cls._flyweights.items():
+            _set_flyweight(new_fields[field_name], maxsize)
+        _register(new_cls)
         return new_cls
 
     def __subclasscheck__(cls, subclass):
-        if subclass in cls._fields.values():
+        fields = cls._field_classes
+        if subclass in fields or not fields.isdisjoint(subclass.__bases__):
             return True
-        for base in subclass.__bases__:
-            if base in cls._fields.values():
-                return True
         return super().__subclasscheck__(subclass)
 
     def __instancecheck__(cls, instance):
-        return issubclass(type(instance), cls)
+        # Fast path for the common case of a direct field instance.
+        return type(instance) in cls._field_classes or issubclass(type(instance), cls)
+
+
+def _register(cls: ADTMeta) -> None:
+    _adt_classes.add(cls)
+    for hook in _class_hooks:
+        hook(cls)
 
 
 class ADT(metaclass=ADTMeta):
     pass
 
 
-def adt(_cls=None) -> ADTMeta:
+def adt(_cls=None, *, order: bool = False) -> ADTMeta:
     """
     Make a class into an ADT (Algebraic Data Type).
 
-    Inspired by dataclasses.
+    Inspired by dataclasses. With 'order', values are ordered by field
+    declaration order and then by args, as with ADTMeta(..., order=True).
 
     No support for:
      - Inheritance
@@ -195,7 +1126,7 @@ def adt(_cls=None) -> ADTMeta:
     """
 
     def wrap(cls):
-        return ADTMeta(cls.__name__, (), cls.__dict__)
+        return ADTMeta(cls.__name__, (), cls.__dict__, order=order)
 
     # See if we're being called as @adt or @adt().
     if _cls is None:
@@ -206,6 +1137,96 @@ def adt(_cls=None) -> ADTMeta:
     return wrap(_cls)
 
 
+def _add_ordering(field_base_cls: Type) -> None:
+    """Order the fields of an ADT class by declaration order, then args."""
+
+    def __lt__(self, other):
+        if not isinstance(other, field_base_cls):
+            return NotImplemented
+        tag, other_tag = self._tag, other._tag
+        return tag < other_tag if tag != other_tag else self._args < other._args
+
+    def __le__(self, other):
+        if not isinstance(other, field_base_cls):
+            return NotImplemented
+        tag, other_tag = self._tag, other._tag
+        return tag < other_tag if tag != other_tag else self._args <= other._args
+
+    def __gt__(self, other):
+        if not isinstance(other, field_base_cls):
+            return NotImplemented
+        tag, other_tag = self._tag, other._tag
+        return tag > other_tag if tag != other_tag else self._args > other._args
+
+    def __ge__(self, other):
+        if not isinstance(other, field_base_cls):
+            return NotImplemented
+        tag, other_tag = self._tag, other._tag
+        return tag > other_tag if tag != other_tag else self._args >= other._args
+
+    for method in (__lt__, __le__, __gt__, __ge__):
+        method.__qualname__ = f"{field_base_cls.__qualname__}.{method.__name__}"
+        setattr(field_base_cls, method.__name__, method)
+
+
+def _load_field(adt_cls: ADTMeta, field_name: str, args: Tuple) -> _FieldBase:
+    return adt_cls._fields[field_name]._unchecked(*args)
+
+
+def _load_adt(module: str, qualname: str) -> ADTMeta:
+    obj = importlib.import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    if not isinstance(obj, ADTMeta):
+        raise TypeError(f"Expected an ADT class at {module}.{qualname}, got {obj!r}")
+    return obj
+
+
+def _load_specialisation(
+    generic_cls: ADTMeta, items: Tuple, type_var_names: Tuple
+) -> ADTMeta:
+    items = tuple(
+        getattr(generic_cls, name) if name else item
+        for item, name in zip(items, type_var_names)
+    )
+    return generic_cls[items]
+
+
+def _reduce_adt(cls: ADTMeta):
+    # The qualnames of generic ADT classes include their type args, so can't
+    # be used to pickle them by reference. Specialisations are recreated (or
+    # fetched from the cache) by subscripting the generic class.
+    origin = cls.__dict__.get("_generic_origin")
+    if origin is not None:
+        generic_cls, items = origin
+        # TypeVars can't be pickled by reference when declared in a class, so
+        # partial specialisations (e.g. 'Result[int, E]') refer to them by name.
+        names = {v: k for k, v in generic_cls._generic_types.items()}
+        type_var_names = tuple(
+            names.get(item) if isinstance(item, TypeVar) else None for item in items
+        )
+        if any(type_var_names):
+            items = tuple(None if n else i for i, n in zip(items, type_var_names))
+            return _load_specialisation, (generic_cls, items, type_var_names)
+        return operator.getitem, origin
+    args = (cls.__module__, re.sub(r"\[.*?\]", "", cls.__qualname__))
+    try:
+        found = _load_adt(*args)
+    except Exception:
+        found = None
+    if found is not cls:
+        # Imported here since it's only needed for the error.
+        import pickle
+
+        raise pickle.PicklingError(
+            f"Can't pickle {cls!r}: not found as {args[0]}.{args[1]}"
+        )
+    return _load_adt, args
+
+
+copyreg.pickle(ADTMeta, _reduce_adt)
+
+
 def is_adt(obj) -> bool:
     return isinstance(obj, ADTMeta)
 
@@ -217,18 +1238,272 @@ def is_adt_field(obj) -> bool:
     return False
 
 
-class _fieldmethod:
-    def __init__(self, func: Callable, adt_base_cls: Type, field_cls: Type):
-        self.func = func
-        self.adt_base_cls = adt_base_cls
-        self.field_cls = field_cls
+def _check_cases(adt_cls: ADTMeta, cases: Dict[str, Callable]) -> None:
+    missing = [name for name in adt_cls._fields if name not in cases]
+    if missing:
+        raise TypeError(
+            "Missing case(s) for {!r}: {}".format(
+                adt_cls.__qualname__, ", ".join(missing)
+            )
+        )
+    unknown = [name for name in cases if name not in adt_cls._fields]
+    if unknown:
+        raise TypeError(
+            "Unknown case(s) for {!r}: {}".format(
+                adt_cls.__qualname__, ", ".join(unknown)
+            )
+        )
+
+
+def _case_table(adt_cls: ADTMeta, cases: Dict[str, Callable]) -> Tuple:
+    """
+    Get a dict of the cases by field class, and a function to resolve misses.
+
+    Resolved field classes are added to the dict.
+    """
+    _check_cases(adt_cls, cases)
+    dispatch = {adt_cls._fields[name]: func for name, func in cases.items()}
+
+    def resolve(field_cls: Type) -> Callable:
+        # Remember the result for the next value of the same class.
+        func = dispatch[field_cls] = dispatch[_resolve_field(adt_cls, field_cls)]
+        return func
+
+    return dispatch, resolve
+
+
+def _resolve_field(adt_cls: ADTMeta, field_cls: Type) -> Type:
+    """
+    Get the field class of the ADT class that a class is a subclass of.
+
+    Generic specialisations and subclasses of a field are resolved to it by
+    looking in the MRO.
+    """
+    fields = adt_cls._field_classes
+    for base in field_cls.__mro__:
+        if base in fields:
+            return base
+    raise TypeError(
+        f"Expected a field of {adt_cls.__qualname__!r}, got {field_cls.__name__!r}"
+    )
+
+
+def _make_matcher(adt_cls: ADTMeta, cases: Dict[str, Callable]) -> Callable:
+    dispatch, resolve = _case_table(adt_cls, cases)
+
+    # A plain function is cheaper to call than an instance with __call__().
+    def matcher(value):
+        try:
+            func = dispatch[type(value)]
+        except KeyError:
+            func = resolve(type(value))
+        return func(*value._args)
+
+    matcher.__qualname__ = f"{adt_cls.__qualname__}.matcher"
+    matcher.adt_cls = adt_cls
+    return matcher
+
+
+def _root_field_base(adt_cls: ADTMeta) -> Type:
+    """
+    Get the field base class of the unspecialised ADT class.
+
+    Values of any specialisation of a generic ADT class may be nested in each
+    other, so are all instances of this.
+    """
+    origin = adt_cls.__dict__.get("_generic_origin")
+    while origin is not None:
+        adt_cls = origin[0]
+        origin = adt_cls.__dict__.get("_generic_origin")
+    return adt_cls._FieldBase
+
+
+def _not_a_field(adt_cls: ADTMeta, value) -> TypeError:
+    return TypeError(
+        f"Expected a field of {adt_cls.__qualname__!r}, "
+        f"got {type(value).__name__!r}"
+    )
+
+
+def _preorder(base: Type, value) -> Tuple[List, List[int]]:
+    """
+    List the nested values of a value, parents first, with explicit stacks.
+
+    The reversed list has the values nested in each before it, in order. Also
+    returns the number of values nested directly in each, negated if any are
+    in tuple args.
+    """
+    if not isinstance(value, base):
+        raise _not_a_field(base.__adtbase__, value)
+    stack = [value]
+    pop = stack.pop
+    push = stack.append
+    nodes = []
+    counts = []
+    while stack:
+        node = pop()
+        nodes.append(node)
+        count = 0
+        in_tuples = 0
+        for arg in node._args:
+            if isinstance(arg, base):
+                push(arg)
+                count += 1
+            elif type(arg) is tuple:
+                for item in arg:
+                    if isinstance(item, base):
+                        push(item)
+                        in_tuples += 1
+        counts.append(count if not in_tuples else -count - in_tuples)
+    return nodes, counts
+
+
+def _replace_children(base: Type, args: Tuple, children: Iterator) -> List:
+    """Replace the nested values in args with the next of the children."""
+    new_args = []
+    for arg in args:
+        if isinstance(arg, base):
+            arg = next(children)
+        elif type(arg) is tuple:
+            items = [next(children) if isinstance(i, base) else i for i in arg]
+            if any(map(operator.is_not, items, arg)):
+                arg = tuple(items)
+        new_args.append(arg)
+    return new_args
+
+
+def _walk(base: Type, value) -> Iterator:
+    stack = [value]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        yield node
+        for arg in reversed(node._args):
+            if isinstance(arg, base):
+                push(arg)
+            elif type(arg) is tuple:
+                for item in reversed(arg):
+                    if isinstance(item, base):
+                        push(item)
+
+
+def _bulk_map_op(adt_cls: ADTMeta, func, args: Tuple) -> Callable:
+    if isinstance(func, str):
+        return operator.methodcaller(func, *args)
+    if isinstance(func, dict):
+        return _make_matcher(adt_cls, func)
+    if args:
+        return lambda value: func(value, *args)
+    return func
+
+
+def _bulk_map_chunk(adt_cls: ADTMeta, func, args: Tuple, chunk: List) -> List:
+    return list(map(_bulk_map_op(adt_cls, func, args), chunk))
+
+
+def _bulk_map_packed_chunk(adt_cls: ADTMeta, func, args: Tuple, packed: Tuple):
+    chunk = _unpack_values(packed)
+    return _pack_values(_bulk_map_chunk(adt_cls, func, args, chunk))
+
+
+def _pack_values(values: List) -> Tuple:
+    """
+    Pack values as (ADT class, field tags, field args) for pickling.
+
+    Values that aren't all fields of the same ADT class are left as they are,
+    with an ADT class of None.
+    """
+    if values:
+        adt_cls = getattr(type(values[0]), "__adtbase__", None)
+        if isinstance(adt_cls, ADTMeta):
+            tags = {f: i for i, f in enumerate(adt_cls._fields.values())}
+            try:
+                return (
+                    adt_cls,
+                    [tags[type(v)] for v in values],
+                    [v._args for v in values],
+                )
+            except KeyError:
+                pass
+    return (None, values, None)
+
+
+def _unpack_values(packed: Tuple) -> List:
+    adt_cls, tags, args = packed
+    if adt_cls is None:
+        return tags
+    makers = [f._unchecked for f in adt_cls._fields.values()]
+    return [makers[tag](*a) for tag, a in zip(tags, args)]
+
+
+def _make_fieldmethod(func: Callable, adt_base_cls: Type) -> Callable:
+    """
+    Wrap a fieldmethod as a plain function with the ADT class pre-bound.
+
+    Set on field classes, this binds to instances like any other method. The
+    wrapper is generated with the same parameters as the fieldmethod to avoid
+    packing and unpacking args on every call.
+    """
+    # Imported here since it's slow to import, and only needed for fieldmethods.
+    import inspect
+
+    try:
+        params = list(inspect.signature(func).parameters.values())[2:]
+    except (TypeError, ValueError):
+        params = None
+    # Pick names for the generated globals and first parameter that don't
+    # clash with the parameter names.
+    taken = {param.name for param in params or ()}
 
-    def __get__(self, obj, objtype=None):
-        @functools.wraps(self.func)
-        def newfunc(*args, **kwargs):
-            return self.func(obj, self.adt_base_cls, *args, **kwargs)
+    def unique(name: str) -> str:
+        while name in taken:
+            name += "_"
+        taken.add(name)
+        return name
 
-        return newfunc
+    func_name = unique("__func")
+    basecls_name = unique("__basecls")
+    field_name = unique("__field")
+    globs = {func_name: func, basecls_name: adt_base_cls}
+    if params is None:
+        sig, call = ["*args", "**kwargs"], ["*args", "**kwargs"]
+    else:
+        sig, call = [], []
+        for i, param in enumerate(params):
+            name = param.name
+            default = ""
+            if param.default is not param.empty:
+                default_name = unique(f"__default{i}")
+                globs[default_name] = param.default
+                default = f"={default_name}"
+            if param.kind is param.VAR_POSITIONAL:
+                sig.append(f"*{name}")
+                call.append(f"*{name}")
+            elif param.kind is param.VAR_KEYWORD:
+                sig.append(f"**{name}")
+                call.append(f"**{name}")
+            elif param.kind is param.KEYWORD_ONLY:
+                if not any(s.startswith("*") for s in sig):
+                    sig.append("*")
+                sig.append(name + default)
+                call.append(f"{name}={name}")
+            else:
+                sig.append(name + default)
+                call.append(name)
+            if param.kind is param.POSITIONAL_ONLY and (
+                i + 1 == len(params) or params[i + 1].kind is not param.POSITIONAL_ONLY
+            ):
+                sig.append("/")
+    src = "def method({0}, {3}):\n    return {1}({0}, {2}, {4})".format(
+        field_name, func_name, basecls_name, ", ".join(sig), ", ".join(call)
+    )
+    exec(src, globs)
+    method = functools.wraps(func)(globs["method"])
+    # The wrapper's own signature leaves out the pre-bound ADT class, so don't
+    # let inspect.signature() follow through to the fieldmethod.
+    del method.__wrapped__
+    return method
 
 
 # TODO: Make fieldmethod redundant (make it the default).
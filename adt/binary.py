@@ -0,0 +1,285 @@
+"""
+Compact binary encoding of ADT values.
+
+A value is encoded as the index of its field in the ADT class (as a varint),
+followed by its args, each encoded according to the field's declared type:
+ - int: zigzag varint
+ - bool: a single byte
+ - float: 8-byte IEEE 754 double
+ - str, bytes: varint length, then the UTF-8 or raw bytes
+ - None: nothing
+ - ADT class: the nested encoding of the value
+Args of any other declared type, including TypeVars of unspecialised generic
+ADTs, are pickled and prefixed with a varint length. As with pickle, only
+decode data from trusted sources.
+
+Args are decoded as exactly the declared type, so e.g. a bool passed for an
+int arg is decoded as an int.
+
+dumps() output starts with a version byte. Streams written by dump_stream()
+start with b"ADT" and a version byte, and each value is prefixed with its
+length as a varint.
+"""
+
+__all__ = ("dumps", "dump_stream", "load_stream", "loads")
+
+import pickle
+import struct
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from . import ADTMeta, _FieldBase
+
+
+VERSION = 1
+_STREAM_MAGIC = b"ADT"
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+_Encoder = Callable[[bytearray, object], None]
+_Decoder = Callable[[bytes, int], Tuple[object, int]]
+
+_double = struct.Struct("<d")
+
+
+def _write_uvarint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_uvarint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_int(out: bytearray, value) -> None:
+    value = int(value)
+    _write_uvarint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def _decode_int(data: bytes, pos: int) -> Tuple[int, int]:
+    n, pos = _read_uvarint(data, pos)
+    return (-((n + 1) >> 1) if n & 1 else n >> 1), pos
+
+
+def _encode_bool(out: bytearray, value) -> None:
+    out.append(1 if value else 0)
+
+
+def _decode_bool(data: bytes, pos: int) -> Tuple[bool, int]:
+    return data[pos] != 0, pos + 1
+
+
+def _encode_float(out: bytearray, value) -> None:
+    out += _double.pack(value)
+
+
+def _decode_float(data: bytes, pos: int) -> Tuple[float, int]:
+    return _double.unpack_from(data, pos)[0], pos + 8
+
+
+def _encode_bytes(out: bytearray, value) -> None:
+    _write_uvarint(out, len(value))
+    out += value
+
+
+def _decode_bytes(data: bytes, pos: int) -> Tuple[bytes, int]:
+    n, pos = _read_uvarint(data, pos)
+    end = pos + n
+    if end > len(data):
+        raise IndexError("Truncated bytes")
+    return bytes(data[pos:end]), end
+
+
+def _encode_str(out: bytearray, value) -> None:
+    _encode_bytes(out, value.encode("utf-8"))
+
+
+def _decode_str(data: bytes, pos: int) -> Tuple[str, int]:
+    value, pos = _decode_bytes(data, pos)
+    return value.decode("utf-8"), pos
+
+
+def _encode_none(out: bytearray, value) -> None:
+    pass
+
+
+def _decode_none(data: bytes, pos: int) -> Tuple[None, int]:
+    return None, pos
+
+
+def _encode_pickle(out: bytearray, value) -> None:
+    _encode_bytes(out, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _decode_pickle(data: bytes, pos: int) -> Tuple[object, int]:
+    value, pos = _decode_bytes(data, pos)
+    return pickle.loads(value), pos
+
+
+_ARG_CODECS: Dict[object, Tuple[_Encoder, _Decoder]] = {
+    int: (_encode_int, _decode_int),
+    bool: (_encode_bool, _decode_bool),
+    float: (_encode_float, _decode_float),
+    str: (_encode_str, _decode_str),
+    bytes: (_encode_bytes, _decode_bytes),
+    None: (_encode_none, _decode_none),
+}
+
+
+class _Codec:
+    """Encoder and decoder for the values of an ADT class."""
+
+    __slots__ = ("adt_cls", "_encoders", "_decoders")
+
+    def __init__(self, adt_cls: ADTMeta):
+        self.adt_cls = adt_cls
+        # Map of field class to the encoded tag and the arg encoders.
+        self._encoders: Dict[type, Tuple[bytes, List[_Encoder]]] = {}
+        # List indexed by tag of the field class and the arg decoders.
+        self._decoders: List[Tuple[type, List[_Decoder]]] = []
+        for tag, field_cls in enumerate(adt_cls._fields.values()):
+            tag_bytes = bytearray()
+            _write_uvarint(tag_bytes, tag)
+            arg_codecs = [_arg_codec(t) for t in field_cls.__arg_types__]
+            self._encoders[field_cls] = (bytes(tag_bytes), [c[0] for c in arg_codecs])
+            self._decoders.append((field_cls, [c[1] for c in arg_codecs]))
+
+    def encode(self, out: bytearray, value: _FieldBase) -> None:
+        try:
+            tag_bytes, encoders = self._encoders[type(value)]
+        except KeyError:
+            tag_bytes, encoders = self._resolve(type(value))
+        out += tag_bytes
+        for encoder, arg in zip(encoders, value._args):
+            encoder(out, arg)
+
+    def decode(self, data: bytes, pos: int) -> Tuple[_FieldBase, int]:
+        tag, pos = _read_uvarint(data, pos)
+        try:
+            field_cls, decoders = self._decoders[tag]
+        except IndexError:
+            raise ValueError(
+                f"Invalid tag {tag} for {self.adt_cls.__qualname__!r}"
+            ) from None
+        args = []
+        for decoder in decoders:
+            arg, pos = decoder(data, pos)
+            args.append(arg)
+        return field_cls._unchecked(*args), pos
+
+    def _resolve(self, field_cls: type) -> Tuple[bytes, List[_Encoder]]:
+        # Generic specialisations subclass the field classes, so look in the MRO.
+        # Not remembered, so that the subclasses can be freed before the codec.
+        for base in field_cls.__mro__[1:]:
+            if base in self._encoders:
+                return self._encoders[base]
+        raise TypeError(
+            f"Expected a field of {self.adt_cls.__qualname__!r}, "
+            f"got {field_cls.__name__!r}"
+        )
+
+
+def _get_codec(adt_cls: ADTMeta) -> _Codec:
+    # Kept on the ADT class, since the codec refers to it and its fields and so
+    # would keep them alive if kept elsewhere. Generic specialisations inherit
+    # the codec of their origin, so check it's for the given class.
+    try:
+        codec = adt_cls._binary_codec
+    except AttributeError:
+        if not isinstance(adt_cls, ADTMeta):
+            raise TypeError(f"Expected an ADT class, got {adt_cls!r}") from None
+    else:
+        if codec.adt_cls is adt_cls:
+            return codec
+    codec = adt_cls._binary_codec = _Codec(adt_cls)
+    return codec
+
+
+def _arg_codec(arg_type) -> Tuple[_Encoder, _Decoder]:
+    if isinstance(arg_type, ADTMeta):
+        codec = _get_codec(arg_type)
+        return codec.encode, codec.decode
+    try:
+        return _ARG_CODECS[arg_type]
+    except (KeyError, TypeError):
+        return _encode_pickle, _decode_pickle
+
+
+def dumps(adt_cls: ADTMeta, value: _FieldBase) -> bytes:
+    """Encode a value of the given ADT class."""
+    out = bytearray((VERSION,))
+    _get_codec(adt_cls).encode(out, value)
+    return bytes(out)
+
+
+def loads(adt_cls: ADTMeta, data: bytes) -> _FieldBase:
+    """Decode a value of the given ADT class, as encoded by dumps()."""
+    if not data or data[0] != VERSION:
+        raise ValueError("Unsupported encoding version")
+    try:
+        value, pos = _get_codec(adt_cls).decode(data, 1)
+    except (IndexError, struct.error):
+        raise ValueError("Truncated data") from None
+    if pos != len(data):
+        raise ValueError("Unexpected data after encoded value")
+    return value
+
+
+def dump_stream(adt_cls: ADTMeta, values: Iterable[_FieldBase], fp: BinaryIO) -> None:
+    """Write a stream of values of the given ADT class to a binary file."""
+    encode = _get_codec(adt_cls).encode
+    out = bytearray(_STREAM_MAGIC)
+    out.append(VERSION)
+    record = bytearray()
+    for value in values:
+        encode(record, value)
+        _write_uvarint(out, len(record))
+        out += record
+        record.clear()
+        if len(out) >= _STREAM_CHUNK_SIZE:
+            fp.write(out)
+            out.clear()
+    fp.write(out)
+
+
+def load_stream(adt_cls: ADTMeta, fp: BinaryIO) -> Iterator[_FieldBase]:
+    """Lazily read a stream of values written by dump_stream()."""
+    decode = _get_codec(adt_cls).decode
+    header = fp.read(len(_STREAM_MAGIC) + 1)
+    if header[:-1] != _STREAM_MAGIC:
+        raise ValueError("Not an ADT stream")
+    if header[-1] != VERSION:
+        raise ValueError("Unsupported encoding version")
+    buf = b""
+    pos = 0
+    while True:
+        try:
+            length, start = _read_uvarint(buf, pos)
+        except IndexError:
+            length, start = None, None
+        if length is None or start + length > len(buf):
+            chunk = fp.read(max(_STREAM_CHUNK_SIZE, (length or 0) + 10))
+            if not chunk:
+                if pos != len(buf):
+                    raise ValueError("Truncated stream")
+                return
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        end = start + length
+        try:
+            value, value_end = decode(buf, start)
+        except (IndexError, struct.error):
+            raise ValueError("Truncated value in stream") from None
+        if value_end != end:
+            raise ValueError("Encoded value length mismatch")
+        pos = end
+        yield value
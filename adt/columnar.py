@@ -0,0 +1,243 @@
+"""
+Columnar storage for large numbers of values of a single ADT class.
+
+Example:
+
+    arr = ADTArray(Result[int, str], values)
+    arr.count_by_variant()  # {"Ok": ..., "Error": ...}
+    oks = arr.filter_variant("Ok")
+    doubled = arr.map_variant("Ok", lambda x: x * 2)
+
+Args of type int, float or bool are stored in 'array.array' columns, which
+support the buffer protocol (e.g. for 'numpy.frombuffer()'). Other args are
+stored in lists.
+"""
+
+__all__ = ("ADTArray",)
+
+import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from . import ADTMeta, _FieldBase
+
+
+_TYPECODES = {bool: "b", int: "q", float: "d"}
+
+_Column = Union[array.array, list]
+
+
+class _BoolColumn:
+    """Read-only view of a column of bools stored as ints."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: array.array):
+        self.data = data
+
+    def __getitem__(self, idx):
+        return bool(self.data[idx])
+
+
+class ADTArray:
+    """
+    A sequence of values of a single ADT class, stored by column.
+
+    Each value is stored as a tag (the index of its field) plus its args, held
+    in per-field columns. Values are only created as field instances when
+    accessed.
+    """
+
+    def __init__(self, adt_cls: ADTMeta, values: Iterable[_FieldBase] = ()):
+        self.adt_cls = adt_cls
+        self._field_classes = list(adt_cls._fields.values())
+        self._tags_by_cls = {f: i for i, f in enumerate(self._field_classes)}
+        self._tags = array.array("B" if len(self._field_classes) <= 256 else "H")
+        # Position of each value within the columns of its field, only created
+        # when needed for random access.
+        self._offsets: Optional[array.array] = None
+        self._counts = [0] * len(self._field_classes)
+        # The primitive type of each array column, None for list columns.
+        self._column_types: List[List[Optional[type]]] = [
+            [t if t in _TYPECODES else None for t in f.__arg_types__]
+            for f in self._field_classes
+        ]
+        self._columns: List[List[_Column]] = [
+            [array.array(_TYPECODES[t]) if t else [] for t in types]
+            for types in self._column_types
+        ]
+        # Functions to create a field instance from a position in its columns.
+        self._makers: List[Optional[Callable]] = [None] * len(self._field_classes)
+        self.extend(values)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} of {len(self)} {self.adt_cls.__qualname__}>"
+
+    def __len__(self):
+        return len(self._tags)
+
+    def __iter__(self) -> Iterator[_FieldBase]:
+        makers = [self._maker(tag) for tag in range(len(self._field_classes))]
+        counts = [0] * len(self._field_classes)
+        for tag in self._tags:
+            offset = counts[tag]
+            counts[tag] = offset + 1
+            yield makers[tag](offset)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return type(self)(
+                self.adt_cls,
+                (self._materialise(i) for i in range(*idx.indices(len(self)))),
+            )
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._materialise(idx)
+
+    def append(self, value: _FieldBase) -> None:
+        """Append a value, which must be a direct instance of a field class."""
+        tag = self._tags_by_cls.get(type(value))
+        if tag is None:
+            raise TypeError(
+                f"Expected a field of {self.adt_cls.__qualname__!r}, "
+                f"got {type(value).__qualname__!r}"
+            )
+        self._tags.append(tag)
+        if self._offsets is not None:
+            self._offsets.append(self._counts[tag])
+        self._counts[tag] += 1
+        self._append_args(tag, value._args)
+
+    def extend(self, values: Iterable[_FieldBase]) -> None:
+        for value in values:
+            self.append(value)
+
+    def column(self, field_name: str, idx: int) -> _Column:
+        """
+        Get the column of a field's arg at the given position.
+
+        This is the underlying storage, so should not be modified.
+        """
+        return self._columns[self._tag(field_name)][idx]
+
+    def count_by_variant(self) -> Dict[str, int]:
+        """Get the number of values of each field."""
+        return dict(zip(self.adt_cls._fields, self._counts))
+
+    def filter_variant(self, field_name: str) -> "ADTArray":
+        """Get a new array containing only the values of the given field."""
+        tag = self._tag(field_name)
+        new = type(self)(self.adt_cls)
+        count = self._counts[tag]
+        new._tags = array.array(self._tags.typecode, [tag]) * count
+        new._counts[tag] = count
+        new._column_types[tag] = list(self._column_types[tag])
+        new._columns[tag] = [col[:] for col in self._columns[tag]]
+        return new
+
+    def map_variant(self, field_name: str, func: Callable) -> "ADTArray":
+        """
+        Get a new array with func applied to the args of the given field.
+
+        The func is called with the field's args and should return the new
+        arg, or a tuple of the new args for fields with multiple args. The
+        results are not type checked, as with the field's _unchecked().
+        """
+        tag = self._tag(field_name)
+        nargs = len(self._columns[tag])
+        new = type(self)(self.adt_cls)
+        new._tags = self._tags[:]
+        new._counts = list(self._counts)
+        for t, (types, cols) in enumerate(zip(self._column_types, self._columns)):
+            if t != tag:
+                new._column_types[t] = list(types)
+                new._columns[t] = [col[:] for col in cols]
+        if nargs == 0:
+            results = (func() for _ in range(self._counts[tag]))
+        else:
+            results = map(func, *self._read_columns(tag))
+        if nargs == 1:
+            results = ((r,) for r in results)
+        for args in results:
+            if len(args) != nargs:
+                raise TypeError(
+                    f"Expected {nargs} arg(s) for {field_name!r} field, "
+                    f"got {len(args)}"
+                )
+            new._append_args(tag, args)
+        return new
+
+    def _tag(self, field_name: str) -> int:
+        try:
+            return self._tags_by_cls[self.adt_cls._fields[field_name]]
+        except KeyError:
+            raise KeyError(
+                f"No field {field_name!r} in {self.adt_cls.__qualname__!r}"
+            ) from None
+
+    def _append_args(self, tag: int, args) -> None:
+        types = self._column_types[tag]
+        cols = self._columns[tag]
+        for i, arg in enumerate(args):
+            typ = types[i]
+            if typ is not None:
+                if type(arg) is typ:
+                    try:
+                        cols[i].append(arg)
+                        continue
+                    except OverflowError:
+                        pass
+                self._to_list_column(tag, i)
+            cols[i].append(arg)
+
+    def _to_list_column(self, tag: int, idx: int) -> None:
+        # Fall back to a list for args not of the exact primitive type, e.g.
+        # bools in an int column or ints too large for the array.
+        col = self._columns[tag][idx]
+        if self._column_types[tag][idx] is bool:
+            col = map(bool, col)
+        self._columns[tag][idx] = list(col)
+        self._column_types[tag][idx] = None
+        self._makers[tag] = None
+
+    def _read_columns(self, tag: int) -> List[list]:
+        return [
+            list(map(bool, col)) if typ is bool else col
+            for typ, col in zip(self._column_types[tag], self._columns[tag])
+        ]
+
+    def _maker(self, tag: int) -> Callable[[int], _FieldBase]:
+        maker = self._makers[tag]
+        if maker is None:
+            make = self._field_classes[tag]._unchecked
+            cols = self._columns[tag]
+            if bool in self._column_types[tag]:
+                cols = [
+                    _BoolColumn(col) if typ is bool else col
+                    for typ, col in zip(self._column_types[tag], cols)
+                ]
+            if len(cols) == 1:
+                (col,) = cols
+
+                def maker(i):
+                    return make(col[i])
+
+            else:
+
+                def maker(i):
+                    return make(*[col[i] for col in cols])
+
+            self._makers[tag] = maker
+        return maker
+
+    def _materialise(self, idx: int) -> _FieldBase:
+        if self._offsets is None:
+            offsets = array.array("q", bytes(8 * len(self._tags)))
+            counts = [0] * len(self._field_classes)
+            for i, tag in enumerate(self._tags):
+                offsets[i] = counts[tag]
+                counts[tag] += 1
+            self._offsets = offsets
+        tag = self._tags[idx]
+        return self._maker(tag)(self._offsets[idx])
@@ -1,6 +1,17 @@
 __all__ = ("Option", "Result")
 
-from typing import Callable, TypeVar, Union
+import asyncio
+import inspect
+from typing import (
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import adt
 
@@ -25,7 +36,7 @@ class Option(metaclass=adt.ADTMeta):
         if isinstance(field, basecls.Some):
             return result_cls.Some(func(field[0]))
         else:
-            return result_cls.Nothing()
+            return result_cls.Empty()
 
     @adt.fieldmethod
     def and_then(field, basecls, func: Callable):
@@ -41,6 +52,67 @@ class Option(metaclass=adt.ADTMeta):
         else:
             return basecls.Some(default)
 
+    @adt.fieldmethod
+    async def map_async(field, basecls, func: Callable[[T], Awaitable["U"]]):
+        """As map(), awaiting the result of func."""
+        ok_type = _return_type(func)
+        result_cls = basecls[ok_type] if ok_type else basecls
+
+        if isinstance(field, basecls.Some):
+            return result_cls.Some(await func(field[0]))
+        else:
+            return result_cls.Empty()
+
+    @adt.fieldmethod
+    async def and_then_async(field, basecls, func: Callable[[T], Awaitable]):
+        """As and_then(), awaiting the result of func."""
+        if isinstance(field, basecls.Some):
+            return await func(field[0])
+        else:
+            return field
+
+    @classmethod
+    def pipeline(cls) -> "_OptionPipeline":
+        """Start a lazy pipeline of map() and and_then() steps."""
+        return _OptionPipeline()
+
+    @classmethod
+    def collect(
+        cls, values: Iterable["Option[T]"], factory: Callable[[Iterable], "U"] = list
+    ) -> "Option[U]":
+        """
+        Collect Some values into Some of factory(payloads), or else Empty.
+
+        The values are consumed lazily, stopping at the first Empty.
+        """
+        collected, stop = _collect(Option, Option.Some, values, factory)
+        result_cls = Option[factory] if isinstance(factory, type) else cls
+        return result_cls.Some(collected) if stop is None else result_cls.Empty()
+
+    @classmethod
+    def sequence(cls, values: Iterable["Option[T]"]) -> "Option[list]":
+        """Collect Some values into Some of a list, or else Empty."""
+        return cls.collect(values)
+
+    @classmethod
+    def traverse(
+        cls, values: Iterable, func: Callable[..., "Option[U]"]
+    ) -> "Option[list]":
+        """Collect func(value) for each value, stopping at the first Empty."""
+        return cls.collect(map(func, values))
+
+    @classmethod
+    def filter_some(cls, values: Iterable["Option[T]"]) -> Iterator[T]:
+        """Lazily give the payloads of Some values, skipping Empty ones."""
+        tags = {}
+        some_tag = Option.Some._tag
+        for value in values:
+            tag = tags.get(type(value))
+            if tag is None:
+                tag = _get_tag(Option, value, tags)
+            if tag == some_tag:
+                yield value._args[0]
+
 
 class Result(metaclass=adt.ADTMeta):
 
@@ -93,6 +165,44 @@ class Result(metaclass=adt.ADTMeta):
         else:
             return result_cls.Error(field[0])
 
+    @adt.fieldmethod
+    async def map_async(
+        field, basecls, func: Callable[[T], Awaitable["U"]]
+    ) -> "Result[U,E]":
+        """As map(), awaiting the result of func."""
+        ok_type = _return_type(func)
+        result_cls = basecls[ok_type, basecls.E] if ok_type else basecls
+
+        if isinstance(field, basecls.Ok):
+            return result_cls.Ok(await func(field[0]))
+        else:
+            return result_cls.Error(field[0])
+
+    @adt.fieldmethod
+    async def map_error_async(
+        field, basecls, func: Callable[[E], Awaitable["F"]]
+    ) -> "Result[T,F]":
+        """As map_error(), awaiting the result of func."""
+        err_type = _return_type(func)
+        result_cls = basecls[basecls.T, err_type] if err_type else basecls
+
+        if isinstance(field, basecls.Ok):
+            return result_cls.Ok(field[0])
+        else:
+            return result_cls.Error(await func(field[0]))
+
+    @adt.fieldmethod
+    async def and_then_async(
+        field, basecls, func: Callable[[T], Awaitable["Result[U,E]"]]
+    ) -> "Result[U,E]":
+        """As and_then(), awaiting the result of func."""
+        result_cls = _return_adt(func) or basecls
+
+        if isinstance(field, basecls.Ok):
+            return await func(field[0])
+        else:
+            return result_cls.Error(field[0])
+
     @adt.fieldmethod
     def with_default(field, basecls, default: "U") -> Union[T, "U"]:
         if isinstance(field, basecls.Ok):
@@ -113,3 +223,338 @@ class Result(metaclass=adt.ADTMeta):
             return cls.Ok(option[0])
         else:
             return cls.Error(error)
+
+    @classmethod
+    def pipeline(cls) -> "_ResultPipeline":
+        """Start a lazy pipeline of map(), map_error() and and_then() steps."""
+        return _ResultPipeline()
+
+    @classmethod
+    async def gather(
+        cls,
+        aws: Iterable[Awaitable["Result[T,E]"]],
+        *,
+        limit: Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> "Result[list,E]":
+        """
+        Await Results concurrently and collect them into a single Result.
+
+        Gives Ok of the list of Ok values in order, or else the first Error in
+        order. At most 'limit' of the awaitables are run at once. With
+        'fail_fast', the first Error to complete is returned straight away and
+        the outstanding awaitables are cancelled.
+        """
+        result_cls = Result[list, cls.E]
+        aws = list(aws)
+        if limit is None and not fail_fast:
+            results = await asyncio.gather(*aws)
+            return cls._collect_gathered(result_cls, results)
+        results = [None] * len(aws)
+        pending = iter(enumerate(aws))
+
+        async def worker():
+            # Workers share the iterator, taking the next awaitable when free.
+            for i, aw in pending:
+                result = results[i] = await aw
+                if fail_fast and isinstance(result, Result.Error):
+                    raise _FailFast(result)
+
+        nworkers = min(limit or len(aws), len(aws))
+        tasks = [asyncio.ensure_future(worker()) for _ in range(nworkers)]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for _, aw in pending:
+                if inspect.iscoroutine(aw):
+                    aw.close()
+                elif isinstance(aw, asyncio.Future):
+                    aw.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for task in tasks:
+            if task.cancelled():
+                continue
+            exc = task.exception()
+            if isinstance(exc, _FailFast):
+                return result_cls.Error(exc.error[0])
+            if exc is not None:
+                raise exc
+        return cls._collect_gathered(result_cls, results)
+
+    @classmethod
+    def collect(
+        cls, values: Iterable["Result[T,E]"], factory: Callable[[Iterable], "U"] = list
+    ) -> "Result[U,E]":
+        """
+        Collect Ok values into Ok of factory(payloads), or else the first Error.
+
+        The values are consumed lazily, stopping at the first Error.
+        """
+        collected, error = _collect(Result, Result.Ok, values, factory)
+        result_cls = Result[factory, cls.E] if isinstance(factory, type) else cls
+        if error is not None:
+            return result_cls.Error(error._args[0])
+        return result_cls.Ok(collected)
+
+    @classmethod
+    def sequence(cls, values: Iterable["Result[T,E]"]) -> "Result[list,E]":
+        """Collect Ok values into Ok of a list, or else the first Error."""
+        return cls.collect(values)
+
+    @classmethod
+    def traverse(
+        cls, values: Iterable, func: Callable[..., "Result[U,E]"]
+    ) -> "Result[list,E]":
+        """Collect func(value) for each value, stopping at the first Error."""
+        return cls.collect(map(func, values))
+
+    @classmethod
+    def partition(cls, values: Iterable["Result[T,E]"]) -> Tuple[list, list]:
+        """Split values into lists of the Ok payloads and the Error payloads."""
+        oks = []
+        errors = []
+        tags = {}
+        ok_tag = Result.Ok._tag
+        for value in values:
+            tag = tags.get(type(value))
+            if tag is None:
+                tag = _get_tag(Result, value, tags)
+            (oks if tag == ok_tag else errors).append(value._args[0])
+        return oks, errors
+
+    @classmethod
+    def filter_ok(cls, values: Iterable["Result[T,E]"]) -> Iterator[T]:
+        """Lazily give the payloads of Ok values, skipping Errors."""
+        tags = {}
+        ok_tag = Result.Ok._tag
+        for value in values:
+            tag = tags.get(type(value))
+            if tag is None:
+                tag = _get_tag(Result, value, tags)
+            if tag == ok_tag:
+                yield value._args[0]
+
+    @staticmethod
+    def _collect_gathered(result_cls: adt.ADTMeta, results: list) -> "Result":
+        for result in results:
+            if not isinstance(result, Result.Ok):
+                if not isinstance(result, Result.Error):
+                    raise TypeError(f"Expected a Result value, got {result!r}")
+                return result_cls.Error(result[0])
+        return result_cls.Ok([result[0] for result in results])
+
+
+class _FailFast(Exception):
+    """Raised to stop Result.gather() on the first Error."""
+
+    def __init__(self, error: Result.Error):
+        super().__init__(error)
+        self.error = error
+
+
+def _get_tag(adt_cls: adt.ADTMeta, value, tags: dict) -> int:
+    """
+    Get the tag of a value of the ADT class, remembering it for the value's type.
+
+    Tag lookups by type avoid an isinstance() check per value, which goes
+    through ADTMeta.__instancecheck__() for generic specialisations.
+    """
+    if not isinstance(value, adt_cls):
+        name = adt_cls.__name__
+        article = "an" if name[0] in "AEIOU" else "a"
+        raise TypeError(f"Expected {article} {name} value, got {value!r}")
+    tag = tags[type(value)] = value._tag
+    return tag
+
+
+def _collect(
+    adt_cls: adt.ADTMeta, field_cls: type, values: Iterable, factory: Callable
+) -> Tuple[object, object]:
+    """
+    Collect the payloads of values of the field, stopping at any other value.
+
+    Returns factory(payloads) and the value stopped at, or None.
+    """
+    tags = {}
+    collect_tag = field_cls._tag
+    stop = None
+    if factory is list:
+        # Appending directly is quicker than resuming a generator.
+        collected = []
+        append = collected.append
+        for value in values:
+            tag = tags.get(type(value))
+            if tag is None:
+                tag = _get_tag(adt_cls, value, tags)
+            if tag != collect_tag:
+                return collected, value
+            append(value._args[0])
+        return collected, None
+
+    def payloads():
+        nonlocal stop
+        for value in values:
+            tag = tags.get(type(value))
+            if tag is None:
+                tag = _get_tag(adt_cls, value, tags)
+            if tag != collect_tag:
+                stop = value
+                return
+            yield value._args[0]
+
+    collected = factory(payloads())
+    return collected, stop
+
+
+def _return_adt(func: Callable) -> Optional[adt.ADTMeta]:
+    ret = getattr(func, "__annotations__", {}).get("return")
+    return ret if adt.is_adt(ret) else None
+
+
+def _return_type(func: Callable) -> Optional[type]:
+    ret = getattr(func, "__annotations__", {}).get("return")
+    return ret if isinstance(ret, type) else None
+
+
+class _Pipeline:
+    """
+    Steps recorded once and run as a single pass over each value.
+
+    Each step is a (kind, func, cls) tuple, where cls is the ADT class the
+    equivalent eager fieldmethod would return, worked out up front from the
+    func's return annotation.
+
+    Intermediate values aren't created, so only the final value is checked
+    against its field's arg types.
+
+    Subclasses define _compile(), returning a function that runs the steps on
+    a value.
+    """
+
+    def __init__(self, steps: Tuple = ()):
+        self._steps = steps
+        self._run: Optional[Callable] = None
+
+    def __repr__(self):
+        steps = ".".join(f"{kind}({func!r})" for kind, func, _ in self._steps)
+        return f"{type(self).__name__}({steps})"
+
+    def __call__(self, value):
+        """Run the pipeline on a single value."""
+        if self._run is None:
+            self._run = self._compile()
+        return self._run(value)
+
+    def run_many(self, values: Iterable) -> Iterator:
+        """Lazily run the pipeline on each of the values."""
+        if self._run is None:
+            self._run = self._compile()
+        return map(self._run, values)
+
+    def _add(self, kind: str, func: Callable, cls: adt.ADTMeta):
+        return type(self)(self._steps + ((kind, func, cls),))
+
+
+class _OptionPipeline(_Pipeline):
+    def map(self, func: Callable) -> "_OptionPipeline":
+        ret = _return_type(func)
+        return self._add("map", func, Option[ret] if ret else Option)
+
+    def and_then(self, func: Callable) -> "_OptionPipeline":
+        return self._add("and_then", func, None)
+
+    def _compile(self) -> Callable:
+        steps = self._steps
+        Some = Option.Some
+        Empty = Option.Empty
+        # The class of an Empty value after the steps from each index, None
+        # if unchanged (no map() steps).
+        empty_tail = [None] * (len(steps) + 1)
+        for i in reversed(range(len(steps))):
+            kind, _, cls = steps[i]
+            empty_tail[i] = empty_tail[i + 1] or (cls if kind == "map" else None)
+
+        def run(value):
+            if not isinstance(value, Some):
+                if not isinstance(value, Empty):
+                    raise TypeError(f"Expected an Option value, got {value!r}")
+                cls = empty_tail[0]
+                return value if cls is None else cls.Empty()
+            cls = type(value).__adtbase__
+            payload = value._args[0]
+            for i, (kind, func, step_cls) in enumerate(steps):
+                if kind == "map":
+                    payload = func(payload)
+                    cls = step_cls
+                else:
+                    result = func(payload)
+                    if not isinstance(result, Some):
+                        # Short-circuit, just applying class changes.
+                        tail_cls = empty_tail[i + 1]
+                        return result if tail_cls is None else tail_cls.Empty()
+                    cls = type(result).__adtbase__
+                    payload = result._args[0]
+            return cls.Some(payload)
+
+        return run
+
+
+class _ResultPipeline(_Pipeline):
+    def map(self, func: Callable) -> "_ResultPipeline":
+        ret = _return_type(func)
+        return self._add("map", func, Result[ret, Result.E] if ret else Result)
+
+    def map_error(self, func: Callable) -> "_ResultPipeline":
+        ret = _return_type(func)
+        return self._add("map_error", func, Result[Result.T, ret] if ret else Result)
+
+    def and_then(self, func: Callable) -> "_ResultPipeline":
+        return self._add("and_then", func, _return_adt(func) or Result)
+
+    def _compile(self) -> Callable:
+        steps = self._steps
+        Ok = Result.Ok
+        Error = Result.Error
+        # Every step sets the class of an Error value, so once there are no
+        # more map_error() steps an Error takes the class of the last step.
+        last_map_error = max(
+            (i for i, (kind, _, _) in enumerate(steps) if kind == "map_error"),
+            default=-1,
+        )
+        final_cls = steps[-1][2] if steps else None
+
+        def run(value):
+            if isinstance(value, Ok):
+                ok = True
+            elif isinstance(value, Error):
+                ok = False
+            else:
+                raise TypeError(f"Expected a Result value, got {value!r}")
+            cls = type(value).__adtbase__
+            payload = value._args[0]
+            for i, (kind, func, step_cls) in enumerate(steps):
+                if not ok and i > last_map_error:
+                    # Short-circuit, no further steps apply to an Error.
+                    cls = final_cls
+                    break
+                if kind == "map":
+                    if ok:
+                        payload = func(payload)
+                    cls = step_cls
+                elif kind == "map_error":
+                    if not ok:
+                        payload = func(payload)
+                    cls = step_cls
+                elif ok:
+                    result = func(payload)
+                    ok = isinstance(result, Ok)
+                    cls = type(result).__adtbase__
+                    payload = result._args[0]
+                else:
+                    cls = step_cls
+            return cls.Ok(payload) if ok else cls.Error(payload)
+
+        return run
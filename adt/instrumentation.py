@@ -0,0 +1,358 @@
+"""
+Opt-in counters and timings for ADT field construction and fieldmethods.
+
+Example:
+
+    from adt import instrumentation
+
+    instrumentation.enable()
+    ...
+    instrumentation.snapshot()  # Nested dict of counters per ADT class
+    print(instrumentation.to_prometheus())
+
+While enabled, the field classes of every ADT class (including ones created
+later) are patched to count:
+ - checked and unchecked constructions, per field, of new instances (so not
+   of fields without args, which share a single instance, nor of instances
+   shared by ADTMeta.flyweight());
+ - type check failures in the field constructor, per field;
+ - an estimate of live instances (constructed minus finalised, so instances
+   created while disabled make this an underestimate);
+ - fieldmethod calls and their cumulative time, per ADT class (calls on
+   generic specialisations count towards the generic class).
+
+disable() restores the original methods, so there is no cost when disabled.
+Counts are kept until reset().
+"""
+
+__all__ = ("disable", "enable", "is_enabled", "reset", "snapshot", "to_prometheus")
+
+import functools
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+from . import ADTMeta, _adt_classes, _class_hooks, _flyweight_inits
+
+
+_MISSING = object()
+
+_lock = threading.Lock()
+_enabled = False
+# Map of patched classes to their original attributes, _MISSING if the
+# attribute was inherited.
+_patched: "weakref.WeakKeyDictionary[type, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Map of field classes sharing instances to their original __init__, which is
+# called on cache misses rather than set on the class, see ADTMeta.flyweight().
+_patched_inits: "weakref.WeakKeyDictionary[type, Callable]" = (
+    weakref.WeakKeyDictionary()
+)
+_field_stats: "weakref.WeakKeyDictionary[type, _FieldStats]" = (
+    weakref.WeakKeyDictionary()
+)
+_method_stats: "weakref.WeakKeyDictionary[ADTMeta, Dict[str, _MethodStats]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class _FieldStats:
+    # Updates aren't locked, so counts under heavy threading are approximate.
+    __slots__ = ("constructed", "unchecked", "type_errors", "finalised")
+
+    def __init__(self):
+        self.constructed = 0
+        self.unchecked = 0
+        self.type_errors = 0
+        self.finalised = 0
+
+
+class _MethodStats:
+    __slots__ = ("calls", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """Start instrumenting all ADT classes, existing and new."""
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+        _class_hooks.append(_instrument)
+        _patch(ADTMeta, "flyweight", _instrumented_flyweight(ADTMeta.flyweight))
+        for cls in list(_adt_classes):
+            _instrument(cls)
+
+
+def disable() -> None:
+    """Stop instrumenting, restoring the original field class methods."""
+    global _enabled
+    with _lock:
+        if not _enabled:
+            return
+        _enabled = False
+        _class_hooks.remove(_instrument)
+        for cls in list(_patched):
+            _restore(cls)
+
+
+def reset() -> None:
+    """Reset all counts to zero."""
+    with _lock:
+        for stats in _field_stats.values():
+            stats.__init__()
+        for methods in _method_stats.values():
+            for stats in methods.values():
+                stats.__init__()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the counts so far, keyed by ADT class name.
+
+    Only ADT classes with non-zero counts are included.
+    """
+    result = {}
+    for cls in sorted(_adt_classes, key=_adt_name):
+        fields = {}
+        for name, field_cls in cls._fields.items():
+            stats = _field_stats.get(field_cls)
+            if stats is None or not (
+                stats.constructed or stats.unchecked or stats.type_errors
+            ):
+                continue
+            fields[name] = {
+                "constructed": stats.constructed,
+                "unchecked": stats.unchecked,
+                "type_errors": stats.type_errors,
+                "live_estimate": max(
+                    0, stats.constructed + stats.unchecked - stats.finalised
+                ),
+            }
+        methods = {
+            name: {"calls": stats.calls, "seconds": stats.seconds}
+            for name, stats in _method_stats.get(cls, {}).items()
+            if stats.calls
+        }
+        if fields or methods:
+            result[_adt_name(cls)] = {"fields": fields, "fieldmethods": methods}
+    return result
+
+
+# Snapshot group and key, metric name, type and help text.
+_PROMETHEUS_METRICS = [
+    (
+        "fields",
+        "constructed",
+        "adt_constructed_total",
+        "counter",
+        "Field instances created with type checks.",
+    ),
+    (
+        "fields",
+        "unchecked",
+        "adt_unchecked_total",
+        "counter",
+        "Field instances created without type checks.",
+    ),
+    (
+        "fields",
+        "type_errors",
+        "adt_type_errors_total",
+        "counter",
+        "Field constructor calls that failed type checks.",
+    ),
+    (
+        "fields",
+        "live_estimate",
+        "adt_live_instances",
+        "gauge",
+        "Estimated number of live field instances.",
+    ),
+    (
+        "fieldmethods",
+        "calls",
+        "adt_fieldmethod_calls_total",
+        "counter",
+        "Fieldmethod calls.",
+    ),
+    (
+        "fieldmethods",
+        "seconds",
+        "adt_fieldmethod_seconds_total",
+        "counter",
+        "Cumulative time spent in fieldmethods.",
+    ),
+]
+
+
+def to_prometheus(snap: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Format a snapshot (by default the current counts) as Prometheus text."""
+    if snap is None:
+        snap = snapshot()
+    lines = []
+    for group, key, metric, kind, doc in _PROMETHEUS_METRICS:
+        label = "field" if group == "fields" else "method"
+        lines += [f"# HELP {metric} {doc}", f"# TYPE {metric} {kind}"]
+        for adt_name, groups in snap.items():
+            for name, counts in groups[group].items():
+                labels = f'adt="{_escape(adt_name)}",{label}="{_escape(name)}"'
+                lines.append(f"{metric}{{{labels}}} {counts[key]}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _adt_name(cls: ADTMeta) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _patch(cls: type, name: str, value: Any) -> None:
+    originals = _patched.setdefault(cls, {})
+    if name not in originals:
+        originals[name] = cls.__dict__.get(name, _MISSING)
+    setattr(cls, name, value)
+
+
+def _restore(cls: type) -> None:
+    for name, original in _patched.pop(cls).items():
+        if original is _MISSING:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, original)
+    init = _patched_inits.pop(cls, None)
+    if init is not None and cls in _flyweight_inits:
+        _flyweight_inits[cls] = init
+
+
+def _instrument(cls: ADTMeta) -> None:
+    for field_cls in cls._fields.values():
+        if field_cls not in _patched:
+            _instrument_field(field_cls)
+
+    # Fieldmethods are set on the ADT class's field base class, and inherited
+    # by generic specialisations.
+    field_base_cls = cls._FieldBase
+    methods = _method_stats.setdefault(cls, {})
+    for name, method in list(field_base_cls.__dict__.items()):
+        if getattr(method, "__isfieldmethod__", False):
+            stats = methods.setdefault(name, _MethodStats())
+            _patch(field_base_cls, name, _timed_method(method, stats))
+
+
+def _instrument_field(field_cls: type) -> None:
+    if not field_cls.__arg_types__:
+        # Fields without args share a single instance, so aren't counted.
+        return
+    stats = _field_stats.get(field_cls)
+    if stats is None:
+        stats = _field_stats[field_cls] = _FieldStats()
+    init = _flyweight_inits.get(field_cls)
+    if init is not None:
+        # Only count instances created on cache misses.
+        _patched_inits[field_cls] = init
+        _flyweight_inits[field_cls] = _counting_init(init, stats)
+    else:
+        init = _original(field_cls, "__init__")
+        _patch(field_cls, "__init__", _counting_init(init, stats))
+    unchecked = _original(field_cls, "_unchecked").__func__
+    _patch(field_cls, "_unchecked", _counting_unchecked(unchecked, stats))
+    _patch(field_cls, "__del__", _counting_del(stats))
+
+
+def _original(cls: type, name: str) -> Any:
+    # Generic specialisations subclass the field classes, which may already be
+    # patched, so look past the counting wrappers to the original attribute.
+    for base in cls.__mro__:
+        originals = _patched.get(base, {})
+        if name in originals:
+            original = originals[name]
+        else:
+            original = base.__dict__.get(name, _MISSING)
+        if original is not _MISSING:
+            return original
+    raise AttributeError(name)
+
+
+def _instrumented_flyweight(flyweight: Callable) -> Callable:
+    # Sharing instances replaces the __new__() and __init__() of the field
+    # classes of the ADT class and its specialisations, so stop instrumenting
+    # them until it's done.
+    @functools.wraps(flyweight)
+    def wrapper(cls, field_name, *args, **kwargs):
+        field_cls = cls._fields.get(field_name)
+        with _lock:
+            field_classes = [
+                c
+                for c in list(_patched)
+                if field_cls is not None and issubclass(c, field_cls)
+            ]
+            for c in field_classes:
+                _restore(c)
+            try:
+                return flyweight(cls, field_name, *args, **kwargs)
+            finally:
+                for c in field_classes:
+                    _instrument_field(c)
+
+    return wrapper
+
+
+def _counting_init(init: Callable, stats: _FieldStats) -> Callable:
+    @functools.wraps(init)
+    def __init__(self, *args):
+        try:
+            init(self, *args)
+        except TypeError:
+            stats.type_errors += 1
+            raise
+        stats.constructed += 1
+
+    return __init__
+
+
+def _counting_unchecked(func: Callable, stats: _FieldStats) -> classmethod:
+    @functools.wraps(func)
+    def _unchecked(cls, *args):
+        stats.unchecked += 1
+        return func(cls, *args)
+
+    return classmethod(_unchecked)
+
+
+def _counting_del(stats: _FieldStats) -> Callable:
+    def __del__(self):
+        try:
+            self._args
+        except AttributeError:
+            # Failed type checks, so wasn't counted as constructed.
+            return
+        stats.finalised += 1
+
+    return __del__
+
+
+def _timed_method(method: Callable, stats: _MethodStats) -> Callable:
+    # Async fieldmethods are only timed up to creating the coroutine.
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+
+    return wrapper
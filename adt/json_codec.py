@@ -0,0 +1,220 @@
+"""
+JSON encoding of ADT values.
+
+A value is encoded as an object with the field name as "tag" and the field's
+args as "args", e.g. {"tag": "Ok", "args": [1]}. Args declared as an ADT
+class are encoded in the same way, while other args are left to the json
+module.
+
+Decoding checks the args with the field's constructor, so e.g. a string for
+an int arg raises ValueError. Ints are accepted for float args.
+
+Encoders and decoders are compiled once per ADT class, including each
+generic specialisation.
+"""
+
+__all__ = ("dump_stream", "dumps", "from_json", "load_stream", "loads", "to_json")
+
+import json
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from . import ADTMeta, _FieldBase
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def _to_float(value):
+    # JSON doesn't distinguish 1 from 1.0.
+    return float(value) if type(value) is int else value
+
+
+class _Codec:
+    """Encoder and decoder for the values of an ADT class."""
+
+    __slots__ = ("adt_cls", "_encoders", "_decoders")
+
+    def __init__(self, adt_cls: ADTMeta):
+        self.adt_cls = adt_cls
+        # Map of field class to the field name and the arg encoders.
+        self._encoders: Dict[type, Tuple[str, List[Callable]]] = {}
+        # Map of field name to the field class and the arg decoders.
+        self._decoders: Dict[str, Tuple[type, List[Callable]]] = {}
+        for name, field_cls in adt_cls._fields.items():
+            encoders = []
+            decoders = []
+            for arg_type in field_cls.__arg_types__:
+                if isinstance(arg_type, ADTMeta):
+                    codec = _get_codec(arg_type)
+                    encoders.append(codec.encode)
+                    decoders.append(codec.decode)
+                else:
+                    encoders.append(None)
+                    decoders.append(_to_float if arg_type is float else None)
+            # Leave out the converters when the args are passed through as-is.
+            self._encoders[field_cls] = (name, encoders if any(encoders) else [])
+            self._decoders[name] = (field_cls, decoders if any(decoders) else [])
+
+    def encode(self, value: _FieldBase) -> Dict[str, Any]:
+        try:
+            name, encoders = self._encoders[type(value)]
+        except KeyError:
+            name, encoders = self._resolve(type(value))
+        if not encoders:
+            return {"tag": name, "args": list(value._args)}
+        return {
+            "tag": name,
+            "args": [
+                arg if enc is None else enc(arg)
+                for enc, arg in zip(encoders, value._args)
+            ],
+        }
+
+    def decode(self, obj: Any) -> _FieldBase:
+        try:
+            name = obj["tag"]
+            args = obj["args"]
+        except (TypeError, KeyError):
+            raise ValueError(
+                f"Expected a JSON object with 'tag' and 'args', got {obj!r}"
+            ) from None
+        try:
+            field_cls, decoders = self._decoders[name]
+        except (TypeError, KeyError):
+            raise ValueError(
+                f"Invalid tag {name!r} for {self.adt_cls.__qualname__!r}"
+            ) from None
+        if type(args) is not list:
+            raise ValueError(f"Expected a JSON array for 'args', got {args!r}")
+        if decoders and len(args) == len(decoders):
+            args = [
+                arg if dec is None else dec(arg) for dec, arg in zip(decoders, args)
+            ]
+        try:
+            return field_cls(*args)
+        except TypeError as e:
+            raise ValueError(str(e)) from None
+
+    def _resolve(self, field_cls: type) -> Tuple[str, List[Callable]]:
+        # Generic specialisations subclass the field classes, so look in the MRO.
+        # Not remembered, so that the subclasses can be freed before the codec.
+        for base in field_cls.__mro__[1:]:
+            if base in self._encoders:
+                return self._encoders[base]
+        raise TypeError(
+            f"Expected a field of {self.adt_cls.__qualname__!r}, "
+            f"got {field_cls.__name__!r}"
+        )
+
+
+def _get_codec(adt_cls: ADTMeta) -> _Codec:
+    # Kept on the ADT class, since the codec refers to it and its fields and so
+    # would keep them alive if kept elsewhere. Generic specialisations inherit
+    # the codec of their origin, so check it's for the given class.
+    try:
+        codec = adt_cls._json_codec
+    except AttributeError:
+        if not isinstance(adt_cls, ADTMeta):
+            raise TypeError(f"Expected an ADT class, got {adt_cls!r}") from None
+    else:
+        if codec.adt_cls is adt_cls:
+            return codec
+    codec = adt_cls._json_codec = _Codec(adt_cls)
+    return codec
+
+
+def to_json(adt_cls: ADTMeta, value: _FieldBase) -> Dict[str, Any]:
+    """Convert a value of the given ADT class to JSON-compatible objects."""
+    return _get_codec(adt_cls).encode(value)
+
+
+def from_json(adt_cls: ADTMeta, obj: Any) -> _FieldBase:
+    """Convert JSON-compatible objects, as from to_json(), to a value."""
+    return _get_codec(adt_cls).decode(obj)
+
+
+def dumps(adt_cls: ADTMeta, value: _FieldBase, **kwargs) -> str:
+    """Encode a value of the given ADT class, passing kwargs to json.dumps()."""
+    return json.dumps(_get_codec(adt_cls).encode(value), **kwargs)
+
+
+def loads(adt_cls: ADTMeta, data: str) -> _FieldBase:
+    """Decode a value of the given ADT class."""
+    return _get_codec(adt_cls).decode(json.loads(data))
+
+
+def dump_stream(adt_cls: ADTMeta, values: Iterable[_FieldBase], fp: IO[str]) -> None:
+    """Write values of the given ADT class to a text file as a JSON array."""
+    encode = _get_codec(adt_cls).encode
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    chunk = ["["]
+    size = 0
+    for i, value in enumerate(values):
+        if i:
+            chunk.append(",")
+        text = encoder.encode(encode(value))
+        chunk.append(text)
+        size += len(text)
+        if size >= _STREAM_CHUNK_SIZE:
+            fp.write("".join(chunk))
+            chunk.clear()
+            size = 0
+    chunk.append("]")
+    fp.write("".join(chunk))
+
+
+def load_stream(adt_cls: ADTMeta, fp: IO[str]) -> Iterator[_FieldBase]:
+    """
+    Lazily decode values from a text file containing a JSON array.
+
+    Elements are decoded one at a time, reading the file in chunks.
+    """
+    decode = _get_codec(adt_cls).decode
+    buf = ""
+    pos = 0
+    eof = False
+
+    def next_char():
+        # Skip whitespace and return the next character, reading as needed.
+        nonlocal buf, pos, eof
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ""
+            chunk = fp.read(_STREAM_CHUNK_SIZE)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if next_char() == "]":
+        return
+    while True:
+        if next_char() != "{":
+            raise ValueError("Expected a JSON object in JSON array")
+        # Objects end with '}', so a decode error means the object is either
+        # invalid or not fully read yet.
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = fp.read(_STREAM_CHUNK_SIZE)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+        pos = end
+        yield decode(obj)
+        sep = next_char()
+        pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError("Expected ',' or ']' in JSON array")
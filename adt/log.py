@@ -0,0 +1,499 @@
+"""
+Append-only on-disk log of values of a single ADT class.
+
+Example:
+
+    with ADTLog(Event, "events.adtlog", "a") as log:
+        log.append(Event.start(1))
+        log.extend(events)
+
+    with ADTLog(Event, "events.adtlog") as log:
+        log[-1]  # Random access
+        for value in log.scan("start"):  # Only decodes 'start' values
+            ...
+
+A log is two files:
+ - the data file, holding a header with the ADT class's fields and their arg
+   types, then the args of each value;
+ - the index file, '<path>.idx', holding a fixed size entry per value with
+   its offset and length in the data file and its tag.
+
+The args of each value are laid out by the field's declared arg types: int,
+float and bool args are packed at fixed size, followed by the lengths and
+then the data of str, bytes and other args (ADT classes and pickled args are
+encoded as in the 'binary' module). Values with args that don't fit their
+declared types, e.g. ints beyond 64 bits, fall back to the encoding of the
+'binary' module.
+
+Both files are read through mmap. Values are decoded from the mapped data
+only when accessed, and scans by variant find matching tags in the index
+without reading the data of other values.
+
+Appended values are buffered, and written by flush() (called by close(),
+and before reads). The data is written before the index, so on opening for
+appending, data after the last indexed value (e.g. after a crash) is
+discarded. As with pickle, only open logs from trusted sources.
+"""
+
+__all__ = ("ADTLog",)
+
+import contextlib
+import mmap
+import os
+import struct
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from . import ADTMeta, _FieldBase, _type_name
+from .binary import _arg_codec, _get_codec, _read_uvarint, _write_uvarint
+
+
+VERSION = 1
+_DATA_MAGIC = b"ADTL"
+_INDEX_MAGIC = b"ADTI"
+_INDEX_HEADER_SIZE = len(_INDEX_MAGIC) + 1
+_FLUSH_SIZE = 64 * 1024
+# Number of index entries read at a time by scans.
+_SCAN_CHUNK = 64 * 1024
+
+# Offset and length of the value in the data file, and the value's tag.
+_entry = struct.Struct("<QIH")
+# Position of the low byte of the tag within an entry.
+_TAG_POS = 12
+
+# First byte of each value in the data file, giving its encoding.
+_LAYOUT_RECORD, _BINARY_RECORD = 0, 1
+# Struct codes of args packed at fixed size, with other args as their length.
+_TYPECODES = {bool: "?", int: "q", float: "d"}
+_LENGTH_CODE = "I"
+
+
+def _schema(adt_cls: ADTMeta) -> bytes:
+    """Describe the layout of the values, to check logs are opened correctly."""
+    return ";".join(
+        f"{name}({','.join(map(_type_name, field_cls.__arg_types__))})"
+        for name, field_cls in adt_cls._fields.items()
+    ).encode("utf-8")
+
+
+def _encode_str(value) -> bytes:
+    if type(value) is not str:
+        raise TypeError
+    return value.encode("utf-8")
+
+
+def _decode_str(raw: bytes) -> str:
+    return str(raw, "utf-8")
+
+
+def _encode_bytes(value) -> bytes:
+    if type(value) is not bytes:
+        raise TypeError
+    return value
+
+
+def _var_codec(arg_type) -> Tuple[Callable, Callable]:
+    """Get functions converting an arg to and from bytes of any length."""
+    if arg_type is str:
+        return _encode_str, _decode_str
+    if arg_type is bytes:
+        # Slices of the mapped data are already bytes.
+        return _encode_bytes, bytes
+    encode, decode = _arg_codec(arg_type)
+
+    def encode_arg(value) -> bytearray:
+        out = bytearray()
+        encode(out, value)
+        return out
+
+    return encode_arg, lambda raw: decode(raw, 0)[0]
+
+
+class _Layout:
+    """
+    The layout of a field's args in the data file, from its arg types.
+
+    The encoder and decoder are generated for the field's args, since they run
+    for every value.
+    """
+
+    __slots__ = ("encode", "decode")
+
+    def __init__(self, field_cls: type):
+        names = [f"a{i}" for i in range(len(field_cls.__arg_types__))]
+        codes = []
+        # Expressions packed into the fixed size part, and the names they're
+        # unpacked to.
+        packed = []
+        unpacked = []
+        encode_lines = []
+        encode_tail = []
+        decode_lines = []
+        globs = {"make": field_cls._unchecked}
+        for i, (name, arg_type) in enumerate(zip(names, field_cls.__arg_types__)):
+            if arg_type is None:
+                encode_lines.append(f"    if {name} is not None: raise TypeError")
+                decode_lines.append(f"    {name} = None")
+                continue
+            try:
+                code = _TYPECODES.get(arg_type)
+            except TypeError:
+                code = None
+            if code is not None:
+                codes.append(code)
+                packed.append(name)
+                unpacked.append(name)
+                continue
+            # Stored after the fixed size part, which holds its length.
+            codes.append(_LENGTH_CODE)
+            packed.append(f"len(p{i})")
+            unpacked.append(f"n{i}")
+            globs[f"enc{i}"], globs[f"dec{i}"] = _var_codec(arg_type)
+            encode_lines.append(f"    p{i} = enc{i}({name})")
+            encode_tail.append(f"    out += p{i}")
+            decode_lines += [
+                f"    end = pos + n{i}",
+                f"    {name} = dec{i}(data[pos:end])",
+                "    pos = end",
+            ]
+        layout = struct.Struct("<" + "".join(codes))
+        globs.update(pack=layout.pack, unpack_from=layout.unpack_from)
+        lines = [
+            "def encode(out, args):",
+            f"    {', '.join(names)}, = args" if names else "    pass",
+            *encode_lines,
+            f"    out += pack({', '.join(packed)})",
+            *encode_tail,
+            "def decode(data, pos):",
+            f"    {', '.join(unpacked)}, = unpack_from(data, pos)" if packed else "",
+            f"    pos += {layout.size}",
+            *decode_lines,
+            f"    return make({', '.join(names)}), pos",
+        ]
+        exec("\n".join(lines), globs)
+        # Raises TypeError, OverflowError or struct.error for args that don't
+        # fit the layout.
+        self.encode: Callable[[bytearray, tuple], None] = globs["encode"]
+        self.decode: Callable[[object, int], Tuple[_FieldBase, int]] = globs["decode"]
+
+
+class ADTLog:
+    """
+    An append-only log of values of a single ADT class, stored on disk.
+
+    The mode is "r" to read an existing log, "a" to append to a log
+    (created if it doesn't exist) or "w" to create an empty log.
+    """
+
+    def __init__(self, adt_cls: ADTMeta, path, mode: str = "r"):
+        if mode not in ("r", "a", "w"):
+            raise ValueError(f"Invalid mode {mode!r}, expected 'r', 'a' or 'w'")
+        self.adt_cls = adt_cls
+        self.path = os.fspath(path)
+        self.mode = mode
+        self._codec = _get_codec(adt_cls)
+        self._field_names = list(adt_cls._fields)
+        self._layouts = [_Layout(f) for f in adt_cls._fields.values()]
+        self._pending = bytearray()
+        self._pending_index = bytearray()
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+        self._len = 0
+        self._data_end = 0
+        index_path = self.path + ".idx"
+        # Close whichever files were opened if anything fails, e.g. if the index
+        # file is missing.
+        with contextlib.ExitStack() as stack:
+            if mode == "r":
+                self._data_file = stack.enter_context(open(self.path, "rb"))
+                self._index_file = stack.enter_context(open(index_path, "rb"))
+            else:
+                exists = mode == "a" and os.path.exists(self.path)
+                file_mode = "r+b" if exists else "w+b"
+                self._data_file = stack.enter_context(open(self.path, file_mode))
+                self._index_file = stack.enter_context(open(index_path, file_mode))
+                if not exists:
+                    self._write_headers()
+            self._read_headers()
+            if mode == "a":
+                self._recover()
+            self._remap()
+            stack.pop_all()
+
+    def __repr__(self):
+        return (
+            f"<{type(self).__name__} of {len(self)} "
+            f"{self.adt_cls.__qualname__} at {self.path!r}>"
+        )
+
+    def __enter__(self) -> "ADTLog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._len + len(self._pending_index) // _entry.size
+
+    def __getitem__(self, idx: int) -> _FieldBase:
+        self._sync()
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._decode_entry(idx)
+
+    def __iter__(self) -> Iterator[_FieldBase]:
+        """Lazily decode each value in order."""
+        self._sync()
+        decode = self._decode
+        for start in range(0, self._len, _SCAN_CHUNK):
+            stop = min(start + _SCAN_CHUNK, self._len)
+            # Refetch the maps, which are replaced when the log grows.
+            entries = self._index_map[
+                _INDEX_HEADER_SIZE
+                + start * _entry.size : _INDEX_HEADER_SIZE
+                + stop * _entry.size
+            ]
+            for offset, length, tag in _entry.iter_unpack(entries):
+                yield decode(offset, length, tag)
+
+    def append(self, value: _FieldBase) -> None:
+        """Append a value, written to disk on the next flush()."""
+        if self.mode == "r":
+            raise OSError("Log not opened for appending")
+        if not isinstance(value, self.adt_cls):
+            raise TypeError(
+                f"Expected a field of {self.adt_cls.__qualname__!r}, "
+                f"got {type(value).__qualname__!r}"
+            )
+        tag = type(value)._tag
+        start = len(self._pending)
+        try:
+            try:
+                self._pending.append(_LAYOUT_RECORD)
+                self._layouts[tag].encode(self._pending, value._args)
+            except (TypeError, OverflowError, struct.error):
+                del self._pending[start:]
+                self._pending.append(_BINARY_RECORD)
+                self._codec.encode(self._pending, value)
+        except BaseException:
+            del self._pending[start:]
+            raise
+        self._pending_index += _entry.pack(
+            self._data_end + start, len(self._pending) - start, tag
+        )
+        if len(self._pending) >= _FLUSH_SIZE:
+            self.flush()
+
+    def extend(self, values: Iterable[_FieldBase]) -> None:
+        for value in values:
+            self.append(value)
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write appended values to disk, optionally waiting with os.fsync()."""
+        if self._pending_index:
+            # Write the data first, so indexed values are always complete.
+            self._data_file.seek(self._data_end)
+            self._data_file.write(self._pending)
+            self._data_file.flush()
+            self._index_file.seek(_INDEX_HEADER_SIZE + self._len * _entry.size)
+            self._index_file.write(self._pending_index)
+            self._index_file.flush()
+            self._data_end += len(self._pending)
+            self._len += len(self._pending_index) // _entry.size
+            self._pending.clear()
+            self._pending_index.clear()
+            self._remap()
+        if fsync:
+            os.fsync(self._data_file.fileno())
+            os.fsync(self._index_file.fileno())
+
+    def refresh(self) -> None:
+        """Pick up values appended by another writer since opening."""
+        if self.mode != "r":
+            return
+        size = os.fstat(self._index_file.fileno()).st_size
+        count = (size - _INDEX_HEADER_SIZE) // _entry.size
+        if count > self._len:
+            self._remap()
+            self._len = count
+            self._data_end = self._entry_end(count - 1)
+
+    def close(self) -> None:
+        if self._data_file.closed:
+            return
+        try:
+            if self.mode != "r":
+                self.flush()
+        finally:
+            for m in (self._data_map, self._index_map):
+                if m is not None:
+                    m.close()
+            self._data_file.close()
+            self._index_file.close()
+
+    def count_by_variant(self) -> Dict[str, int]:
+        """Get the number of values of each field, from the index only."""
+        counts = [0] * len(self._field_names)
+        for start, tags in self._tag_chunks():
+            if tags is None:
+                for i in range(start, min(start + _SCAN_CHUNK, self._len)):
+                    counts[self._tag_at(i)] += 1
+            else:
+                for tag in range(len(counts)):
+                    counts[tag] += tags.count(tag)
+        return dict(zip(self._field_names, counts))
+
+    def scan(self, *field_names: str) -> Iterator[_FieldBase]:
+        """
+        Lazily decode the values of the given fields, in order.
+
+        Matching values are found from the tags in the index, so the data of
+        other values isn't read.
+        """
+        wanted = set()
+        for name in field_names:
+            try:
+                wanted.add(self._field_names.index(name))
+            except ValueError:
+                raise KeyError(
+                    f"No field {name!r} in {self.adt_cls.__qualname__!r}"
+                ) from None
+        if not wanted:
+            return
+        # Map wanted tags to 1 and others to 0, to find them with bytes.find().
+        table = bytes(1 if tag in wanted else 0 for tag in range(256))
+        for start, tags in self._tag_chunks():
+            if tags is None:
+                stop = min(start + _SCAN_CHUNK, self._len)
+                for i in range(start, stop):
+                    if self._tag_at(i) in wanted:
+                        yield self._decode_entry(i)
+                continue
+            marks = tags.translate(table)
+            pos = marks.find(1)
+            while pos != -1:
+                yield self._decode_entry(start + pos)
+                pos = marks.find(1, pos + 1)
+
+    def _tag_chunks(self):
+        """
+        Give the tags in the index in chunks, as (start index, tags bytes).
+
+        The tags are None for ADT classes with too many fields for a byte.
+        """
+        self._sync()
+        byte_tags = len(self._field_names) <= 256
+        for start in range(0, self._len, _SCAN_CHUNK):
+            if not byte_tags:
+                yield start, None
+                continue
+            stop = min(start + _SCAN_CHUNK, self._len)
+            first = _INDEX_HEADER_SIZE + start * _entry.size + _TAG_POS
+            last = _INDEX_HEADER_SIZE + stop * _entry.size
+            with memoryview(self._index_map) as view:
+                tags = bytes(view[first : last : _entry.size])
+            yield start, tags
+
+    def _tag_at(self, idx: int) -> int:
+        return _entry.unpack_from(
+            self._index_map, _INDEX_HEADER_SIZE + idx * _entry.size
+        )[2]
+
+    def _entry_end(self, idx: int) -> int:
+        offset, length, _ = _entry.unpack_from(
+            self._index_map, _INDEX_HEADER_SIZE + idx * _entry.size
+        )
+        return offset + length
+
+    def _decode_entry(self, idx: int) -> _FieldBase:
+        return self._decode(
+            *_entry.unpack_from(self._index_map, _INDEX_HEADER_SIZE + idx * _entry.size)
+        )
+
+    def _decode(self, offset: int, length: int, tag: int) -> _FieldBase:
+        data = self._data_map
+        try:
+            if data[offset] == _LAYOUT_RECORD:
+                value, end = self._layouts[tag].decode(data, offset + 1)
+            else:
+                value, end = self._codec.decode(data, offset + 1)
+        except (IndexError, struct.error):
+            raise ValueError("Truncated value in log") from None
+        if end != offset + length:
+            raise ValueError("Encoded value length mismatch in log")
+        return value
+
+    def _sync(self) -> None:
+        if self._pending_index:
+            self.flush()
+
+    def _remap(self) -> None:
+        # Maps of the previous sizes are closed, so generators reading the log
+        # must refetch the maps as they go.
+        old_maps = (self._data_map, self._index_map)
+        self._data_map, self._index_map = (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            for f in (self._data_file, self._index_file)
+        )
+        for m in old_maps:
+            if m is not None:
+                m.close()
+
+    def _write_headers(self) -> None:
+        header = bytearray(_DATA_MAGIC)
+        header.append(VERSION)
+        schema = _schema(self.adt_cls)
+        _write_uvarint(header, len(schema))
+        header += schema
+        self._data_file.write(header)
+        self._data_file.flush()
+        self._index_file.write(_INDEX_MAGIC + bytes((VERSION,)))
+        self._index_file.flush()
+
+    def _read_headers(self) -> None:
+        self._data_file.seek(0)
+        data = self._data_file.read(_FLUSH_SIZE)
+        pos = len(_DATA_MAGIC)
+        if len(data) <= pos or data[:pos] != _DATA_MAGIC:
+            raise ValueError("Not an ADT log")
+        if data[pos] != VERSION:
+            raise ValueError("Unsupported log version")
+        try:
+            length, pos = _read_uvarint(data, pos + 1)
+        except IndexError:
+            raise ValueError("Truncated log header") from None
+        schema = data[pos : pos + length]
+        if schema != _schema(self.adt_cls):
+            raise ValueError(
+                f"Log is for fields {schema.decode('utf-8', 'replace')!r}, not "
+                f"{self.adt_cls.__qualname__!r}"
+            )
+        self._data_start = pos + length
+        self._index_file.seek(0)
+        index_header = self._index_file.read(_INDEX_HEADER_SIZE)
+        if index_header != _INDEX_MAGIC + bytes((VERSION,)):
+            raise ValueError("Not an ADT log index")
+        size = os.fstat(self._index_file.fileno()).st_size
+        self._len = (size - _INDEX_HEADER_SIZE) // _entry.size
+        self._data_end = self._data_start
+        if self._len:
+            self._index_file.seek(_INDEX_HEADER_SIZE + (self._len - 1) * _entry.size)
+            offset, length, _ = _entry.unpack(self._index_file.read(_entry.size))
+            self._data_end = offset + length
+
+    def _recover(self) -> None:
+        # Drop partly written index entries, entries for data that wasn't
+        # written, and data that wasn't indexed.
+        data_size = os.fstat(self._data_file.fileno()).st_size
+        while self._len and self._data_end > data_size:
+            self._len -= 1
+            self._data_end = self._data_start
+            if self._len:
+                self._index_file.seek(
+                    _INDEX_HEADER_SIZE + (self._len - 1) * _entry.size
+                )
+                offset, length, _ = _entry.unpack(self._index_file.read(_entry.size))
+                self._data_end = offset + length
+        self._index_file.truncate(_INDEX_HEADER_SIZE + self._len * _entry.size)
+        self._data_file.truncate(self._data_end)
@@ -0,0 +1,451 @@
+"""
+Batches of values of a single ADT class in shared memory, for passing between
+processes without pickling each value.
+
+Example:
+
+    # Producer
+    with SharedBatch.create(Result[int, str], values) as batch:
+        future = executor.submit(work, batch)  # Only sends the block's name
+        future.result()
+
+    # Consumer
+    def work(batch: SharedBatch):
+        with batch:
+            for value in batch:
+                ...
+
+A batch is laid out by column in a 'multiprocessing.shared_memory' block, as
+in the 'columnar' module: a column of tags, a column of each value's position
+within its field's columns, and a column per field arg. Args of type int,
+float or bool are stored in arrays, which consumers read in place (see
+column()). str and bytes args, and args of other types (encoded as in the
+'binary' module, so pickled for non-ADT types), are stored out of line with
+an array of offsets. Columns of args that don't fit their primitive type,
+e.g. ints beyond 64 bits, are stored out of line instead. As with the
+'binary' module, args are decoded as exactly the declared type.
+
+The process that creates a batch owns the block, and unlinks it on close()
+(or when the batch is garbage collected). Other processes attach to it by
+name, which is all that is pickled, and only close their mapping. The owner
+must keep the batch open until consumers have attached, or hand ownership
+over with release() and attach(..., owner=True).
+"""
+
+__all__ = ("SharedBatch",)
+
+import array
+import os
+import struct
+import sys
+import weakref
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import ADTMeta, _FieldBase
+from .binary import _arg_codec
+from .log import _schema
+
+
+VERSION = 1
+_MAGIC = b"ADTB"
+# Magic, version, number of values and schema length.
+_header = struct.Struct("<4sB3xQQ")
+# Offset and size in bytes of a column, and its typecode.
+_column = struct.Struct("<QQc7x")
+_TYPECODES = {bool: "B", int: "q", float: "d"}
+# Typecode of out-of-line columns, which hold offsets and then the data.
+_OBJECT = "O"
+_ALIGN = 8
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _open(name: str, owner: bool) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=owner)
+    if owner or os.name != "posix":
+        return shared_memory.SharedMemory(name)
+    # Before Python 3.13, attaching always registers the block with the
+    # resource tracker, to be unlinked when the process exits (or warned
+    # about, once unlinked by the owner). Unregistering afterwards would also
+    # drop the owner's registration when the tracker is shared, as it is with
+    # processes started by multiprocessing, so open the block as SharedMemory
+    # does, without registering it.
+    import _posixshmem
+    import mmap
+
+    shm = shared_memory.SharedMemory.__new__(shared_memory.SharedMemory)
+    shm._name = "/" + name if shm._prepend_leading_slash else name
+    shm._fd = _posixshmem.shm_open(shm._name, shm._flags, mode=shm._mode)
+    try:
+        shm._size = os.fstat(shm._fd).st_size
+        shm._mmap = mmap.mmap(shm._fd, shm._size)
+    except OSError:
+        os.close(shm._fd)
+        raise
+    shm._buf = memoryview(shm._mmap)
+    return shm
+
+
+def _encode_str(value) -> bytes:
+    return value.encode("utf-8")
+
+
+def _decode_str(view: memoryview) -> str:
+    return str(view, "utf-8")
+
+
+def _object_codec(arg_type) -> Tuple[Callable, Callable]:
+    """Get functions converting an arg to bytes and from a memoryview."""
+    if arg_type is str:
+        return _encode_str, _decode_str
+    if arg_type is bytes:
+        return bytes, bytes
+    encode, decode = _arg_codec(arg_type)
+
+    def encode_arg(value) -> bytearray:
+        out = bytearray()
+        encode(out, value)
+        return out
+
+    return encode_arg, lambda view: decode(view, 0)[0]
+
+
+def _object_column(values: list, encode: Callable) -> Tuple[array.array, bytes]:
+    offsets = array.array("Q", [0])
+    parts = [encode(v) for v in values]
+    total = 0
+    for part in parts:
+        total += len(part)
+        offsets.append(total)
+    return offsets, b"".join(parts)
+
+
+class SharedBatch:
+    """
+    A read-only sequence of values of a single ADT class in shared memory.
+
+    Use create() to make a batch from values, and attach() (or unpickling) to
+    read a batch made by another process.
+    """
+
+    def __init__(
+        self,
+        adt_cls: ADTMeta,
+        shm: shared_memory.SharedMemory,
+        owner: bool,
+    ):
+        # Use create() or attach().
+        self.adt_cls = adt_cls
+        self._shm = shm
+        self._owner = owner
+        self._field_classes = list(adt_cls._fields.values())
+        # Views of the block, released on close().
+        self._views: List[memoryview] = []
+        self._finalizer = weakref.finalize(self, _cleanup, shm, owner, self._views)
+        try:
+            self._read_layout()
+        except BaseException:
+            self._finalizer()
+            raise
+        # Functions to create a field instance from a position in its columns.
+        self._makers: List[Optional[Callable]] = [None] * len(self._field_classes)
+
+    @classmethod
+    def create(cls, adt_cls: ADTMeta, values: Iterable[_FieldBase]) -> "SharedBatch":
+        """Lay out values of the given ADT class in a new shared memory block."""
+        field_classes = list(adt_cls._fields.values())
+        # Map of value types to tags, filled in on first use so that values
+        # of generic specialisations are accepted by the generic class.
+        tags_by_type: Dict[type, int] = {}
+        tags = array.array("B" if len(field_classes) <= 256 else "H")
+        positions = array.array("Q")
+        counts = array.array("Q", [0] * len(field_classes))
+        # Positions of the args stored in columns, i.e. not None args.
+        arg_idxs = [
+            [i for i, t in enumerate(f.__arg_types__) if t is not None]
+            for f in field_classes
+        ]
+        columns: List[List[list]] = [[[] for _ in idxs] for idxs in arg_idxs]
+        for value in values:
+            tag = tags_by_type.get(type(value))
+            if tag is None:
+                if not isinstance(value, adt_cls):
+                    raise TypeError(
+                        f"Expected a field of {adt_cls.__qualname__!r}, "
+                        f"got {type(value).__qualname__!r}"
+                    )
+                tag = tags_by_type[type(value)] = type(value)._tag
+            tags.append(tag)
+            positions.append(counts[tag])
+            counts[tag] += 1
+            args = value._args
+            for col, i in zip(columns[tag], arg_idxs[tag]):
+                col.append(args[i])
+
+        # The data of each column, after the header, schema and column table.
+        blocks: List[Tuple[str, List]] = [
+            (tags.typecode, [tags]),
+            ("Q", [positions]),
+            ("Q", [counts]),
+        ]
+        for field_cls, cols in zip(field_classes, columns):
+            arg_types = [t for t in field_cls.__arg_types__ if t is not None]
+            for arg_type, col in zip(arg_types, cols):
+                blocks.append(_pack_column(arg_type, col))
+        schema = _schema(adt_cls)
+        table_start = _aligned(_header.size + len(schema))
+        offset = table_start + _column.size * len(blocks)
+        layout = []
+        for typecode, parts in blocks:
+            offset = _aligned(offset)
+            nbytes = sum(memoryview(p).nbytes for p in parts)
+            layout.append((offset, nbytes, typecode))
+            offset += nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            buf = shm.buf
+            buf[: _header.size] = _header.pack(_MAGIC, VERSION, len(tags), len(schema))
+            buf[_header.size : _header.size + len(schema)] = schema
+            for i, ((start, nbytes, typecode), (_, parts)) in enumerate(
+                zip(layout, blocks)
+            ):
+                _column.pack_into(
+                    buf,
+                    table_start + i * _column.size,
+                    start,
+                    nbytes,
+                    typecode.encode("ascii"),
+                )
+                for part in parts:
+                    with memoryview(part).cast("B") as data:
+                        buf[start : start + len(data)] = data
+                        start += len(data)
+            del buf
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(adt_cls, shm, owner=True)
+
+    @classmethod
+    def attach(
+        cls, adt_cls: ADTMeta, name: str, *, owner: bool = False
+    ) -> "SharedBatch":
+        """
+        Attach to a batch created by another process, given its name.
+
+        With 'owner', the block is unlinked on close(), for use after the
+        creator has called release().
+        """
+        return cls(adt_cls, _open(name, owner), owner)
+
+    def __reduce__(self):
+        return (_attach, (self.adt_cls, self.name))
+
+    def __repr__(self):
+        state = "closed" if self.closed else f"{len(self)} {self.adt_cls.__qualname__}"
+        return f"<{type(self).__name__} {self.name!r} of {state}>"
+
+    def __enter__(self) -> "SharedBatch":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self) -> Iterator[_FieldBase]:
+        makers = [self._maker(tag) for tag in range(len(self._field_classes))]
+        counts = [0] * len(self._field_classes)
+        for tag in self._tags:
+            offset = counts[tag]
+            counts[tag] = offset + 1
+            yield makers[tag](offset)
+
+    def __getitem__(self, idx: int) -> _FieldBase:
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._maker(self._tags[idx])(self._positions[idx])
+
+    def count_by_variant(self) -> Dict[str, int]:
+        """Get the number of values of each field."""
+        return dict(zip(self.adt_cls._fields, self._counts))
+
+    def column(self, field_name: str, idx: int) -> memoryview:
+        """
+        Get a read-only view of a field's arg column, of the values of that
+        field in order, given the arg's position.
+
+        Only args stored in arrays (e.g. int args) have columns. Views must be
+        released before the batch is closed.
+        """
+        try:
+            tag = list(self.adt_cls._fields).index(field_name)
+        except ValueError:
+            raise KeyError(
+                f"No field {field_name!r} in {self.adt_cls.__qualname__!r}"
+            ) from None
+        col = self._columns[tag][idx]
+        if col is None or isinstance(col, tuple):
+            raise TypeError(f"Arg {idx} of field {field_name!r} isn't in an array")
+        return col.toreadonly()
+
+    def release(self) -> None:
+        """
+        Stop owning the block, so that it isn't unlinked by close().
+
+        Call before another process attaches as the owner.
+        """
+        if self._owner:
+            if os.name == "posix":
+                from multiprocessing import resource_tracker
+
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            self._owner = False
+            self._finalizer.detach()
+            self._finalizer = weakref.finalize(
+                self, _cleanup, self._shm, False, self._views
+            )
+
+    def close(self) -> None:
+        """Close the mapping of the block, unlinking the block if owned."""
+        self._finalizer()
+
+    def _read_layout(self) -> None:
+        buf = self._shm.buf
+        magic, version, count, schema_len = _header.unpack_from(buf)
+        if magic != _MAGIC:
+            raise ValueError("Not an ADT batch")
+        if version != VERSION:
+            raise ValueError("Unsupported batch version")
+        schema = bytes(buf[_header.size : _header.size + schema_len])
+        if schema != _schema(self.adt_cls):
+            raise ValueError(
+                f"Batch is of fields {schema.decode('utf-8', 'replace')!r}, not "
+                f"{self.adt_cls.__qualname__!r}"
+            )
+        table_start = _aligned(_header.size + schema_len)
+
+        def read_column(i: int, length: int):
+            offset, nbytes, typecode = _column.unpack_from(
+                buf, table_start + i * _column.size
+            )
+            data = buf[offset : offset + nbytes]
+            self._views.append(data)
+            if typecode.decode("ascii") != _OBJECT:
+                view = data.cast(typecode.decode("ascii"))
+                self._views.append(view)
+                return view
+            # Offsets of each of the values, and the end of the last.
+            offsets = data[: 8 * (length + 1)].cast("Q")
+            values = data[8 * (length + 1) :]
+            self._views += [offsets, values]
+            return offsets, values
+
+        self._len = count
+        self._tags = read_column(0, count)
+        self._positions = read_column(1, count)
+        self._counts = read_column(2, len(self._field_classes))
+        # Per field, the column per arg, None for None args, or the offsets
+        # and data of out-of-line args.
+        self._columns: List[List] = []
+        self._arg_decoders: List[List[Optional[Callable]]] = []
+        i = 3
+        for field_cls, count in zip(self._field_classes, self._counts):
+            cols = []
+            decoders = []
+            for arg_type in field_cls.__arg_types__:
+                if arg_type is None:
+                    cols.append(None)
+                    decoders.append(None)
+                    continue
+                col = read_column(i, count)
+                i += 1
+                cols.append(col)
+                if isinstance(col, tuple):
+                    decoders.append(_object_codec(arg_type)[1])
+                else:
+                    decoders.append(bool if arg_type is bool else None)
+            self._columns.append(cols)
+            self._arg_decoders.append(decoders)
+        del buf
+
+    def _maker(self, tag: int) -> Callable[[int], _FieldBase]:
+        maker = self._makers[tag]
+        if maker is not None:
+            return maker
+        make = self._field_classes[tag]._unchecked
+        getters = []
+        for col, decode in zip(self._columns[tag], self._arg_decoders[tag]):
+            getters.append(_getter(col, decode))
+        if len(getters) == 1:
+            (get,) = getters
+
+            def maker(i):
+                return make(get(i))
+
+        else:
+
+            def maker(i):
+                return make(*[get(i) for get in getters])
+
+        self._makers[tag] = maker
+        return maker
+
+
+def _getter(col, decode: Optional[Callable]) -> Callable[[int], object]:
+    """Get a function reading the arg at a position in a column."""
+    if col is None:
+        return lambda i: None
+    if isinstance(col, tuple):
+        offsets, data = col
+        return lambda i: decode(data[offsets[i] : offsets[i + 1]])
+    if decode is None:
+        return col.__getitem__
+    return lambda i: decode(col[i])
+
+
+def _pack_column(arg_type, values: list) -> Tuple[str, List]:
+    """Get the typecode and data of a column of args of the given type."""
+    try:
+        typecode = _TYPECODES.get(arg_type)
+    except TypeError:
+        typecode = None
+    if typecode is not None:
+        try:
+            return typecode, [array.array(typecode, values)]
+        except (TypeError, OverflowError):
+            # Fall back to storing out of line.
+            pass
+    offsets, data = _object_column(values, _object_codec(arg_type)[0])
+    return _OBJECT, [offsets, data]
+
+
+def _cleanup(
+    shm: shared_memory.SharedMemory, owner: bool, views: List[memoryview]
+) -> None:
+    for view in reversed(views):
+        view.release()
+    shm.close()
+    if owner:
+        shm.unlink()
+
+
+def _attach(adt_cls: ADTMeta, name: str) -> SharedBatch:
+    return SharedBatch.attach(adt_cls, name)
@@ -0,0 +1,23 @@
+"""
+Benchmarks for the adt package, run from the repo root with 'python -m'.
+
+'python -m benchmarks' runs the suite of hot paths (see suite.py), and
+'python -m benchmarks.<name>' runs the individual comparison scripts.
+"""
+
+import timeit
+from typing import Callable
+
+
+def time_per_call(func: Callable, *args, repeat: int = 7) -> float:
+    """Return the best time per call of func(*args), in nanoseconds."""
+    timer = timeit.Timer("func(*args)", globals={"func": func, "args": args})
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def report(rows, unit: str = "ns/call") -> None:
+    """Print (name, value) rows as an aligned table."""
+    width = max(len(name) for name, _ in rows) + 2
+    for name, value in rows:
+        print(f"{name:<{width}}{value:>10.1f} {unit}")
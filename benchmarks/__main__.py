@@ -0,0 +1,117 @@
+"""
+Run the benchmark suite of the library's hot paths.
+
+Usage:
+
+    python -m benchmarks [-k PATTERN] [--json PATH] [--compare BASELINE]
+
+Results are printed as a table and optionally written as JSON. With
+--compare, each result is compared with a JSON file written by a previous
+run, and the exit status is 1 if any case is slower by more than the
+threshold.
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+import adt
+
+from . import time_per_call
+from .suite import Case, make_cases
+
+
+def run(cases: List[Case], repeat: int) -> Dict[str, float]:
+    results = {}
+    for name, func, args in cases:
+        results[name] = time_per_call(func, *args, repeat=repeat)
+        print(f"{name:<36}{results[name]:>10.1f} ns/call")
+    return results
+
+
+def to_json(results: Dict[str, float]) -> Dict:
+    return {
+        "meta": {
+            "adt_version": adt.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "unit": "ns/call",
+        "results": results,
+    }
+
+
+def compare(results: Dict[str, float], baseline: Dict, threshold: float) -> bool:
+    """Print a comparison with the baseline, returning whether any regressed."""
+    base_results = baseline["results"]
+    regressed = False
+    print(f"\n{'':<36}{'baseline':>10}{'current':>10}{'ratio':>8}")
+    for name, value in results.items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:<36}{'-':>10}{value:>10.1f}{'new':>8}")
+            continue
+        ratio = value / base
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  SLOWER"
+            regressed = True
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:<36}{base:>10.1f}{value:>10.1f}{ratio:>8.2f}{flag}")
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n\n")[0].strip()
+    )
+    parser.add_argument(
+        "-k", dest="patterns", action="append", help="only run matching cases (glob)"
+    )
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="compare with a previous JSON output"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="ratio change counted as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=7,
+        help="timing repeats, taking the best (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    cases = make_cases()
+    if args.patterns:
+        cases = [
+            case
+            for case in cases
+            if any(fnmatch.fnmatch(case[0], p) for p in args.patterns)
+        ]
+    results = run(cases, args.repeat)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(to_json(results), f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Write and scan throughput of an ADTLog vs pickling values one by one, and
+RSS growth while iterating.
+
+Run with: python -m benchmarks.adt_log [N]
+"""
+
+import os
+import pickle
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import adt
+from adt.log import ADTLog
+
+from . import report
+
+
+class Event(adt.ADT):
+    start: (int, str)
+    data: (int, float, bytes)
+    stop: (int,)
+
+
+def make_value(rng: random.Random, i: int):
+    kind = rng.random()
+    if kind < 0.01:
+        return Event.start(i, "job")
+    elif kind < 0.98:
+        return Event.data(i, rng.random(), b"x" * 16)
+    else:
+        return Event.stop(i)
+
+
+def rss_kb() -> int:
+    """Current resident set size, or the peak where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    values = [make_value(rng, i) for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "events.adtlog")
+        pickle_path = os.path.join(tmp, "events.pickle")
+
+        def write_log():
+            with ADTLog(Event, log_path, "w") as log:
+                log.extend(values)
+
+        def write_pickles():
+            with open(pickle_path, "wb") as f:
+                for value in values:
+                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+
+        def read_pickles(stop_only=False):
+            with open(pickle_path, "rb") as f:
+                while True:
+                    try:
+                        value = pickle.load(f)
+                    except EOFError:
+                        return
+                    if stop_only and not isinstance(value, Event.stop):
+                        continue
+
+        def iterate_log():
+            with ADTLog(Event, log_path) as log:
+                for _ in log:
+                    pass
+
+        def scan_log():
+            with ADTLog(Event, log_path) as log:
+                for _ in log.scan("stop"):
+                    pass
+
+        rows = [
+            ("write: pickle per value", timed(write_pickles)),
+            ("write: ADTLog", timed(write_log)),
+            ("read all: pickle per value", timed(read_pickles)),
+            ("read all: ADTLog", timed(iterate_log)),
+            ("scan 2% 'stop': pickle", timed(lambda: read_pickles(stop_only=True))),
+            ("scan 2% 'stop': ADTLog", timed(scan_log)),
+        ]
+        report([(name, t * 1e9 / n) for name, t in rows], "ns/value")
+
+        with ADTLog(Event, log_path) as log:
+            indices = [rng.randrange(n) for _ in range(100_000)]
+            t = timed(lambda: [log[i] for i in indices])
+            report([("random access: ADTLog", t * 1e9 / len(indices))], "ns/value")
+
+        sizes = [
+            ("file size: pickle", os.path.getsize(pickle_path)),
+            ("file size: ADTLog", os.path.getsize(log_path)),
+            ("file size: ADTLog index", os.path.getsize(log_path + ".idx")),
+        ]
+        report([(name, size / 1e6) for name, size in sizes], "MB")
+
+        # Measured with the log still open, since mapped pages that have been
+        # read count towards RSS until unmapped.
+        del values
+        with ADTLog(Event, log_path) as log:
+            before = rss_kb()
+            for _ in log.scan("stop"):
+                pass
+            after_scan = rss_kb()
+            for _ in log:
+                pass
+            after_iter = rss_kb()
+        print()
+        report(
+            [
+                ("RSS growth: scan", (after_scan - before) / 1024),
+                ("RSS growth: then iterate", (after_iter - after_scan) / 1024),
+            ],
+            "MB",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Result.gather() vs asyncio.gather() plus manual unwrapping.
+
+Throughput is measured with many cheap coroutines, and latency with an early
+Error among slow coroutines (where fail-fast returns without waiting).
+
+Run with: python -m benchmarks.async_gather
+"""
+
+import asyncio
+import time
+
+from adt.examples import Result
+
+from . import report
+
+
+N = 10_000
+R = Result[int, str]
+
+
+async def ok(i: int, delay: float = 0) -> R:
+    await asyncio.sleep(delay)
+    return R.Ok(i)
+
+
+async def error(delay: float = 0) -> R:
+    await asyncio.sleep(delay)
+    return R.Error("failed")
+
+
+async def naive_gather(aws):
+    results = await asyncio.gather(*aws)
+    values = []
+    for result in results:
+        if not isinstance(result, R.Ok):
+            return Result[list, str].Error(result[0])
+        values.append(result[0])
+    return Result[list, str].Ok(values)
+
+
+def best_time(make_coro, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        coro = make_coro()
+        start = time.perf_counter()
+        asyncio.run(coro)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    def oks():
+        return [ok(i) for i in range(N)]
+
+    rows = [
+        ("asyncio.gather + unwrap", best_time(lambda: naive_gather(oks()))),
+        ("Result.gather", best_time(lambda: R.gather(oks()))),
+        ("Result.gather, limit=100", best_time(lambda: R.gather(oks(), limit=100))),
+    ]
+    report([(name, t * 1e9 / N) for name, t in rows], "ns/coroutine")
+
+    def slow_with_error():
+        return [error(0.01)] + [ok(i, 0.2) for i in range(100)]
+
+    rows = [
+        (
+            "asyncio.gather + unwrap",
+            best_time(lambda: naive_gather(slow_with_error())),
+        ),
+        ("Result.gather", best_time(lambda: R.gather(slow_with_error()))),
+        (
+            "Result.gather, fail_fast",
+            best_time(lambda: R.gather(slow_with_error(), fail_fast=True)),
+        ),
+    ]
+    report([(name, t * 1e3) for name, t in rows], "ms to first Error")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+ADTMeta.bulk_map() scaling with the number of worker processes.
+
+Compares against a plain loop and executor.map() over the field instances.
+
+Run with: python -m benchmarks.bulk_map [N]
+"""
+
+import concurrent.futures
+import os
+import sys
+import time
+
+from adt.examples import Result
+
+from . import report
+
+
+R = Result[int, str]
+
+
+def work(value: int) -> int:
+    # Enough work per value for parallelism to pay off.
+    for _ in range(20):
+        value = (value * 31 + 7) % 1_000_003
+    return value
+
+
+def map_work(value):
+    return value.map(work)
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    values = [R.Ok(i) if i % 10 else R.Error("err") for i in range(n)]
+    rows = [("loop", best_time(lambda: [v.map(work) for v in values]))]
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            chunksize = -(-n // (4 * workers))
+            rows.append(
+                (
+                    f"executor.map, {workers} process(es)",
+                    best_time(
+                        lambda: list(
+                            executor.map(map_work, values, chunksize=chunksize)
+                        )
+                    ),
+                )
+            )
+            rows.append(
+                (
+                    f"bulk_map, {workers} process(es)",
+                    best_time(
+                        lambda: R.bulk_map(values, "map", work, executor=executor)
+                    ),
+                )
+            )
+    report([(name, t * 1e9 / n) for name, t in rows], "ns/value")
+
+
+if __name__ == "__main__":
+    main()
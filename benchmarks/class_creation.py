@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Import time of a large synthetic module of ADT declarations.
+
+The module is generated in a temporary directory and imported in a fresh
+interpreter with '-X importtime', so the cost includes everything paid at
+CLI startup or in a new worker process.
+
+Run with: python -m benchmarks.class_creation [NUM_ADTS] [NUM_FIELDS]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from . import report
+
+
+ARG_TYPES = ["()", "(int,)", "(int, str)", "(float, bool, None)", "(T,)"]
+
+
+def generate_module(num_adts: int, num_fields: int) -> str:
+    lines = ["import typing", "", "import adt", ""]
+    for n in range(num_adts):
+        lines += ["", f"class ADT{n}(adt.ADT):"]
+        if n % 4 == 0:
+            lines.append('    T = typing.TypeVar("T")')
+        for i in range(num_fields):
+            arg_types = ARG_TYPES[i % (len(ARG_TYPES) - (n % 4 != 0))]
+            lines.append(f"    field{i}: {arg_types}")
+        lines += [
+            "",
+            "    @adt.fieldmethod",
+            "    def describe(field, basecls, prefix=''):",
+            "        return prefix + type(field).__name__",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def import_time_us(tmpdir: str, module: str) -> int:
+    """Get the cumulative import time of a module in a fresh interpreter."""
+    env = dict(os.environ)
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join([tmpdir, repo])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        # Lines are 'import time: self [us] | cumulative | imported package'.
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"No import time found for {module!r}")
+
+
+def main():
+    num_adts = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    num_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rows = []
+        for adts, fields in [(1, num_fields), (num_adts, 5), (num_adts, num_fields)]:
+            module = f"adts_{adts}x{fields}"
+            with open(os.path.join(tmpdir, module + ".py"), "w") as f:
+                f.write(generate_module(adts, fields))
+            best = min(import_time_us(tmpdir, module) for _ in range(5))
+            rows.append((f"{adts} ADTs x {fields} fields", best / 1e3))
+    report(rows, "ms import")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Result.collect(), partition() and filter_ok() vs hand-written isinstance()
+loops, over a list of Result values.
+
+Run with: python -m benchmarks.collect [N]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from adt.examples import Result
+
+from . import report
+
+
+R = Result[int, str]
+
+
+def best_time(func, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def collect_loop(values):
+    oks = []
+    for value in values:
+        if isinstance(value, Result.Ok):
+            oks.append(value[0])
+        else:
+            return R.Error(value[0])
+    return Result[list, str].Ok(oks)
+
+
+def partition_loop(values):
+    oks = []
+    errors = []
+    for value in values:
+        if isinstance(value, Result.Ok):
+            oks.append(value[0])
+        else:
+            errors.append(value[0])
+    return oks, errors
+
+
+def filter_ok_loop(values):
+    for value in values:
+        if isinstance(value, Result.Ok):
+            yield value[0]
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    oks = [R.Ok(i) for i in range(n)]
+    mixed = [R.Ok(i) if i % 2 else R.Error("e") for i in range(n)]
+
+    rows = [
+        ("collect: loop", lambda: collect_loop(oks)),
+        ("collect", lambda: R.collect(oks)),
+        ("partition: loop", lambda: partition_loop(mixed)),
+        ("partition", lambda: R.partition(mixed)),
+        ("filter_ok: loop", lambda: sum(filter_ok_loop(mixed))),
+        ("filter_ok", lambda: sum(R.filter_ok(mixed))),
+    ]
+    report([(name, best_time(func) * 1e9 / n) for name, func in rows], "ns/value")
+
+    print(f"\nPeak traced memory over a generator of {n} values:")
+    stream = lambda: (R.Ok(i) for i in range(n))  # noqa: E731
+    report(
+        [
+            ("filter_ok", peak_memory(lambda: sum(R.filter_ok(stream())))),
+            ("list(filter_ok)", peak_memory(lambda: list(R.filter_ok(stream())))),
+        ],
+        "bytes",
+    )
+
+
+if __name__ == "__main__":
+    main()
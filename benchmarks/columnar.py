@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+ADTArray vs a list of field instances, for memory and bulk operations.
+
+Run with: python -m benchmarks.columnar
+"""
+
+import gc
+import time
+import tracemalloc
+
+from adt.columnar import ADTArray
+from adt.examples import Result
+
+from . import report
+
+
+N = 200_000
+R = Result[int, str]
+
+
+def make_values():
+    return [R.Ok(i) if i % 10 else R.Error("err") for i in range(N)]
+
+
+def traced_bytes(factory) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = factory()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size
+
+
+def best_time(func, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main():
+    values = make_values()
+    arr = ADTArray(R, values)
+    report(
+        [
+            ("list of fields", traced_bytes(make_values) / N),
+            ("ADTArray", traced_bytes(lambda: ADTArray(R, make_values())) / N),
+        ],
+        "bytes/value",
+    )
+    report(
+        [
+            (
+                "count by variant: loop",
+                best_time(lambda: sum(1 for v in values if type(v) is R.Ok)),
+            ),
+            ("count by variant: ADTArray", best_time(arr.count_by_variant)),
+            (
+                "filter variant: loop",
+                best_time(lambda: [v for v in values if type(v) is R.Ok]),
+            ),
+            ("filter variant: ADTArray", best_time(lambda: arr.filter_variant("Ok"))),
+            (
+                "map variant: loop",
+                best_time(
+                    lambda: [R.Ok(v[0] * 2) if type(v) is R.Ok else v for v in values]
+                ),
+            ),
+            (
+                "map variant: ADTArray",
+                best_time(lambda: arr.map_variant("Ok", lambda x: x * 2)),
+            ),
+            ("build: ADTArray", best_time(lambda: ADTArray(R, values))),
+            ("iterate: ADTArray", best_time(lambda: list(arr))),
+        ],
+        "ms",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Field construction throughput, checked vs unchecked, and unchecked with the
+generated per-arity _unchecked() vs a generic one taking *args.
+
+Run with: python -m benchmarks.construction
+"""
+
+import adt
+from adt import _set_args
+from adt.examples import Result
+
+from . import report, time_per_call
+
+
+class MyADT(adt.ADT):
+    foo: ()
+    bar: (int,)
+    baz: (int, bool, str, None)
+
+
+R = Result[int, str]
+
+
+def varargs_unchecked(cls, *args):
+    self = object.__new__(cls)
+    _set_args(self, args)
+    return self
+
+
+def main():
+    rows = []
+    for name, field_cls, args in [
+        ("foo()", MyADT.foo, ()),
+        ("bar(int)", MyADT.bar, (1,)),
+        ("baz(int, bool, str, None)", MyADT.baz, (1, False, "hi", None)),
+        ("Result[int, str].Ok(int)", R.Ok, (1,)),
+        ("Result.Ok(T)", Result.Ok, (1,)),
+    ]:
+        rows += [
+            (f"{name}: checked", time_per_call(field_cls, *args)),
+            (f"{name}: unchecked", time_per_call(field_cls._unchecked, *args)),
+        ]
+        if args:
+            generic = classmethod(varargs_unchecked).__get__(None, field_cls)
+            rows.append((f"{name}: unchecked, *args", time_per_call(generic, *args)))
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Dispatch on the field of a value: isinstance chains vs match()/matcher().
+
+Run with: python -m benchmarks.dispatch
+"""
+
+import adt
+from adt.examples import Result
+
+from . import report, time_per_call
+
+
+R = Result[int, str]
+RESULTS = [R.Ok(i) if i % 4 else R.Error("err") for i in range(1000)]
+
+WIDTH = 16
+Wide = adt.ADTMeta(
+    "Wide",
+    (),
+    {
+        "__module__": __name__,
+        "__annotations__": {f"v{i}": (int,) for i in range(WIDTH)},
+    },
+)
+WIDE_FIELDS = list(Wide._fields.values())
+WIDES = [WIDE_FIELDS[i % WIDTH](i) for i in range(1000)]
+
+
+def result_isinstance_chain(value):
+    if isinstance(value, Result.Ok):
+        return value[0]
+    elif isinstance(value, Result.Error):
+        return -1
+    assert False
+
+
+def result_type_chain(value):
+    if type(value) is R.Ok:
+        return value[0]
+    elif type(value) is R.Error:
+        return -1
+    assert False
+
+
+def result_match(value):
+    return Result.match(value, Ok=lambda x: x, Error=lambda e: -1)
+
+
+result_matcher = Result.matcher(Ok=lambda x: x, Error=lambda e: -1)
+
+
+def wide_isinstance_chain(value):
+    for i, field_cls in enumerate(WIDE_FIELDS):
+        if isinstance(value, field_cls):
+            return value[0] + i
+    assert False
+
+
+wide_matcher = Wide.matcher(
+    **{f"v{i}": (lambda i: lambda x: x + i)(i) for i in range(WIDTH)}
+)
+
+
+def main():
+    rows = []
+    for name, func, values in [
+        ("Result: isinstance chain", result_isinstance_chain, RESULTS),
+        ("Result: type() is chain", result_type_chain, RESULTS),
+        ("Result: match()", result_match, RESULTS),
+        ("Result: matcher()", result_matcher, RESULTS),
+        (f"{WIDTH} fields: isinstance chain", wide_isinstance_chain, WIDES),
+        (f"{WIDTH} fields: matcher()", wide_matcher, WIDES),
+    ]:
+        t = time_per_call(lambda: [func(v) for v in values])
+        rows.append((name, t / len(values)))
+    report(rows, "ns/value")
+
+
+if __name__ == "__main__":
+    main()
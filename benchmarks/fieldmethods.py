@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Per-call overhead of fieldmethods compared with plain methods.
+
+Includes a replica of the previous fieldmethod descriptor, which created a
+new closure on every attribute access.
+
+Run with: python -m benchmarks.fieldmethods
+"""
+
+import functools
+
+import adt
+from adt.examples import Result
+
+from . import report, time_per_call
+
+
+class MyADT(adt.ADT):
+    bar: (int,)
+
+    @adt.fieldmethod
+    def double(field, basecls):
+        return field._args[0] * 2
+
+
+class _ClosureFieldmethod:
+    """The previous fieldmethod descriptor."""
+
+    def __init__(self, func, adt_base_cls):
+        self.func = func
+        self.adt_base_cls = adt_base_cls
+
+    def __get__(self, obj, objtype=None):
+        @functools.wraps(self.func)
+        def newfunc(*args, **kwargs):
+            return self.func(obj, self.adt_base_cls, *args, **kwargs)
+
+        return newfunc
+
+
+class Plain:
+    __slots__ = ("_args",)
+
+    def __init__(self, *args):
+        self._args = args
+
+    def double(self):
+        return self._args[0] * 2
+
+    old_double = _ClosureFieldmethod(lambda field, basecls: field._args[0] * 2, None)
+
+
+def main():
+    bar = MyADT.bar(2)
+    plain = Plain(2)
+    ok = Result[int, str].Ok(2)
+    inc = lambda x: x + 1  # noqa: E731
+    rows = [
+        ("plain method", time_per_call(lambda: plain.double())),
+        ("fieldmethod", time_per_call(lambda: bar.double())),
+        ("closure-per-access fieldmethod", time_per_call(lambda: plain.old_double())),
+        ("Result.Ok.with_default()", time_per_call(lambda: ok.with_default(0))),
+        ("Result.Ok.map()", time_per_call(lambda: ok.map(inc))),
+    ]
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Cost of generic specialisation via ADTMeta.__getitem__(), warm and cold.
+
+Cold specialisation rebuilds the namespace, the _FieldBase subclass and one
+field class per field, so is measured for different numbers of fields.
+
+Run with: python -m benchmarks.generics
+"""
+
+import functools
+from typing import TypeVar
+
+import adt
+from adt.examples import Result
+
+from . import report, time_per_call
+
+
+FIELD_COUNTS = (2, 10, 50)
+
+
+def make_generic_adt(n: int) -> adt.ADTMeta:
+    T = TypeVar("T")
+    return adt.ADTMeta(
+        f"Generic{n}",
+        (),
+        {
+            "__module__": __name__,
+            "T": T,
+            "__annotations__": {f"v{i}": (T, int) for i in range(n)},
+        },
+    )
+
+
+@functools.lru_cache()
+def _global_lru_getitem(cls, items):
+    """Replica of the previous process-global cache, for comparison."""
+    return cls[items]
+
+
+def cold_getitem(cls, items):
+    cls.generic_cache_clear()
+    return cls[items]
+
+
+def main():
+    Result[int, str]
+    rows = [
+        ("warm: Result[int, str]", time_per_call(lambda: Result[int, str])),
+        (
+            "warm: global lru_cache",
+            time_per_call(lambda: _global_lru_getitem(Result, (int, str))),
+        ),
+    ]
+    for n in FIELD_COUNTS:
+        cls = make_generic_adt(n)
+        rows.append(
+            (f"cold: {n} fields", time_per_call(lambda: cold_getitem(cls, int)) / 1000)
+        )
+    report(rows[:2])
+    report(rows[2:], "us/call")
+    print(Result.generic_cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Overhead of adt.instrumentation on construction and fieldmethod calls.
+
+Run with: python -m benchmarks.instrumentation
+"""
+
+from adt import instrumentation
+from adt.examples import Result
+
+from . import report, time_per_call
+
+
+R = Result[int, str]
+
+
+def incr(x: int) -> int:
+    return x + 1
+
+
+def measure(label: str):
+    ok = R.Ok(1)
+    return [
+        (f"R.Ok(1): {label}", time_per_call(R.Ok, 1)),
+        (f"R.Ok._unchecked(1): {label}", time_per_call(R.Ok._unchecked, 1)),
+        (f"ok.map(incr): {label}", time_per_call(ok.map, incr)),
+    ]
+
+
+def main():
+    rows = measure("never enabled")
+    instrumentation.enable()
+    rows += measure("enabled")
+    instrumentation.disable()
+    rows += measure("disabled")
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Allocations and time for shared nullary instances and flyweight fields.
+
+Run with: python -m benchmarks.interning
+"""
+
+import gc
+import sys
+
+from adt import _new_unchecked
+from adt.examples import Option, Result
+
+from . import report, time_per_call
+
+
+N = 100_000
+O = Option[int]
+R = Result[int, str]
+
+
+def allocated_blocks(make) -> float:
+    """Get the memory blocks allocated per value, keeping the values alive."""
+    values = [None] * N
+    gc.collect()
+    before = sys.getallocatedblocks()
+    for i in range(N):
+        values[i] = make()
+    return (sys.getallocatedblocks() - before) / N
+
+
+def main():
+    cases = [
+        # What Option.Empty() used to do.
+        ("Option.Empty(): new each time", lambda: _new_unchecked(O.Empty), False),
+        ("Option.Empty(): shared", O.Empty, False),
+        ("Result.Error('timeout'): new each time", lambda: R.Error("timeout"), False),
+        ("Result.Error('timeout'): flyweight", lambda: R.Error("timeout"), True),
+    ]
+    blocks = []
+    timings = []
+    for name, make, flyweight in cases:
+        R.flyweight("Error", maxsize=128 if flyweight else 0)
+        blocks.append((name, allocated_blocks(make)))
+        timings.append((name, time_per_call(make)))
+    R.flyweight("Error", maxsize=0)
+    report(blocks, "blocks/value")
+    report(timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Compiled JSON codecs vs a reflective converter walking _fields per value.
+
+Run with: python -m benchmarks.json_codec
+"""
+
+import io
+import json
+import time
+
+import adt
+from adt import json_codec
+from adt.examples import Option, Result
+
+from . import report
+
+
+N = 50_000
+R = Result[int, str]
+
+
+class Event(adt.ADT):
+    started: (int, str)
+    finished: (int, R, Option[str])
+
+
+def reflective_to_json(value):
+    args = [reflective_to_json(arg) if adt.is_adt_field(arg) else arg for arg in value]
+    return {"tag": type(value).__name__, "args": args}
+
+
+def reflective_from_json(adt_cls, obj):
+    field_cls = adt_cls._fields[obj["tag"]]
+    args = [
+        reflective_from_json(t, arg) if adt.is_adt(t) else arg
+        for t, arg in zip(field_cls.__arg_types__, obj["args"])
+    ]
+    return field_cls(*args)
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    values = [
+        Event.started(i, "job")
+        if i % 2
+        else Event.finished(i, R.Ok(i) if i % 3 else R.Error("e"), Option[str].Empty())
+        for i in range(N)
+    ]
+    text = json.dumps([json_codec.to_json(Event, v) for v in values])
+    objs = json.loads(text)
+    rows = []
+    for name, func in [
+        ("encode: compiled", lambda: [json_codec.to_json(Event, v) for v in values]),
+        ("encode: reflective", lambda: [reflective_to_json(v) for v in values]),
+        ("decode: compiled", lambda: [json_codec.from_json(Event, o) for o in objs]),
+        (
+            "decode: reflective",
+            lambda: [reflective_from_json(Event, o) for o in objs],
+        ),
+        (
+            "load_stream()",
+            lambda: list(json_codec.load_stream(Event, io.StringIO(text))),
+        ),
+        (
+            "json.loads() + decode",
+            lambda: [json_codec.from_json(Event, o) for o in json.loads(text)],
+        ),
+    ]:
+        rows.append((name, N / best_time(func) / 1000))
+    report(rows, "k values/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+isinstance()/issubclass()/'in' checks on ADT classes by number of fields.
+
+Includes replicas of the previous checks, which scanned the field classes.
+
+Run with: python -m benchmarks.membership
+"""
+
+import adt
+
+from . import report, time_per_call
+
+
+FIELD_COUNTS = (2, 10, 50, 100, 500)
+
+
+def make_adt(n: int) -> adt.ADTMeta:
+    return adt.ADTMeta(
+        f"ADT{n}",
+        (),
+        {
+            "__module__": __name__,
+            "__annotations__": {f"v{i}": (int,) for i in range(n)},
+        },
+    )
+
+
+def scan_contains(cls, item):
+    return item in cls._fields.values() or type(item) in cls._fields.values()
+
+
+def scan_subclasscheck(cls, subclass):
+    if subclass in cls._fields.values():
+        return True
+    for base in subclass.__bases__:
+        if base in cls._fields.values():
+            return True
+    return type.__subclasscheck__(cls, subclass)
+
+
+def main():
+    rows = []
+    for n in FIELD_COUNTS:
+        cls = make_adt(n)
+        last = cls._fields[f"v{n - 1}"](1)
+        rows += [
+            (f"{n} fields: isinstance()", time_per_call(lambda: isinstance(last, cls))),
+            (
+                f"{n} fields: scanning isinstance()",
+                time_per_call(lambda: scan_subclasscheck(cls, type(last))),
+            ),
+            (f"{n} fields: 'in'", time_per_call(lambda: last in cls)),
+            (
+                f"{n} fields: scanning 'in'",
+                time_per_call(lambda: scan_contains(cls, last)),
+            ),
+            (
+                f"{n} fields: isinstance() miss",
+                time_per_call(lambda: isinstance(1, cls)),
+            ),
+            (
+                f"{n} fields: scanning isinstance() miss",
+                time_per_call(lambda: scan_subclasscheck(cls, int)),
+            ),
+        ]
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
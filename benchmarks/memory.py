@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Memory usage per field instance.
+
+Compares slotted field instances against the previous layout, where each
+instance carried a __dict__ holding the '_args' tuple.
+
+Run with: python -m benchmarks.memory
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import adt
+
+
+N = 100_000
+
+
+class MyADT(adt.ADT):
+    foo: ()
+    bar: (int,)
+    baz: (int, bool, str, None)
+
+
+class _DictLayout:
+    """Mimics the old field layout: an instance __dict__ holding '_args'."""
+
+    def __init__(self, *args):
+        self._args = args
+
+
+def shallow_size(obj) -> int:
+    size = sys.getsizeof(obj) + sys.getsizeof(obj._args)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def traced_size(factory, n: int = N) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objs = [factory() for _ in range(n)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objs
+    # Exclude the list used to hold the objects.
+    return (after - before - sys.getsizeof([None] * n)) / n
+
+
+def main():
+    cases = [
+        ("foo()", MyADT.foo, ()),
+        ("bar(int)", MyADT.bar, (1,)),
+        ("baz(int, bool, str, None)", MyADT.baz, (1, False, "hi", None)),
+    ]
+    print(f"{'field':<28}{'layout':<8}{'shallow':>10}{'traced':>10}")
+    for name, field_cls, args in cases:
+        for layout, factory in [
+            ("dict", lambda: _DictLayout(*args)),
+            ("slots", lambda: field_cls(*args)),
+        ]:
+            print(
+                f"{name:<28}{layout:<8}"
+                f"{shallow_size(factory()):>10}{traced_size(factory):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
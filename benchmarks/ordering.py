@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Sorting, heapq and groupby on ordered ADT values vs equivalent tuples.
+
+Run with: python -m benchmarks.ordering [N]
+"""
+
+import heapq
+import itertools
+import random
+import sys
+import time
+
+import adt
+
+from . import report
+
+
+class Event(adt.ADT, order=True):
+    start: (int,)
+    data: (int, str)
+    stop: ()
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def make_value(i: int):
+    kind = i % 3
+    if kind == 0:
+        return Event.start(i % 1000)
+    elif kind == 1:
+        return Event.data(i % 100, "x")
+    else:
+        return Event.stop()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    values = [make_value(rng.randrange(n)) for _ in range(n)]
+    tuples = [(v._tag, v._args) for v in values]
+    sorted_values = sorted(values)
+    sorted_tuples = sorted(tuples)
+
+    def groups(items, key=None):
+        for _, group in itertools.groupby(items, key):
+            for _ in group:
+                pass
+
+    rows = [
+        ("sorted: tuples", lambda: sorted(tuples)),
+        ("sorted: values", lambda: sorted(values)),
+        ("sorted: values, sort_key", lambda: sorted(values, key=Event.sort_key)),
+        ("heapq.nsmallest(100): tuples", lambda: heapq.nsmallest(100, tuples)),
+        ("heapq.nsmallest(100): values", lambda: heapq.nsmallest(100, values)),
+        ("groupby: tuples", lambda: groups(sorted_tuples)),
+        ("groupby: values", lambda: groups(sorted_values)),
+    ]
+    report([(name, best_time(func) * 1e9 / n) for name, func in rows], "ns/value")
+
+
+if __name__ == "__main__":
+    main()
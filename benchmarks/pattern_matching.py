@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Match statements on fields vs isinstance chains and matcher() dispatch.
+
+Requires Python 3.10+.
+
+Run with: python -m benchmarks.pattern_matching
+"""
+
+from adt.examples import Option, Result
+
+from . import report, time_per_call
+
+
+O = Option[int]
+OPTIONS = [O.Some(i) if i % 4 else O.Empty() for i in range(1000)]
+R = Result[int, str]
+RESULTS = [R.Ok(i) if i % 4 else R.Error("err") for i in range(1000)]
+
+
+def option_isinstance(value):
+    if isinstance(value, Option.Some):
+        return value[0]
+    else:
+        return 0
+
+
+def option_match(value):
+    match value:
+        case Option.Some(x):
+            return x
+        case Option.Empty():
+            return 0
+
+
+option_matcher = Option.matcher(Some=lambda x: x, Empty=lambda: 0)
+
+
+def result_isinstance(value):
+    if isinstance(value, Result.Ok):
+        return value[0]
+    elif isinstance(value, Result.Error):
+        return len(value[0])
+
+
+def result_match(value):
+    match value:
+        case Result.Ok(x):
+            return x
+        case Result.Error(e):
+            return len(e)
+
+
+result_matcher = Result.matcher(Ok=lambda x: x, Error=len)
+
+
+def main():
+    rows = []
+    for name, func, values in [
+        ("Option: isinstance chain", option_isinstance, OPTIONS),
+        ("Option: match statement", option_match, OPTIONS),
+        ("Option: matcher()", option_matcher, OPTIONS),
+        ("Result: isinstance chain", result_isinstance, RESULTS),
+        ("Result: match statement", result_match, RESULTS),
+        ("Result: matcher()", result_matcher, RESULTS),
+    ]:
+        t = time_per_call(lambda: [func(v) for v in values])
+        rows.append((name, t / len(values)))
+    report(rows, "ns/value")
+
+
+if __name__ == "__main__":
+    main()
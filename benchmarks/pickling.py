@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pickle round-trip cost of lists of field instances vs equivalent tuples.
+
+Run with: python -m benchmarks.pickling
+"""
+
+import pickle
+import time
+
+from adt.examples import Option, Result
+
+from . import report
+
+
+N = 100_000
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def roundtrip(values):
+    return pickle.loads(pickle.dumps(values, PROTOCOL))
+
+
+def main():
+    R = Result[int, str]
+    O = Option[int]
+    cases = [
+        ("Result[int, str]", [R.Ok(i) if i % 10 else R.Error("e") for i in range(N)]),
+        ("Option[int]", [O.Some(i) if i % 10 else O.Empty() for i in range(N)]),
+    ]
+    rows = []
+    sizes = []
+    for name, values in cases:
+        tuples = [(type(v).__name__, *v) for v in values]
+        rows += [
+            (f"{name}: fields", best_time(lambda: roundtrip(values)) / N * 1e9),
+            (f"{name}: tuples", best_time(lambda: roundtrip(tuples)) / N * 1e9),
+        ]
+        sizes += [
+            (f"{name}: fields", len(pickle.dumps(values, PROTOCOL)) / N),
+            (f"{name}: tuples", len(pickle.dumps(tuples, PROTOCOL)) / N),
+        ]
+    report(rows, "ns/value")
+    report(sizes, "bytes/value")
+
+
+if __name__ == "__main__":
+    main()
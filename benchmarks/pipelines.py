@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Eager Result/Option chaining vs a fused pipeline, over a stream of values.
+
+Run with: python -m benchmarks.pipelines [N]
+"""
+
+import sys
+import time
+
+from adt.examples import Option, Result
+
+from . import report
+
+
+R = Result[int, str]
+O = Option[int]
+
+
+def double(value: int) -> int:
+    return value * 2
+
+
+def check(value: int) -> R:
+    return R.Ok(value) if value % 3 else R.Error("multiple of 3")
+
+
+def shout(msg: str) -> str:
+    return msg.upper()
+
+
+def halve(value: int) -> O:
+    return O.Some(value // 2) if value % 2 == 0 else O.Empty()
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    results = [R.Ok(i) if i % 10 else R.Error("err") for i in range(n)]
+    options = [O.Some(i) if i % 10 else O.Empty() for i in range(n)]
+
+    result_pipeline = Result.pipeline().map(double).and_then(check).map_error(shout)
+    option_pipeline = Option.pipeline().map(double).and_then(halve).map(double)
+
+    def fused_results():
+        list(result_pipeline.run_many(results))
+
+    def fused_options():
+        list(option_pipeline.run_many(options))
+
+    def eager_results():
+        for r in results:
+            r.map(double).and_then(check).map_error(shout)
+
+    def eager_options():
+        for o in options:
+            o.map(double).and_then(halve).map(double)
+
+    rows = [
+        ("Result: eager", best_time(eager_results)),
+        ("Result: pipeline", best_time(fused_results)),
+        ("Option: eager", best_time(eager_options)),
+        ("Option: pipeline", best_time(fused_options)),
+    ]
+    report([(name, t * 1e9 / n) for name, t in rows], "ns/value")
+
+
+if __name__ == "__main__":
+    main()
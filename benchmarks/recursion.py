@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Folding, walking and transforming recursive values with fold(), walk() and
+transform() vs naive recursive functions, over a wide (balanced) tree and a
+deep (linear) one. Also times equality, hashing and repr of the trees.
+
+Run with: python -m benchmarks.recursion [LEAVES]
+"""
+
+import sys
+import time
+
+import adt
+
+from . import report
+
+
+class Tree(adt.ADT):
+    leaf: (int,)
+    node: (object, object)
+
+
+def wide_tree(lo: int, hi: int):
+    # Balanced, so only log2(leaves) deep.
+    if hi - lo == 1:
+        return Tree.leaf(lo)
+    mid = (lo + hi) // 2
+    return Tree.node(wide_tree(lo, mid), wide_tree(mid, hi))
+
+
+def deep_tree(n: int):
+    tree = Tree.leaf(0)
+    for i in range(1, n):
+        tree = Tree.node(Tree.leaf(i), tree)
+    return tree
+
+
+def naive_sum(tree) -> int:
+    if isinstance(tree, Tree.leaf):
+        return tree[0]
+    return naive_sum(tree[0]) + naive_sum(tree[1])
+
+
+def naive_walk(tree, out: list) -> list:
+    out.append(tree)
+    if isinstance(tree, Tree.node):
+        naive_walk(tree[0], out)
+        naive_walk(tree[1], out)
+    return out
+
+
+def naive_increment(tree):
+    if isinstance(tree, Tree.leaf):
+        return Tree.leaf(tree[0] + 1)
+    return Tree.node(naive_increment(tree[0]), naive_increment(tree[1]))
+
+
+def increment(tree):
+    if isinstance(tree, Tree.leaf):
+        return Tree.leaf(tree[0] + 1)
+    return tree
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def fresh_hash(make):
+    # Hashes are cached on the values, so time hashing a new tree.
+    tree = make()
+    start = time.perf_counter()
+    hash(tree)
+    return time.perf_counter() - start
+
+
+def main():
+    leaves = int(sys.argv[1]) if len(sys.argv) > 1 else 2 ** 16
+    nodes = 2 * leaves - 1
+    shapes = [
+        ("wide", lambda: wide_tree(0, leaves)),
+        ("deep", lambda: deep_tree(leaves)),
+    ]
+    # Naive recursion only gets through the deep tree with a raised limit.
+    limit = sys.getrecursionlimit()
+    for shape, make in shapes:
+        tree = make()
+        other = make()
+        print(f"{shape} tree, {nodes} values:")
+        sys.setrecursionlimit(max(limit, leaves + 100))
+        try:
+            naive_rows = [
+                ("fold: naive recursion", best_time(lambda: naive_sum(tree))),
+                ("walk: naive recursion", best_time(lambda: naive_walk(tree, []))),
+                (
+                    "transform: naive recursion",
+                    best_time(lambda: naive_increment(tree)),
+                ),
+            ]
+        finally:
+            sys.setrecursionlimit(limit)
+        fold = lambda: Tree.fold(tree, leaf=lambda x: x, node=int.__add__)  # noqa
+        rows = [
+            naive_rows[0],
+            ("fold", best_time(fold)),
+            naive_rows[1],
+            ("walk", best_time(lambda: list(Tree.walk(tree)))),
+            naive_rows[2],
+            ("transform", best_time(lambda: Tree.transform(tree, increment))),
+            ("==", best_time(lambda: tree == other)),
+            ("hash", min(fresh_hash(make) for _ in range(3))),
+            ("repr", best_time(lambda: repr(tree))),
+        ]
+        report([(name, t * 1e9 / nodes) for name, t in rows], "ns/value")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Binary encoding throughput and size vs pickle and JSON.
+
+Field instances of generic specialisations can't be pickled, so pickle and
+JSON are given equivalent (field name, *args) tuples.
+
+Run with: python -m benchmarks.serialization
+"""
+
+import io
+import json
+import pickle
+import time
+
+from adt import binary
+from adt.examples import Result
+
+from . import report
+
+
+N = 100_000
+R = Result[int, str]
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def dump_stream(values) -> bytes:
+    fp = io.BytesIO()
+    binary.dump_stream(R, values, fp)
+    return fp.getvalue()
+
+
+def main():
+    values = [R.Ok(i) if i % 10 else R.Error(f"error {i}") for i in range(N)]
+    tuples = [(type(v).__name__, *v) for v in values]
+    encoded = dump_stream(values)
+    pickled = pickle.dumps(tuples, pickle.HIGHEST_PROTOCOL)
+    json_encoded = json.dumps(tuples).encode()
+    single = [binary.dumps(R, v) for v in values]
+
+    rows = []
+    for name, func in [
+        ("binary dumps()", lambda: [binary.dumps(R, v) for v in values]),
+        ("binary loads()", lambda: [binary.loads(R, d) for d in single]),
+        ("binary dump_stream()", lambda: dump_stream(values)),
+        (
+            "binary load_stream()",
+            lambda: list(binary.load_stream(R, io.BytesIO(encoded))),
+        ),
+        (
+            "pickle dumps() tuples",
+            lambda: pickle.dumps(tuples, pickle.HIGHEST_PROTOCOL),
+        ),
+        ("pickle loads() tuples", lambda: pickle.loads(pickled)),
+        ("json dumps() tuples", lambda: json.dumps(tuples)),
+        ("json loads() tuples", lambda: json.loads(json_encoded)),
+    ]:
+        rows.append((name, N / best_time(func) / 1000))
+    report(rows, "k values/s")
+    report(
+        [
+            ("binary stream", len(encoded) / N),
+            ("pickle tuples", len(pickled) / N),
+            ("json tuples", len(json_encoded) / N),
+        ],
+        "bytes/value",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Sending batches of Result values to a worker process through a SharedBatch
+vs a multiprocessing Queue pickling the values.
+
+Run with: python -m benchmarks.shared_batch [BATCH_SIZE]
+"""
+
+import multiprocessing
+import pickle
+import sys
+import time
+
+from adt.examples import Result
+from adt.shared import SharedBatch
+
+from . import report
+
+
+R = Result[int, str]
+NUM_BATCHES = 10
+
+
+def worker(requests, responses):
+    for mode, payload in iter(requests.get, None):
+        if mode == "pickle":
+            total = sum(Result.filter_ok(payload))
+        elif mode == "shared":
+            with payload as batch:
+                total = sum(Result.filter_ok(batch))
+        else:
+            # Only reads the Ok payloads, in place.
+            with payload as batch, batch.column("Ok", 0) as col:
+                total = sum(col)
+        responses.put(total)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    values = [R.Ok(i) for i in range(n)]
+    expected = sum(range(n))
+    requests = multiprocessing.Queue()
+    responses = multiprocessing.Queue()
+    process = multiprocessing.Process(target=worker, args=(requests, responses))
+    process.start()
+
+    def send_pickled():
+        for _ in range(NUM_BATCHES):
+            requests.put(("pickle", values))
+            assert responses.get() == expected
+
+    def send_shared(mode):
+        for _ in range(NUM_BATCHES):
+            with SharedBatch.create(R, values) as batch:
+                requests.put((mode, batch))
+                assert responses.get() == expected
+
+    def best_time(func, repeat: int = 3) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times) / NUM_BATCHES / n
+
+    try:
+        rows = [
+            ("round trip: Queue + pickle", best_time(send_pickled)),
+            ("round trip: SharedBatch", best_time(lambda: send_shared("shared"))),
+            (
+                "round trip: SharedBatch, column",
+                best_time(lambda: send_shared("column")),
+            ),
+            (
+                "producer: pickle.dumps",
+                best_time(lambda: [pickle.dumps(values) for _ in range(NUM_BATCHES)]),
+            ),
+            (
+                "producer: SharedBatch.create",
+                best_time(
+                    lambda: [
+                        SharedBatch.create(R, values).close()
+                        for _ in range(NUM_BATCHES)
+                    ]
+                ),
+            ),
+        ]
+    finally:
+        requests.put(None)
+        process.join()
+    report([(name, t * 1e9) for name, t in rows], "ns/value")
+
+
+if __name__ == "__main__":
+    main()
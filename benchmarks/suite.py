@@ -0,0 +1,158 @@
+"""
+Benchmark cases for the library's hot paths, as run by 'python -m benchmarks'.
+
+Each case is a name and a function with args, timed per call.
+"""
+
+import operator
+import sys
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+import adt
+from adt.examples import Option, Result
+
+
+Case = Tuple[str, Callable, Tuple]
+
+
+class MyADT(adt.ADT):
+    foo: ()
+    bar: (int,)
+    baz: (int, bool, str, None)
+
+    @adt.fieldmethod
+    def first(field, basecls, default=None):
+        return field[0] if field._args else default
+
+
+class Typed(adt.ADT):
+    optional: (Optional[int],)
+    container: (List[int],)
+
+
+R = Result[int, str]
+O = Option[int]
+
+
+def incr(x: int) -> int:
+    return x + 1
+
+
+def check(x: int) -> R:
+    return R.Ok(x) if x >= 0 else R.Error("negative")
+
+
+def halve(x: int) -> O:
+    return O.Some(x // 2) if x % 2 == 0 else O.Empty()
+
+
+def shout(msg: str) -> str:
+    return msg.upper()
+
+
+def result_match(value):
+    return Result.match(value, Ok=incr, Error=len)
+
+
+def result_chain(value):
+    return value.map(incr).and_then(check).map_error(shout)
+
+
+result_pipeline = Result.pipeline().map(incr).and_then(check).map_error(shout)
+
+
+def option_chain(value):
+    return value.map(incr).and_then(halve).with_default(0)
+
+
+def make_generic_adt(num_fields: int) -> adt.ADTMeta:
+    T = TypeVar("T")
+    return adt.ADTMeta(
+        f"Generic{num_fields}",
+        (),
+        {
+            "__module__": __name__,
+            "T": T,
+            "__annotations__": {f"v{i}": (T, int) for i in range(num_fields)},
+        },
+    )
+
+
+def specialise_cold(generic_cls: adt.ADTMeta) -> adt.ADTMeta:
+    generic_cls.generic_cache_clear()
+    return generic_cls[int]
+
+
+CLASS_NAMESPACE = {
+    "__module__": __name__,
+    "__annotations__": {f"v{i}": (int, str) for i in range(10)},
+}
+
+
+def create_class():
+    return adt.ADTMeta("Created", (), dict(CLASS_NAMESPACE))
+
+
+def make_match_statement() -> Callable:
+    # Compiled at runtime so that the suite still runs before Python 3.10.
+    namespace = {"Result": Result}
+    exec(
+        "def match_statement(value):\n"
+        "    match value:\n"
+        "        case Result.Ok(x):\n"
+        "            return x\n"
+        "        case Result.Error(e):\n"
+        "            return e\n",
+        namespace,
+    )
+    return namespace["match_statement"]
+
+
+def make_cases() -> List[Case]:
+    ok = R.Ok(1)
+    ok2 = R.Ok(1)
+    error = R.Error("err")
+    baz = MyADT.baz(1, False, "hi", None)
+    generic2 = make_generic_adt(2)
+    generic20 = make_generic_adt(20)
+    matcher = Result.matcher(Ok=incr, Error=len)
+    cases = [
+        ("construct: nullary", MyADT.foo, ()),
+        ("construct: checked", MyADT.baz, (1, False, "hi", None)),
+        ("construct: generic", R.Ok, (1,)),
+        ("construct: typevar", Result.Ok, (1,)),
+        ("construct: unchecked", R.Ok._unchecked, (1,)),
+        ("construct: Optional", Typed.optional, (None,)),
+        ("construct: List, 10 items", Typed.container, (list(range(10)),)),
+        ("eq: same", operator.eq, (ok, ok)),
+        ("eq: equal", operator.eq, (ok, ok2)),
+        ("eq: different field", operator.eq, (ok, error)),
+        ("eq: unspecialised", operator.eq, (ok, Result.Ok(1))),
+        ("hash", hash, (baz,)),
+        ("isinstance: field", isinstance, (ok, R.Ok)),
+        ("isinstance: adt", isinstance, (ok, R)),
+        ("isinstance: generic adt", isinstance, (ok, Result)),
+        ("isinstance: other field", isinstance, (ok, R.Error)),
+        ("in: value", operator.contains, (R, ok)),
+        ("in: field class", operator.contains, (R, R.Ok)),
+        ("in: other", operator.contains, (R, 1)),
+        ("fieldmethod: bind", operator.attrgetter("first"), (baz,)),
+        ("fieldmethod: call bound", baz.first, ()),
+        ("fieldmethod: bind and call", operator.methodcaller("first", 0), (baz,)),
+        ("fieldmethod: Result.map", ok.map, (incr,)),
+        ("generic: warm", operator.getitem, (Result, (int, str))),
+        ("generic: cold, 2 fields", specialise_cold, (generic2,)),
+        ("generic: cold, 20 fields", specialise_cold, (generic20,)),
+        ("class creation: 10 fields", create_class, ()),
+        ("match: match()", result_match, (ok,)),
+        ("match: matcher()", matcher, (ok,)),
+        ("chain: Result eager", result_chain, (ok,)),
+        ("chain: Result error eager", result_chain, (error,)),
+        ("chain: Result pipeline", result_pipeline, (ok,)),
+        ("chain: Result error pipeline", result_pipeline, (error,)),
+        ("chain: Option eager", option_chain, (O.Some(2),)),
+        ("chain: Option empty eager", option_chain, (O.Empty(),)),
+    ]
+    if sys.version_info >= (3, 10):
+        cases.append(("match: statement", make_match_statement(), (ok,)))
+    return cases
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Construction of fields with typing annotations vs unchecked and hand-written
+checks.
+
+Run with: python -m benchmarks.validation
+"""
+
+from typing import Dict, List, Optional, TypeVar, Union
+
+import adt
+from adt.examples import Option
+
+from . import report, time_per_call
+
+
+class Typed(adt.ADT):
+    T = TypeVar("T")
+
+    plain: (int, str)
+    optional: (Optional[int], Union[int, str])
+    container: (List[int], Dict[str, int])
+    nested: (Option[int], List[Option[int]])
+    generic: (T, List[T])
+
+
+class ManyChecks(adt.ADT):
+    __container_sample_size__ = None
+
+    container: (List[int], Dict[str, int])
+
+
+def handwritten(values, mapping):
+    if not isinstance(values, list) or not all(isinstance(v, int) for v in values):
+        raise TypeError
+    if not isinstance(mapping, dict) or not all(
+        isinstance(k, str) and isinstance(v, int) for k, v in mapping.items()
+    ):
+        raise TypeError
+    return Typed.container._unchecked(values, mapping)
+
+
+def main():
+    small = list(range(10))
+    large = list(range(10_000))
+    mapping = {str(i): i for i in range(10)}
+    some = Option[int].Some(1)
+    options = [some] * 10
+    S = Typed[int]
+    rows = [
+        ("plain (int, str)", time_per_call(Typed.plain, 1, "a")),
+        ("optional", time_per_call(Typed.optional, None, "a")),
+        ("container: unchecked", time_per_call(Typed.container._unchecked, small, {})),
+        ("container: hand-written", time_per_call(handwritten, small, mapping)),
+        ("container: 10 items", time_per_call(Typed.container, small, mapping)),
+        ("container: 10k items, sampled", time_per_call(Typed.container, large, {})),
+        (
+            "container: 10k items, all",
+            time_per_call(ManyChecks.container, large, {}),
+        ),
+        ("nested ADTs", time_per_call(Typed.nested, some, options)),
+        ("generic: unspecialised", time_per_call(Typed.generic, 1, small)),
+        ("generic: specialised", time_per_call(S.generic, 1, small)),
+    ]
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
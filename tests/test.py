@@ -1,10 +1,40 @@
+import array
+import asyncio
+import concurrent.futures
 import dataclasses
-from typing import Optional, Tuple, TypeVar
+import gc
+import heapq
+import inspect
+import io
+import operator
+import os
+import pickle
+import sys
+import textwrap
+import weakref
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import pytest
 
 import adt
+from adt import binary, instrumentation, json_codec
+from adt.columnar import ADTArray
 from adt.examples import Option, Result
+from adt.log import ADTLog
+from adt.shared import SharedBatch
 
 
 # ------------------------------------------------------------------------------
@@ -44,6 +74,18 @@ def GenericADT():
     return adt.adt(_GenericADT)
 
 
+@pytest.fixture
+def TreeADT():
+    class _TreeADT:
+        T = TypeVar("T")
+
+        leaf: (T,)
+        node: (object, object)
+        branch: (str, tuple)
+
+    return adt.adt(_TreeADT)
+
+
 # ------------------------------------------------------------------------------
 # Positive testcases
 # ------------------------------------------------------------------------------
@@ -71,6 +113,51 @@ def test_create_generic(GenericADT):
     assert GenericADT.foo(1) == GenericADT[int, GenericADT.U].foo(1)
 
 
+def test_generic_cache(GenericADT):
+    assert GenericADT.generic_cache_info() == (0, 0, 128, 0)
+    int_str = GenericADT[int, str]
+    assert GenericADT[int, str] is int_str
+    assert GenericADT.generic_cache_info() == (1, 1, 128, 1)
+    GenericADT[bool, str]
+    assert GenericADT.generic_cache_info() == (1, 2, 128, 2)
+    GenericADT.generic_cache_clear()
+    assert GenericADT.generic_cache_info() == (0, 0, 128, 0)
+    assert GenericADT[int, str] is not int_str
+
+
+def test_generic_cache_size():
+    class _GenericADT(metaclass=adt.ADTMeta):
+        __generic_cache_size__ = 1
+        T = TypeVar("T")
+
+        foo: (T,)
+
+    class Arg:
+        pass
+
+    arg_ref = weakref.ref(Arg)
+    int_cls = _GenericADT[int]
+    arg_cls_id = id(_GenericADT[Arg])
+    del Arg
+    # Evicted specialisations are only weakly held, along with their type args.
+    _GenericADT[str]
+    # Type args are released by the first collection, and freed by the second.
+    gc.collect()
+    gc.collect()
+    assert _GenericADT.generic_cache_info() == (0, 3, 1, 2)
+    assert arg_ref() is None
+    # Specialisations still in use elsewhere aren't recreated.
+    assert _GenericADT[int] is int_cls
+    assert id(_GenericADT[str]) != arg_cls_id
+
+
+def test_generic_types_unchanged(GenericADT):
+    generic_types = dict(GenericADT._generic_types)
+    GenericADT[int, str]
+    assert GenericADT._generic_types == generic_types
+    assert GenericADT[bool, str].foo.__arg_types__ == (bool,)
+
+
 def test_name_dunders(MyADT, GenericADT):
     assert MyADT.__name__ == "_MyADT"
     assert MyADT.__qualname__ == "_MyADT"
@@ -168,17 +255,106 @@ def test_is_adt(MyADT):
     assert not adt.is_adt(MyADT.foo())
 
 
-def test_is_adt_field(MyADT):
+def test_is_adt_field(MyADT, GenericADT):
     assert adt.is_adt_field(MyADT.foo)
     assert adt.is_adt_field(MyADT.foo())
+    assert adt.is_adt_field(GenericADT[int, str].foo)
+    assert adt.is_adt_field(GenericADT[int, str].foo(1))
     assert not adt.is_adt_field(None)
     assert not adt.is_adt_field(MyADT)
 
 
-def test_adt_contains(MyADT):
+def test_adt_contains(MyADT, GenericADT):
     assert MyADT not in MyADT
     assert MyADT.bar in MyADT
     assert MyADT.bar(1) in MyADT
+    assert [] not in MyADT
+    assert None not in MyADT
+    assert GenericADT[int, str].foo(1) in GenericADT[int, str]
+    assert GenericADT[int, str].foo in GenericADT[int, str]
+    assert GenericADT.foo(1) not in GenericADT[int, str]
+
+
+def test_subclass_of_field(MyADT):
+    class SubBar(MyADT.bar):
+        __slots__ = ()
+
+    assert issubclass(SubBar, MyADT)
+    assert isinstance(SubBar(1), MyADT)
+    assert SubBar(1) not in MyADT
+    assert SubBar(4) == MyADT.bar(4)
+    assert hash(SubBar(4)) == hash(MyADT.bar(4))
+    assert not issubclass(int, MyADT)
+    assert not isinstance(1, MyADT)
+
+
+def test_nullary_singleton(MyADT):
+    foo = MyADT.foo()
+    assert MyADT.foo() is foo
+    assert MyADT.foo._unchecked() is foo
+    assert pickle.loads(pickle.dumps(Option.Empty())) is Option.Empty()
+    assert Option[int].Empty() is Option[int].Empty()
+    assert type(Option[int].Empty()) is Option[int].Empty
+    with pytest.raises(TypeError, match="Expected 0 arg"):
+        MyADT.foo(1)
+
+    class SubFoo(MyADT.foo):
+        __slots__ = ()
+
+    assert type(SubFoo()) is SubFoo
+    assert SubFoo() == foo
+    assert hash(SubFoo()) == hash(foo)
+
+
+def test_flyweight():
+    class _Result(metaclass=adt.ADTMeta):
+        Ok: (int,)
+        Error: (str,)
+        Any: (object,)
+
+    _Result.flyweight("Error", maxsize=2)
+    _Result.flyweight("Any")
+    timeout = _Result.Error("timeout")
+    assert _Result.Error("timeout") is timeout
+    assert _Result.Ok(1) is not _Result.Ok(1)
+    with pytest.raises(TypeError):
+        _Result.Error(1)
+    # Least recently used are evicted.
+    _Result.Error("a")
+    _Result.Error("timeout")
+    _Result.Error("b")
+    assert _Result.Error("timeout") is timeout
+    assert _Result.Error("a") is not _Result.Error("b")
+    assert _Result.Error("timeout") is not timeout
+    # Equal args of different types aren't shared, nor are unhashable args.
+    assert type(_Result.Any(True)[0]) is bool
+    assert type(_Result.Any(1)[0]) is int
+    assert _Result.Any([1]) is not _Result.Any([1])
+
+    class SubError(_Result.Error):
+        __slots__ = ()
+
+    assert type(SubError("timeout")) is SubError
+    _Result.flyweight("Error", maxsize=0)
+    assert _Result.Error("x") is not _Result.Error("x")
+    assert _Result.Error("x") == _Result.Error("x")
+    with pytest.raises(KeyError):
+        _Result.flyweight("Unknown")
+
+
+def test_flyweight_generic(GenericADT):
+    existing = GenericADT[int, str]
+    GenericADT.flyweight("bar")
+    # Specialisations, existing and new, share their own instances.
+    for spec, args in [(existing, (1, "b")), (GenericADT[str, str], ("a", "b"))]:
+        assert spec.bar(*args) is spec.bar(*args)
+        assert type(spec.bar(*args)) is spec.bar
+        assert spec.bar(*args) is not GenericADT.bar(*args)
+    with pytest.raises(TypeError):
+        existing.bar("a", "b")
+    GenericADT.flyweight("bar", maxsize=0)
+    assert existing.bar(1, "b") is not existing.bar(1, "b")
+    assert GenericADT[int, int].bar(1, 2) is not GenericADT[int, int].bar(1, 2)
 
 
 def test_equals(MyADT, OtherADT):
@@ -189,6 +365,62 @@ def test_equals(MyADT, OtherADT):
     assert MyADT.bar(1) != OtherADT.bar(1)
 
 
+def test_equals_generic(GenericADT):
+    assert GenericADT.foo(1) == GenericADT[int, str].foo(1)
+    assert GenericADT[int, str].foo(1) == GenericADT.foo(1)
+    assert GenericADT[int, str].foo(1) != GenericADT[int, int].foo(1)
+    assert GenericADT.foo(1) != (1,)
+    assert GenericADT.foo(1) != 1
+
+
+def test_ordering():
+    @adt.adt(order=True)
+    class _Ordered:
+        a: (int,)
+        b: ()
+        c: (str, int)
+
+    values = [_Ordered.c("z", 1), _Ordered.b(), _Ordered.a(3), _Ordered.a(1)]
+    expected = [_Ordered.a(1), _Ordered.a(3), _Ordered.b(), _Ordered.c("z", 1)]
+    assert sorted(values) == expected
+    assert sorted(values, key=_Ordered.sort_key) == expected
+    assert _Ordered.a(100) < _Ordered.b() <= _Ordered.b() < _Ordered.c("", 0)
+    assert _Ordered.c("a", 2) > _Ordered.c("a", 1) >= _Ordered.a(5)
+    assert heapq.nsmallest(1, values) == [_Ordered.a(1)]
+
+    class _Unordered(adt.ADT):
+        a: (int,)
+
+    with pytest.raises(TypeError):
+        _Unordered.a(1) < _Unordered.a(2)
+    with pytest.raises(TypeError):
+        _Ordered.a(1) < _Unordered.a(2)
+    # Values of unordered ADTs can still be sorted by key.
+    assert sorted([_Unordered.a(2), _Unordered.a(1)], key=_Unordered.sort_key) == [
+        _Unordered.a(1),
+        _Unordered.a(2),
+    ]
+
+
+def test_hash(MyADT, GenericADT):
+    assert hash(MyADT.foo()) == hash(MyADT.foo())
+    assert hash(MyADT.bar(1)) == hash(MyADT.bar(1))
+    assert hash(GenericADT.foo(1)) == hash(GenericADT[int, str].foo(1))
+    assert len({MyADT.bar(1), MyADT.bar(1), MyADT.bar(2), MyADT.foo()}) == 3
+    assert {MyADT.bar(1): "a"}[MyADT.bar(1)] == "a"
+
+
+def test_immutable(MyADT):
+    bar = MyADT.bar(1)
+    with pytest.raises(AttributeError):
+        bar._args = (2,)
+    with pytest.raises(AttributeError):
+        bar.new_attr = 2
+    with pytest.raises(AttributeError):
+        del bar._args
+    assert bar == MyADT.bar(1)
+
+
 def test_iter(MyADT):
     assert list(MyADT.foo()) == []
     assert list(MyADT.bar(1)) == [1]
@@ -214,13 +446,866 @@ def test_field_getitem(MyADT):
     assert baz[2:] == ("hi", None)
 
 
-@pytest.mark.xfail(reason="TODO")
+def test_field_slots(MyADT, GenericADT):
+    assert not hasattr(MyADT.foo(), "__dict__")
+    assert not hasattr(MyADT.baz(1, False, "hi", None), "__dict__")
+    assert not hasattr(GenericADT[int, str].bar(1, "hi"), "__dict__")
+
+
+def test_generic_field_init(GenericADT):
+    GenericADT.foo("anything")
+    GenericADT[int, str].bar(1, "hi")
+    GenericADT[int, GenericADT.U].bar(1, None)
+    with pytest.raises(TypeError):
+        GenericADT[int, str].foo("hi")
+    with pytest.raises(TypeError):
+        GenericADT[int, str].bar(1, 2)
+
+
+def test_field_init_shared_code():
+    # Fields with the same kinds of arg types share compiled __init__ code.
+    class _ADT(metaclass=adt.ADTMeta):
+        a: (int, None)
+        b: (str, None)
+
+    assert _ADT.a.__init__.__code__ is _ADT.b.__init__.__code__
+    _ADT.a(1, None)
+    _ADT.b("x", None)
+    with pytest.raises(TypeError, match="Expected instance of type 'str', got 'int'"):
+        _ADT.b(1, None)
+    with pytest.raises(TypeError, match="Expected None, got 'int'"):
+        _ADT.a(1, 1)
+
+
+def test_match(MyADT, GenericADT):
+    cases = dict(
+        foo=lambda: "foo",
+        bar=lambda x: x * 2,
+        baz=lambda x, b, s, n: s,
+    )
+    assert MyADT.match(MyADT.foo(), **cases) == "foo"
+    assert MyADT.match(MyADT.bar(2), **cases) == 4
+    assert MyADT.match(MyADT.baz(1, False, "hi", None), **cases) == "hi"
+    generic_cases = dict(foo=lambda x: x, bar=lambda x, y: y, plain=lambda x: -x)
+    assert GenericADT.match(GenericADT[int, str].bar(1, "hi"), **generic_cases) == "hi"
+
+    # Subclasses of a field are matched as the field, as with matcher().
+    class SubBar(MyADT.bar):
+        pass
+
+    assert MyADT.match(SubBar(3), **cases) == 6
+    assert MyADT.match(SubBar(3), **cases) == MyADT.matcher(**cases)(SubBar(3))
+
+
+def test_matcher(MyADT, GenericADT):
+    matcher = MyADT.matcher(
+        foo=lambda: "foo",
+        bar=lambda x: x * 2,
+        baz=lambda x, b, s, n: s,
+    )
+    assert matcher(MyADT.foo()) == "foo"
+    assert matcher(MyADT.bar(2)) == 4
+    assert matcher(MyADT.baz(1, False, "hi", None)) == "hi"
+
+    generic_matcher = GenericADT.matcher(
+        foo=lambda x: x, bar=lambda x, y: y, plain=lambda x: -x
+    )
+    assert generic_matcher(GenericADT.foo(1)) == 1
+    assert generic_matcher(GenericADT[int, str].foo(2)) == 2
+    assert generic_matcher(GenericADT[int, str].plain(3)) == -3
+
+
+def test_positional_attrs(MyADT, GenericADT):
+    assert MyADT.foo.__match_args__ == ()
+    assert MyADT.baz.__match_args__ == ("_0", "_1", "_2", "_3")
+    baz = MyADT.baz(1, False, "hi", None)
+    assert (baz._0, baz._1, baz._2, baz._3) == (1, False, "hi", None)
+    assert GenericADT[int, str].bar(1, "hi")._1 == "hi"
+    with pytest.raises(AttributeError):
+        MyADT.bar(1)._1
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="Requires match statement")
+def test_match_statement(MyADT, GenericADT):
+    # Use exec() to avoid a syntax error on older Python versions.
+    namespace = {"MyADT": MyADT, "GenericADT": GenericADT}
+    exec(
+        textwrap.dedent(
+            """\
+            def describe(value):
+                match value:
+                    case MyADT.foo():
+                        return "foo"
+                    case MyADT.bar(n) if n < 0:
+                        return "negative bar"
+                    case MyADT.bar(n):
+                        return f"bar {n}"
+                    case MyADT.baz(n, flag, s, _):
+                        return f"baz {n} {flag} {s}"
+                    case GenericADT.bar(x, y):
+                        return f"generic bar {x} {y}"
+            """
+        ),
+        namespace,
+    )
+    describe = namespace["describe"]
+    assert describe(MyADT.foo()) == "foo"
+    assert describe(MyADT.bar(-1)) == "negative bar"
+    assert describe(MyADT.bar(1)) == "bar 1"
+    assert describe(MyADT.baz(1, False, "hi", None)) == "baz 1 False hi"
+    assert describe(GenericADT[int, str].bar(1, "hi")) == "generic bar 1 hi"
+    assert describe(GenericADT.foo(1)) is None
+
+
+def test_fold(TreeADT):
+    leaf, node, branch = TreeADT.leaf, TreeADT.node, TreeADT.branch
+    tree = node(leaf(1), branch("b", (leaf(2), 3, node(leaf(4), leaf(5)))))
+    total = dict(
+        leaf=lambda x: x,
+        node=lambda left, right: left + right,
+        branch=lambda name, items: sum(items),
+    )
+    assert TreeADT.fold(tree, **total) == 15
+    assert TreeADT.fold(leaf(7), **total) == 7
+    to_str = dict(leaf=str, node="({}, {})".format, branch="{}{}".format)
+    assert TreeADT.fold(tree, **to_str) == "(1, b('2', 3, '(4, 5)'))"
+    # Values of different specialisations can be nested.
+    generic_tree = node(TreeADT[int].leaf(1), TreeADT[str].leaf("a"))
+    assert TreeADT.fold(generic_tree, **dict(total, leaf=str)) == "1a"
+    with pytest.raises(TypeError, match="Missing case"):
+        TreeADT.fold(tree, leaf=str, node=str)
+    with pytest.raises(TypeError, match="Expected a field of"):
+        TreeADT.fold(1, **total)
+
+    class _Expr(metaclass=adt.ADTMeta):
+        num: (int,)
+        add: (object, object)
+
+        @adt.fieldmethod
+        def evaluate(field, basecls):
+            return basecls.fold(field, num=lambda n: n, add=operator.add)
+
+    expr = _Expr.num(0)
+    for i in range(1, 10_000):
+        expr = _Expr.add(_Expr.num(i), expr)
+    assert expr.evaluate() == sum(range(10_000))
+
+
+def test_walk_transform(TreeADT):
+    leaf, node, branch = TreeADT.leaf, TreeADT.node, TreeADT.branch
+    tree = node(leaf(1), branch("b", (leaf(2), 3, node(leaf(4), leaf(5)))))
+    walked = TreeADT.walk(tree)
+    assert isinstance(walked, Iterator)
+    assert [v for v in walked if isinstance(v, TreeADT.leaf)] == [
+        leaf(1),
+        leaf(2),
+        leaf(4),
+        leaf(5),
+    ]
+    assert [type(v).__name__ for v in TreeADT.walk(tree)] == [
+        "node",
+        "leaf",
+        "branch",
+        "leaf",
+        "node",
+        "leaf",
+        "leaf",
+    ]
+
+    def double(value):
+        if isinstance(value, TreeADT.leaf):
+            return leaf(value[0] * 2)
+        return value
+
+    doubled = TreeADT.transform(tree, double)
+    assert doubled == node(leaf(2), branch("b", (leaf(4), 3, node(leaf(8), leaf(10)))))
+    # Values with nothing replaced aren't recreated.
+    assert TreeADT.transform(tree, lambda value: value) is tree
+    no_fives = TreeADT.transform(tree, lambda v: leaf(0) if v == leaf(5) else v)
+    assert no_fives[0] is tree[0]
+    assert no_fives[1][1][:2] == tree[1][1][:2]
+    assert no_fives[1][1][2] == node(leaf(4), leaf(0))
+
+    # Values can be replaced by values of other fields.
+    def flatten(value):
+        if isinstance(value, TreeADT.node):
+            return branch("", value._args)
+        return value
+
+    flat = TreeADT.transform(node(leaf(1), node(leaf(2), leaf(3))), flatten)
+    assert flat == branch("", (leaf(1), branch("", (leaf(2), leaf(3)))))
+
+
+def test_deep_recursive_value(TreeADT):
+    leaf, node, branch = TreeADT.leaf, TreeADT.node, TreeADT.branch
+    depth = 20_000
+    assert depth > sys.getrecursionlimit()
+
+    def make(bottom):
+        value = leaf(bottom)
+        for i in range(depth):
+            value = node(leaf(i), value) if i % 2 else branch("b", (value,))
+        return value
+
+    deep = make(0)
+    assert deep == make(0)
+    assert deep != make(1)
+    assert hash(deep) == hash(make(0))
+    text = repr(deep)
+    assert text.startswith(f"{node.__qualname__}({leaf.__qualname__}({depth - 1}), ")
+    assert text.count(leaf.__qualname__) == depth // 2 + 1
+    assert text.endswith(f"({leaf.__qualname__}(0)" + ",)))" * (depth // 2))
+    assert (
+        TreeADT.fold(
+            deep,
+            leaf=lambda x: 0,
+            node=lambda left, right: right + 1,
+            branch=lambda name, items: items[0] + 1,
+        )
+        == depth
+    )
+    assert sum(1 for _ in TreeADT.walk(deep)) == depth + depth // 2 + 1
+    assert TreeADT.transform(deep, lambda value: value) is deep
+
+
+# At module level, so that the parameter names aren't mangled.
+@adt.fieldmethod
+def _clashing_names(
+    field, basecls, func, self, __field, __func, __basecls, __default5=4
+):
+    return func, self, __field, __func, __basecls, __default5
+
+
+def test_fieldmethod_signatures():
+    class _MyADT(metaclass=adt.ADTMeta):
+        bar: (int,)
+
+        @adt.fieldmethod
+        def no_args(field, basecls):
+            return field, basecls
+
+        @adt.fieldmethod
+        def defaults(field, basecls, x, y=2, *, z=3):
+            return x, y, z
+
+        @adt.fieldmethod
+        def varargs(field, basecls, x, /, *args, **kwargs):
+            return x, args, kwargs
+
+        clashing_names = _clashing_names
+
+    bar = _MyADT.bar(1)
+    assert bar.no_args() == (bar, _MyADT)
+    assert bar.defaults(1) == (1, 2, 3)
+    assert bar.defaults(1, y=4, z=5) == (1, 4, 5)
+    assert bar.varargs(1, 2, 3, a=4) == (1, (2, 3), {"a": 4})
+    assert bar.clashing_names(1, 2, 3, 4, 5) == (1, 2, 3, 4, 5, 4)
+    assert bar.clashing_names(1, 2, 3, 4, 5, 6) == (1, 2, 3, 4, 5, 6)
+    assert _MyADT.bar.defaults(bar, 1) == (1, 2, 3)
+    assert bar.defaults.__name__ == "defaults"
+    assert str(inspect.signature(bar.defaults)) == "(x, y=2, *, z=3)"
+    assert bar.no_args == bar.no_args
+    with pytest.raises(TypeError):
+        bar.defaults(1, 2, 3)
+    with pytest.raises(TypeError):
+        bar.varargs(x=1)
+
+
+def test_unchecked(MyADT, GenericADT):
+    assert MyADT.foo._unchecked() == MyADT.foo()
+    baz = MyADT.baz._unchecked(1, False, "hi", None)
+    assert type(baz) is MyADT.baz
+    assert baz == MyADT.baz(1, False, "hi", None)
+    assert hash(baz) == hash(MyADT.baz(1, False, "hi", None))
+    assert baz._2 == "hi"
+    assert type(GenericADT[int, str].foo._unchecked(1)) is GenericADT[int, str].foo
+    # The args aren't type checked, but the number of them is.
+    assert list(MyADT.bar._unchecked("a")) == ["a"]
+    with pytest.raises(TypeError):
+        MyADT.bar._unchecked("a", "b")
+
+
+def test_adt_array(MyADT):
+    values = [
+        MyADT.foo(),
+        MyADT.bar(1),
+        MyADT.baz(2, True, "hi", None),
+        MyADT.bar(3),
+        MyADT.baz(4, False, "bye", None),
+    ]
+    arr = ADTArray(MyADT, values)
+    assert len(arr) == 5
+    assert list(arr) == values
+    assert arr[1] == MyADT.bar(1)
+    assert arr[-1] == MyADT.baz(4, False, "bye", None)
+    assert arr[2][1] is True
+    assert list(arr[1:3]) == values[1:3]
+    assert arr.count_by_variant() == {"foo": 1, "bar": 2, "baz": 2}
+    assert list(arr.filter_variant("bar")) == [MyADT.bar(1), MyADT.bar(3)]
+    assert list(arr.filter_variant("foo")) == [MyADT.foo()]
+    assert list(arr.map_variant("bar", lambda x: x * 10)) == [
+        MyADT.foo(),
+        MyADT.bar(10),
+        MyADT.baz(2, True, "hi", None),
+        MyADT.bar(30),
+        MyADT.baz(4, False, "bye", None),
+    ]
+    assert list(arr.map_variant("baz", lambda i, b, s, n: (i, not b, s, n)))[2] == (
+        MyADT.baz(2, False, "hi", None)
+    )
+    assert list(arr.column("bar", 0)) == [1, 3]
+    assert memoryview(arr.column("bar", 0)).format == "q"
+    assert arr.column("baz", 2) == ["hi", "bye"]
+    # Args not of the exact primitive type are moved to a list column.
+    arr.append(MyADT.bar(2 ** 70))
+    arr.append(MyADT.bar(True))
+    assert list(arr.filter_variant("bar")) == [
+        MyADT.bar(1),
+        MyADT.bar(3),
+        MyADT.bar(2 ** 70),
+        MyADT.bar(True),
+    ]
+    assert arr[-1][0] is True
+
+
+def test_adt_array_generic():
+    R = Result[int, str]
+    arr = ADTArray(R, [R.Ok(1), R.Error("err"), R.Ok(2)])
+    assert list(arr.filter_variant("Ok")) == [R.Ok(1), R.Ok(2)]
+    assert type(arr[0]) is R.Ok
+    assert isinstance(arr.column("Ok", 0), array.array)
+    with pytest.raises(TypeError):
+        arr.append(Result.Ok(1))
+    with pytest.raises(KeyError):
+        arr.filter_variant("Bad")
+    with pytest.raises(IndexError):
+        arr[3]
+
+
+def test_adt_log(MyADT, tmp_path):
+    path = tmp_path / "values.adtlog"
+    values = [MyADT.foo(), MyADT.bar(1), MyADT.baz(-2, True, "hi", None)] * 100
+    with ADTLog(MyADT, path, "w") as log:
+        log.extend(values[:150])
+        assert len(log) == 150
+        # Reads see unflushed values.
+        assert log[-1] == values[149]
+    with ADTLog(MyADT, path, "a") as log:
+        assert len(log) == 150
+        log.extend(values[150:])
+        assert list(log) == values
+    with ADTLog(MyADT, path) as log:
+        assert repr(log).startswith("<ADTLog of 300 ")
+        assert list(log) == values
+        assert [log[i] for i in (0, 1, 2, -1)] == values[:3] + values[-1:]
+        with pytest.raises(IndexError):
+            log[300]
+        assert log.count_by_variant() == {"foo": 100, "bar": 100, "baz": 100}
+        assert list(log.scan("bar")) == [MyADT.bar(1)] * 100
+        assert list(log.scan("foo", "baz")) == [v for v in values if v._tag != 1]
+        assert list(log.scan()) == []
+        with pytest.raises(KeyError):
+            list(log.scan("other"))
+        with pytest.raises(OSError):
+            log.append(MyADT.foo())
+
+    # Readers can pick up values appended by a writer.
+    with ADTLog(MyADT, path) as reader, ADTLog(MyADT, path, "a") as writer:
+        writer.append(MyADT.bar(2))
+        writer.flush()
+        assert len(reader) == 300
+        reader.refresh()
+        assert reader[-1] == MyADT.bar(2)
+
+    # Bad values aren't partly written.
+    with ADTLog(MyADT, path, "w") as log:
+        with pytest.raises(AttributeError):
+            log.append(MyADT.baz._unchecked(1, True, [], None))
+        with pytest.raises(TypeError):
+            log.append(Option.Empty())
+        log.append(MyADT.bar(1))
+        # Args not fitting the layout of their types fall back to the binary
+        # module's encoding.
+        log.append(MyADT.bar(2 ** 70))
+        log.append(MyADT.baz._unchecked(1, True, "hi", 0))
+        assert list(log) == [
+            MyADT.bar(1),
+            MyADT.bar(2 ** 70),
+            MyADT.baz(1, True, "hi", None),
+        ]
+
+
+def test_adt_log_generic_and_recovery(tmp_path, monkeypatch):
+    monkeypatch.setattr(adt.log, "_SCAN_CHUNK", 7)
+    path = tmp_path / "results.adtlog"
+    R = Result[int, str]
+    values = [R.Ok(i) if i % 3 else R.Error(str(i)) for i in range(50)]
+    with ADTLog(R, path, "w") as log:
+        log.extend(values)
+    with ADTLog(R, path) as log:
+        assert list(log.scan("Error")) == values[::3]
+        assert type(log[0]) is R.Error
+        assert log.count_by_variant() == {"Ok": 33, "Error": 17}
+    # Nested ADTs and args of other types.
+    nested = [
+        Result.Ok([1, 2]),
+        Result.Error(Option[int].Some(1)),
+        Result.Ok(R.Error("a")),
+    ]
+    with ADTLog(Result, tmp_path / "nested", "w") as log:
+        log.extend(nested)
+        assert list(log) == nested
+    with ADTLog(Option[R], tmp_path / "nested", "w") as log:
+        log.extend([Option[R].Some(R.Ok(1)), Option[R].Empty()])
+        assert list(log) == [Option[R].Some(R.Ok(1)), Option[R].Empty()]
+
+    # Logs are checked against the ADT class's fields.
+    with pytest.raises(ValueError, match="Log is for fields"):
+        ADTLog(Result[str, str], path)
+    with pytest.raises(ValueError, match="Not an ADT log"):
+        ADTLog(R, tmp_path / "other", "w").close()
+        (tmp_path / "other").write_bytes(b"")
+        ADTLog(R, tmp_path / "other")
+
+    # Simulate a crash after writing data but not the index, and with a
+    # partly written index entry.
+    with open(path, "ab") as f:
+        f.write(b"\x00\x02")
+    with open(str(path) + ".idx", "ab") as f:
+        f.write(b"\x00" * 5)
+    with ADTLog(R, path, "a") as log:
+        assert list(log) == values
+        log.append(R.Ok(-1))
+    with ADTLog(R, path) as log:
+        assert list(log) == values + [R.Ok(-1)]
+
+    # The data file is closed if the index file is missing.
+    opened = []
+
+    def recording_open(*args):
+        f = open(*args)
+        opened.append(f)
+        return f
+
+    os.remove(str(path) + ".idx")
+    monkeypatch.setattr(adt.log, "open", recording_open, raising=False)
+    for mode in ("r", "a"):
+        with pytest.raises(FileNotFoundError):
+            ADTLog(R, path, mode)
+    assert len(opened) == 2
+    assert all(f.closed for f in opened)
+
+
+def test_shared_batch(MyADT):
+    values = [MyADT.foo(), MyADT.bar(1), MyADT.baz(-2, True, "hé", None)] * 10
+    values.append(MyADT.bar(2 ** 70))
+    with SharedBatch.create(MyADT, values) as batch:
+        assert len(batch) == 31
+        assert list(batch) == values
+        assert [batch[i] for i in (0, 1, 2, -1)] == values[:3] + values[-1:]
+        with pytest.raises(IndexError):
+            batch[31]
+        assert type(batch[2][1]) is bool
+        assert batch.count_by_variant() == {"foo": 10, "bar": 11, "baz": 10}
+        # Readers elsewhere attach by name.
+        with SharedBatch.attach(MyADT, batch.name) as other:
+            assert list(other) == values
+        with SharedBatch.attach(MyADT, batch.name) as other:
+            with other.column("baz", 0) as col:
+                assert col.tolist() == [-2] * 10
+            with pytest.raises(TypeError):
+                other.column("baz", 2)
+            with pytest.raises(KeyError):
+                other.column("other", 0)
+        with pytest.raises(ValueError, match="Batch is of fields"):
+            SharedBatch.attach(Result, batch.name)
+        name = batch.name
+    assert batch.closed
+    # The owner unlinks the block on close.
+    with pytest.raises(FileNotFoundError):
+        SharedBatch.attach(MyADT, name)
+
+    with pytest.raises(TypeError):
+        SharedBatch.create(MyADT, [Option.Empty()])
+
+
+def test_shared_batch_generic():
+    R = Result[int, str]
+    values = [R.Ok(i) if i % 3 else R.Error(str(i)) for i in range(50)]
+    batch = SharedBatch.create(R, values)
+    # Ownership can be handed over, e.g. to a consumer process.
+    batch.release()
+    batch.close()
+    with SharedBatch.attach(R, batch.name, owner=True) as other:
+        assert list(other) == values
+        assert type(other[0]) is R.Error
+        # Only the name is pickled.
+        assert len(pickle.dumps(other)) < 200
+        with pickle.loads(pickle.dumps(other)) as unpickled:
+            assert list(unpickled) == values
+    with pytest.raises(FileNotFoundError):
+        SharedBatch.attach(R, batch.name)
+
+    nested = [Result.Ok([1, 2]), Result.Error(Option[int].Some(1))]
+    with SharedBatch.create(Result, nested) as batch:
+        assert list(batch) == nested
+    with SharedBatch.create(R, []) as batch:
+        assert list(batch) == []
+
+
+@pytest.mark.slow
+def test_shared_batch_process_pool():
+    R = Result[int, str]
+    batches = [
+        SharedBatch.create(R, [R.Ok(i) for i in range(j, j + 10)]) for j in (0, 10)
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(_sum_ok, batches)) == [45, 145]
+    for batch in batches:
+        batch.close()
+
+
+def _sum_ok(batch: SharedBatch) -> int:
+    with batch:
+        return sum(Result.filter_ok(batch))
+
+
+def test_binary_roundtrip(MyADT):
+    R = Result[int, str]
+
+    class _Nested(metaclass=adt.ADTMeta):
+        values: (float, bytes, R, Option[str])
+        plain: (list,)
+
+    cases = [
+        (MyADT, MyADT.foo()),
+        (MyADT, MyADT.bar(-(2 ** 70))),
+        (MyADT, MyADT.baz(300, True, "héllo", None)),
+        (R, R.Ok(0)),
+        (R, R.Error("")),
+        (Result, Result.Ok([1, "a"])),
+        (_Nested, _Nested.values(1.5, b"\x00", R.Ok(1), Option[str].Empty())),
+        (_Nested, _Nested.plain([1, 2])),
+    ]
+    for adt_cls, value in cases:
+        decoded = binary.loads(adt_cls, binary.dumps(adt_cls, value))
+        assert decoded == value
+        assert type(decoded) is type(value)
+    assert binary.dumps(R, R.Ok(1)) == bytes([binary.VERSION, 0, 2])
+
+
+def test_binary_stream(MyADT):
+    values = [MyADT.foo(), MyADT.bar(1), MyADT.baz(2, False, "x" * 1000, None)] * 100
+    fp = io.BytesIO()
+    binary.dump_stream(MyADT, values, fp)
+    fp.seek(0)
+    assert list(binary.load_stream(MyADT, fp)) == values
+    fp = io.BytesIO()
+    binary.dump_stream(MyADT, [], fp)
+    fp.seek(0)
+    assert list(binary.load_stream(MyADT, fp)) == []
+
+
+def test_binary_frees_classes():
+    class _Generic(metaclass=adt.ADTMeta):
+        __generic_cache_size__ = 1
+        T = TypeVar("T")
+
+        foo: (int,)
+        bar: (T,)
+
+    class Arg:
+        pass
+
+    refs = [weakref.ref(Arg), weakref.ref(_Generic[Arg])]
+    binary.dumps(_Generic[Arg], _Generic[Arg].foo(1))
+    binary.dumps(_Generic, _Generic[Arg].foo(1))
+    del Arg
+    # Evict the specialisation, which the codecs mustn't keep alive.
+    _Generic[int]
+    gc.collect()
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None]
+    refs.append(weakref.ref(_Generic))
+    del _Generic
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None, None]
+
+
+def test_pickle():
+    R = Result[int, str]
+    values = [
+        Result.Ok(1),
+        R.Ok(1),
+        R.Error("err"),
+        Option.Empty(),
+        Option[R].Some(R.Ok(2)),
+        Result[Option[int], str].Ok(Option[int].Some(3)),
+        Result[int, Result.E].Error("err"),
+    ]
+    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+        for value in values:
+            loaded = pickle.loads(pickle.dumps(value, protocol))
+            assert loaded == value
+            assert type(loaded) is type(value)
+        assert pickle.loads(pickle.dumps(Result, protocol)) is Result
+        assert pickle.loads(pickle.dumps(R, protocol)) is R
+
+
+def _double_ok(value):
+    return value.map(lambda x: x * 2)
+
+
+@pytest.mark.slow
+def test_pickle_process_pool():
+    R = Result[int, str]
+    values = [R.Ok(i) if i % 3 else R.Error(str(i)) for i in range(100)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(_double_ok, values, chunksize=10))
+    expected = [_double_ok(v) for v in values]
+    assert results == expected
+    assert [type(r) for r in results] == [type(v) for v in expected]
+
+
+def test_bulk_map():
+    R = Result[int, str]
+    values = [R.Ok(i) if i % 3 else R.Error(str(i)) for i in range(100)]
+    cases = {"Ok": lambda x: x + 1, "Error": len}
+    expected_cases = [R.match(v, **cases) for v in values]
+    assert R.bulk_map(values, _double_ok) == [_double_ok(v) for v in values]
+    assert R.bulk_map(values, "with_default", 0) == [v.with_default(0) for v in values]
+    assert R.bulk_map(values, cases) == expected_cases
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = R.bulk_map(values, cases, executor=executor, chunksize=7)
+    assert results == expected_cases
+    assert R.bulk_map([], "with_default", 0, executor=executor) == []
+    with pytest.raises(TypeError, match="Missing case"):
+        R.bulk_map(values, {"Ok": len})
+    with pytest.raises(TypeError):
+        R.bulk_map(values, cases, 1)
+
+
+@pytest.mark.slow
+def test_bulk_map_process_pool():
+    R = Result[int, str]
+    values = [R.Ok(i) if i % 3 else R.Error(str(i)) for i in range(100)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        results = R.bulk_map(values, _double_ok, executor=executor, chunksize=10)
+        expected = [_double_ok(v) for v in values]
+        assert results == expected
+        assert [type(r) for r in results] == [type(v) for v in expected]
+        results = R.bulk_map(values, "map_error", str.upper, executor=executor)
+        assert results == [v.map_error(str.upper) for v in values]
+        # Results that aren't ADT values are sent back as they are.
+        assert R.bulk_map(values, "with_default", -1, executor=executor) == [
+            v.with_default(-1) for v in values
+        ]
+
+
+def test_json_roundtrip(MyADT):
+    R = Result[int, str]
+
+    class _Nested(metaclass=adt.ADTMeta):
+        values: (float, R, Option[str])
+        plain: (list,)
+
+    cases = [
+        (MyADT, MyADT.foo(), '{"tag": "foo", "args": []}'),
+        (
+            MyADT,
+            MyADT.baz(1, True, "hi", None),
+            '{"tag": "baz", "args": [1, true, "hi", null]}',
+        ),
+        (R, R.Ok(1), '{"tag": "Ok", "args": [1]}'),
+        (
+            _Nested,
+            _Nested.values(1.5, R.Error("err"), Option[str].Empty()),
+            '{"tag": "values", "args": [1.5, {"tag": "Error", "args": ["err"]}, '
+            '{"tag": "Empty", "args": []}]}',
+        ),
+        (_Nested, _Nested.plain([1, 2]), '{"tag": "plain", "args": [[1, 2]]}'),
+    ]
+    for adt_cls, value, encoded in cases:
+        assert json_codec.dumps(adt_cls, value) == encoded
+        decoded = json_codec.loads(adt_cls, encoded)
+        assert decoded == value
+        assert type(decoded) is type(value)
+    assert json_codec.to_json(R, R.Ok(1)) == {"tag": "Ok", "args": [1]}
+    assert json_codec.from_json(R, {"tag": "Ok", "args": [1]}) == R.Ok(1)
+    # Ints are accepted for float args.
+    decoded = json_codec.from_json(
+        _Nested,
+        {
+            "tag": "values",
+            "args": [1, {"tag": "Ok", "args": [2]}, {"tag": "Empty", "args": []}],
+        },
+    )
+    assert decoded == _Nested.values(1.0, R.Ok(2), Option[str].Empty())
+    assert type(decoded[0]) is float
+
+
+def test_json_stream(MyADT, monkeypatch):
+    monkeypatch.setattr(json_codec, "_STREAM_CHUNK_SIZE", 7)
+    values = [MyADT.foo(), MyADT.bar(1), MyADT.baz(2, False, "x" * 20, None)] * 10
+    fp = io.StringIO()
+    json_codec.dump_stream(MyADT, values, fp)
+    fp.seek(0)
+    assert list(json_codec.load_stream(MyADT, fp)) == values
+    text = ' [ {"tag": "bar", "args": [1]} ,\n{"tag": "foo", "args": []} ] '
+    assert list(json_codec.load_stream(MyADT, io.StringIO(text))) == [
+        MyADT.bar(1),
+        MyADT.foo(),
+    ]
+    assert list(json_codec.load_stream(MyADT, io.StringIO("[]"))) == []
+
+
+def test_json_frees_classes():
+    class _Generic(metaclass=adt.ADTMeta):
+        __generic_cache_size__ = 1
+        T = TypeVar("T")
+
+        foo: (int,)
+        bar: (T,)
+
+    class Arg:
+        pass
+
+    refs = [weakref.ref(Arg), weakref.ref(_Generic[Arg])]
+    json_codec.dumps(_Generic[Arg], _Generic[Arg].foo(1))
+    json_codec.dumps(_Generic, _Generic[Arg].foo(1))
+    del Arg
+    # Evict the specialisation, which the codecs mustn't keep alive.
+    _Generic[int]
+    gc.collect()
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None]
+    refs.append(weakref.ref(_Generic))
+    del _Generic
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None, None]
+
+
 def test_typing_field():
     class _MyADT(metaclass=adt.ADTMeta):
         field: (Optional[str],)
 
     _MyADT.field("hi")
     _MyADT.field(None)
+    with pytest.raises(TypeError, match=r"Expected instance of type 'Optional\[str\]'"):
+        _MyADT.field(1)
+
+
+def test_typing_field_validation():
+    class _MyADT(metaclass=adt.ADTMeta):
+        __container_sample_size__ = 2
+        T = TypeVar("T")
+        union: (Union[int, str, None], Any)
+        items: (List[int], Tuple[str, ...], Tuple[int, str], Tuple[()])
+        mapping: (Dict[str, List[int]], FrozenSet[str])
+        nested: (Option[int], List[Option[str]])
+        literal: (Literal["a", 1], Annotated[int, "meta"])
+        generic: (T, List[T], Dict[str, Optional[T]])  # noqa: F821
+        unchecked: (List[Any], Iterator[int], Callable[[int], int])
+
+    valid = [
+        _MyADT.union(1, object()),
+        _MyADT.union(None, None),
+        _MyADT.items([1, 2], ("a", "b"), (1, "b"), ()),
+        _MyADT.mapping({"a": [1]}, frozenset({"b"})),
+        _MyADT.nested(Option[int].Some(1), [Option[str].Empty()]),
+        _MyADT.literal("a", 1),
+        _MyADT.generic(1, ["a", 1], {"a": None}),
+        _MyADT.unchecked(["a"], iter([]), len),
+        # Only the first elements of containers are checked.
+        _MyADT.items([1, 2, "a"], ("a", "b", 1), (1, "b"), ()),
+    ]
+    assert len(valid) == 9
+    invalid = [
+        (_MyADT.union, (1.0, None)),
+        (_MyADT.items, ((1, 2), (), (1, "b"), ())),
+        (_MyADT.items, ([1, "a"], (), (1, "b"), ())),
+        (_MyADT.items, ([], (1,), (1, "b"), ())),
+        (_MyADT.items, ([], (), (1, "b", 3), ())),
+        (_MyADT.items, ([], (), ("a", "b"), ())),
+        (_MyADT.items, ([], (), (1, "b"), (1,))),
+        (_MyADT.mapping, ({"a": ["a"]}, frozenset())),
+        (_MyADT.mapping, ({1: [1]}, frozenset())),
+        (_MyADT.mapping, ({}, {"a"})),
+        (_MyADT.nested, (Option[str].Some("a"), [])),
+        (_MyADT.nested, (Option[int].Empty(), [Option[int].Empty()])),
+        (_MyADT.literal, ("b", 1)),
+        (_MyADT.literal, (True, 1)),
+        (_MyADT.literal, ("a", "1")),
+        (_MyADT.generic, (1, (), {})),
+        (_MyADT.unchecked, ((), iter([]), len)),
+        (_MyADT.unchecked, ([], [], len)),
+        (_MyADT.unchecked, ([], iter([]), 1)),
+    ]
+    for field_cls, args in invalid:
+        with pytest.raises(TypeError, match="Expected instance of type"):
+            field_cls(*args)
+
+    # Specialisations check the substituted types.
+    S = _MyADT[int]
+    S.generic(1, [1], {"a": 1, "b": None})
+    for args in [(1, ["a"], {}), (1, [], {"a": "b"}), ("a", [], {})]:
+        with pytest.raises(TypeError, match="Expected instance of type"):
+            S.generic(*args)
+    with pytest.raises(
+        TypeError, match=r"Expected instance of type 'List\[int\]', got 'list'"
+    ):
+        S.generic(1, ["a"], {})
+    assert S.generic.__arg_types__ == (int, List[int], Dict[str, Optional[int]])
+    assert _MyADT[List[int]].__qualname__.endswith("_MyADT[List[int]]")
+    assert _MyADT[List[int]].generic([1], [[1]], {}) == _MyADT[List[int]].generic(
+        [1], [[1]], {}
+    )
+    with pytest.raises(TypeError):
+        _MyADT[List[int]].generic([1], [["a"]], {})
+
+    # Compiled checks are shared between fields with the same types.
+    check = adt._get_check(List[int], 2)
+    assert adt._get_check(List[int], 2) is check
+
+    # Checks are freed with the fields using them, so don't keep type args of
+    # evicted specialisations alive.
+    class _Generic(metaclass=adt.ADTMeta):
+        __generic_cache_size__ = 1
+        T = TypeVar("T")
+
+        items: (list[T],)
+
+    refs = []
+    for _ in range(3):
+
+        class Arg:
+            pass
+
+        refs.append(weakref.ref(Arg))
+        _Generic[Arg].items([Arg()])
+        del Arg
+    gc.collect()
+    gc.collect()
+    assert [ref() for ref in refs[:-1]] == [None, None]
+
+
+def test_typing_field_sample_size():
+    class _Default(metaclass=adt.ADTMeta):
+        values: (List[int], Dict[int, str])
+
+    class _All(metaclass=adt.ADTMeta):
+        __container_sample_size__ = None
+        values: (List[int], Dict[int, str])
+
+    values = [0] * 100 + ["a"]
+    mapping = {i: "a" for i in range(100)}
+    mapping[100] = 1
+    _Default.values(values, mapping)
+    with pytest.raises(TypeError):
+        _All.values(values, {})
+    with pytest.raises(TypeError):
+        _All.values([], mapping)
+    _All.values(list(range(100)), {})
 
 
 # ------------------------------------------------------------------------------
@@ -236,6 +1321,8 @@ def test_init_adt_base_class(MyADT):
 def test_init_adt_field_base_class(MyADT):
     with pytest.raises(TypeError):
         MyADT._FieldBase()
+    with pytest.raises(TypeError):
+        MyADT._FieldBase._unchecked()
 
 
 def test_create_bad_field_annotation():
@@ -246,14 +1333,24 @@ def test_create_bad_field_annotation():
 
 
 def test_bad_field_type(MyADT):
-    with pytest.raises(TypeError):
+    with pytest.raises(TypeError, match="Expected instance of type 'int'"):
         MyADT.bar(None)
     with pytest.raises(TypeError):
         MyADT.baz(None, None, None, None)
+    with pytest.raises(TypeError, match="Expected None, got 'int'"):
+        MyADT.baz(1, False, "hi", 1)
 
 
-def test_extra_field_value(MyADT):
+def test_unhashable_field_value():
+    class _MyADT(metaclass=adt.ADTMeta):
+        field: (list,)
+
     with pytest.raises(TypeError):
+        hash(_MyADT.field([]))
+
+
+def test_extra_field_value(MyADT):
+    with pytest.raises(TypeError, match="Expected 0 arg\\(s\\) for 'foo' field, got 1"):
         MyADT.foo(1)
     with pytest.raises(TypeError):
         MyADT.bar(1, 2)
@@ -273,6 +1370,88 @@ def test_invalid_generic(GenericADT):
         GenericADT[int, int, int]
 
 
+def test_match_missing_case(MyADT):
+    with pytest.raises(TypeError, match="Missing case\\(s\\) for '_MyADT': baz"):
+        MyADT.matcher(foo=lambda: 0, bar=lambda x: x)
+    # Checked cases are remembered, but not missing ones.
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            MyADT.match(MyADT.foo(), foo=lambda: 0)
+
+
+def test_match_unknown_case(MyADT):
+    with pytest.raises(TypeError, match="Unknown case\\(s\\) for '_MyADT': qux"):
+        MyADT.matcher(foo=lambda: 0, bar=lambda x: x, baz=lambda *a: a, qux=lambda: 0)
+
+
+def test_match_wrong_adt(MyADT, OtherADT, GenericADT):
+    matcher = OtherADT.matcher(foo=lambda: 0, bar=lambda x: x)
+    with pytest.raises(TypeError):
+        matcher(MyADT.bar(1))
+    with pytest.raises(TypeError):
+        matcher(1)
+    with pytest.raises(TypeError):
+        OtherADT.match(MyADT.bar(1), foo=lambda: 0, bar=lambda x: x)
+    with pytest.raises(TypeError):
+        OtherADT.match(1, foo=lambda: 0, bar=lambda x: x)
+    generic_matcher = GenericADT[int, str].matcher(
+        foo=lambda x: x, bar=lambda x, y: y, plain=lambda x: -x
+    )
+    with pytest.raises(TypeError):
+        generic_matcher(GenericADT.foo(1))
+
+
+def test_binary_errors(MyADT, OtherADT):
+    with pytest.raises(TypeError):
+        binary.dumps(MyADT, OtherADT.bar(1))
+    with pytest.raises(TypeError):
+        binary.dumps(int, MyADT.bar(1))
+    data = binary.dumps(MyADT, MyADT.baz(1, True, "hi", None))
+    with pytest.raises(ValueError, match="version"):
+        binary.loads(MyADT, b"\xff" + data[1:])
+    with pytest.raises(ValueError, match="Truncated"):
+        binary.loads(MyADT, data[:-1])
+    with pytest.raises(ValueError):
+        binary.loads(MyADT, data + b"\x00")
+    with pytest.raises(ValueError, match="Invalid tag"):
+        binary.loads(MyADT, bytes([binary.VERSION, 5]))
+
+    class _Float(metaclass=adt.ADTMeta):
+        f: (float,)
+
+    with pytest.raises(ValueError, match="Truncated"):
+        binary.loads(_Float, binary.dumps(_Float, _Float.f(1.5))[:-2])
+    fp = io.BytesIO()
+    binary.dump_stream(MyADT, [MyADT.bar(1)] * 2, fp)
+    with pytest.raises(ValueError, match="Truncated"):
+        list(binary.load_stream(MyADT, io.BytesIO(fp.getvalue()[:-1])))
+    with pytest.raises(ValueError):
+        list(binary.load_stream(MyADT, io.BytesIO(b"XYZ\x01")))
+
+
+def test_pickle_local_adt(MyADT):
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        pickle.dumps(MyADT.bar(1))
+
+
+def test_json_errors(MyADT, OtherADT):
+    with pytest.raises(TypeError):
+        json_codec.dumps(MyADT, OtherADT.bar(1))
+    for data in [
+        "[1]",
+        '{"tag": "bar"}',
+        '{"tag": "qux", "args": []}',
+        '{"tag": "bar", "args": {}}',
+        '{"tag": "bar", "args": ["1"]}',
+        '{"tag": "bar", "args": [1, 2]}',
+    ]:
+        with pytest.raises(ValueError):
+            json_codec.loads(MyADT, data)
+    for data in ["{}", '[{"tag": "foo", "args": []}', '[{"tag": "foo", "args": []} 1]']:
+        with pytest.raises(ValueError):
+            list(json_codec.load_stream(MyADT, io.StringIO(data)))
+
+
 # ------------------------------------------------------------------------------
 # Example usage
 # ------------------------------------------------------------------------------
@@ -395,3 +1574,341 @@ def test_result_type():
     assert R_int.Ok(-1).and_then(do_something) == R_bool.Error("Negative value")
     assert error.and_then(do_something) == R_bool.Error("err")
     assert type(error.and_then(do_something)) is R_bool.Error
+
+
+def test_result_pipeline():
+    R_int = Result[int, str]
+    R_bool = Result[bool, str]
+
+    def do_something(value: int) -> R_bool:
+        if value >= 0:
+            return R_bool.Ok(value >= 100)
+        else:
+            return R_bool.Error("Negative value")
+
+    def double(value: int) -> int:
+        return value * 2
+
+    def shout(msg: str) -> str:
+        return msg.upper()
+
+    pipeline = Result.pipeline().map(double).and_then(do_something).map_error(shout)
+    for value in [R_int.Ok(1), R_int.Ok(50), R_int.Ok(-1), R_int.Error("err")]:
+        expected = value.map(double).and_then(do_something).map_error(shout)
+        result = pipeline(value)
+        assert result == expected
+        assert type(result) is type(expected)
+    assert pipeline(R_int.Ok(50)).with_default(None) is True
+    assert pipeline(R_int.Error("err")).map_error(str.lower).with_default(None) is None
+    # An Error skips the remaining steps but still gets the final class.
+    calls = []
+    pipeline = Result.pipeline().map_error(shout).map(calls.append).map(double)
+    result = pipeline(R_int.Error("err"))
+    expected = R_int.Error("err").map_error(shout).map(calls.append).map(double)
+    assert result == expected
+    assert type(result) is type(expected)
+    assert calls == []
+    pipeline = Result.pipeline().map(double).map_error(shout)
+    values = [R_int.Ok(1), R_int.Error("x")]
+    assert list(pipeline.run_many(values)) == [
+        v.map(double).map_error(shout) for v in values
+    ]
+    # The pipeline itself is unchanged by adding steps.
+    empty = Result.pipeline()
+    empty.map(double)
+    assert type(empty(R_int.Ok(1))) is R_int.Ok
+    with pytest.raises(TypeError):
+        Result.pipeline().map(double)(Option.Some(1))
+
+
+def test_option_pipeline():
+    O_int = Option[int]
+
+    def halve(value: int) -> O_int:
+        return O_int.Some(value // 2) if value % 2 == 0 else O_int.Empty()
+
+    def incr(value: int) -> int:
+        return value + 1
+
+    pipeline = Option.pipeline().and_then(halve).map(incr).and_then(halve)
+    for value in [O_int.Some(4), O_int.Some(6), O_int.Some(3), O_int.Empty()]:
+        expected = value.and_then(halve).map(incr).and_then(halve)
+        result = pipeline(value)
+        assert result == expected
+        assert type(result) is type(expected)
+    assert Option.Empty().map(incr) == O_int.Empty()
+    assert list(pipeline.run_many([O_int.Some(2), O_int.Some(4)])) == [
+        O_int.Some(1),
+        O_int.Empty(),
+    ]
+
+
+def test_result_collect():
+    R = Result[int, str]
+    values = [R.Ok(1), Result.Ok(2), R.Error("a"), R.Ok(3), Result.Error("b")]
+    consumed = []
+
+    def stream(values):
+        for value in values:
+            consumed.append(value)
+            yield value
+
+    assert R.collect(stream(values[:2])) == Result[list, str].Ok([1, 2])
+    assert type(R.collect([])) is Result[list, str].Ok
+    result = R.collect(stream(values))
+    assert result == Result[list, str].Error("a")
+    assert type(result) is Result[list, str].Error
+    # Stops consuming at the first Error.
+    assert consumed == values[:2] + values[:3]
+    assert R.collect(values[:2], tuple) == Result[tuple, str].Ok((1, 2))
+    assert R.sequence(iter(values[:2])) == Result[list, str].Ok([1, 2])
+    assert R.sequence(values) == Result[list, str].Error("a")
+
+    assert Result.partition(stream(values)) == ([1, 2, 3], ["a", "b"])
+    assert list(Result.filter_ok(values)) == [1, 2, 3]
+    assert next(Result.filter_ok(iter(values))) == 1
+
+    def check(x: int) -> R:
+        consumed.append(x)
+        return R.Ok(x) if x >= 0 else R.Error(f"negative: {x}")
+
+    consumed.clear()
+    assert R.traverse(range(3), check) == Result[list, str].Ok([0, 1, 2])
+    assert R.traverse([1, -1, -2], check) == Result[list, str].Error("negative: -1")
+    assert consumed == [0, 1, 2, 1, -1]
+
+    # Constant memory for large generators.
+    gen = (R.Ok(i) for i in range(100_000))
+    assert sum(Result.filter_ok(gen)) == sum(range(100_000))
+
+    for func in [Result.collect, Result.partition, Result.filter_ok]:
+        with pytest.raises(TypeError, match="Expected a Result value"):
+            list(func([R.Ok(1), Option.Some(1)]))
+
+
+def test_option_collect():
+    O = Option[int]
+    values = [O.Some(1), Option.Some(2), O.Empty(), O.Some(3)]
+    assert O.collect(values[:2]) == Option[list].Some([1, 2])
+    assert O.collect(values) == Option[list].Empty()
+    assert type(O.collect(values)) is Option[list].Empty
+    assert O.collect(iter(values[:2]), set) == Option[set].Some({1, 2})
+    assert O.sequence([]) == Option[list].Some([])
+    # Factories that aren't types give values of the class collect() is called on.
+    assert type(O.collect(values[:2], sum)) is O.Some
+    assert type(O.collect(values, sum)) is O.Empty
+    assert list(Option.filter_some(values)) == [1, 2, 3]
+
+    calls = []
+
+    def halve(x: int) -> O:
+        calls.append(x)
+        return O.Some(x // 2) if x % 2 == 0 else O.Empty()
+
+    assert O.traverse([2, 4], halve) == Option[list].Some([1, 2])
+    assert O.traverse([2, 3, 4], halve) == Option[list].Empty()
+    assert calls == [2, 4, 2, 3]
+    with pytest.raises(TypeError, match="Expected an Option value"):
+        Option.collect([Result.Ok(1)])
+
+
+def test_async_fieldmethods():
+    R_int = Result[int, str]
+
+    def double(value: int) -> int:
+        return value * 2
+
+    def check(value: int) -> R_int:
+        return R_int.Ok(value) if value > 0 else R_int.Error("not positive")
+
+    def shout(msg: str) -> str:
+        return msg.upper()
+
+    def awaitable(func):
+        # Keep the return annotation, which decides the resulting class.
+        async def wrapper(value):
+            await asyncio.sleep(0)
+            return func(value)
+
+        wrapper.__annotations__ = func.__annotations__
+        return wrapper
+
+    async def run():
+        for value in [R_int.Ok(1), R_int.Ok(0), R_int.Error("err")]:
+            for method, func in [
+                ("map", double),
+                ("and_then", check),
+                ("map_error", shout),
+            ]:
+                expected = getattr(value, method)(func)
+                result = await getattr(value, method + "_async")(awaitable(func))
+                assert result == expected
+                assert type(result) is type(expected)
+        for value in [Option[int].Some(2), Option[int].Empty()]:
+            for method, func in [("map", double), ("and_then", Option.Some)]:
+                expected = getattr(value, method)(func)
+                result = await getattr(value, method + "_async")(awaitable(func))
+                assert result == expected
+                assert type(result) is type(expected)
+
+    asyncio.run(run())
+
+
+def test_result_gather():
+    R_int = Result[int, str]
+    started = []
+    cancelled = []
+
+    async def task(i, delay=0, error=False):
+        started.append(i)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        return R_int.Error(f"error {i}") if error else R_int.Ok(i)
+
+    async def run():
+        result = await R_int.gather([task(i) for i in range(10)], limit=3)
+        assert result == Result[list, str].Ok(list(range(10)))
+        assert await R_int.gather([]) == Result[list, str].Ok([])
+        # Without fail-fast all are run and the first Error in order is given.
+        started.clear()
+        result = await R_int.gather(
+            [task(0, 0.02, error=True), task(1, error=True), task(2)]
+        )
+        assert result == Result[list, str].Error("error 0")
+        assert started == [0, 1, 2]
+        # With fail-fast the first Error to complete wins and the rest are
+        # cancelled, including those not yet started.
+        started.clear()
+        aws = [task(0, 10), task(1, 0.01, error=True), task(2, 10), task(3)]
+        result = await R_int.gather(aws, limit=3, fail_fast=True)
+        assert result == Result[list, str].Error("error 1")
+        assert started == [0, 1, 2]
+        assert sorted(cancelled) == [0, 2]
+        with pytest.raises(TypeError):
+            await R_int.gather([task(0), asyncio.sleep(0)])
+
+    asyncio.run(run())
+
+
+def test_instrumentation():
+    R = Result[int, str]
+    init = R.Ok.__init__
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+
+        class _ADT(metaclass=adt.ADTMeta):
+            foo: (int,)
+
+            @adt.fieldmethod
+            def double(field, basecls):
+                return basecls.foo(field[0] * 2)
+
+        values = [R.Ok(i) for i in range(3)] + [R.Error._unchecked("err")]
+        with pytest.raises(TypeError):
+            R.Ok("wrong")
+        _ADT.foo(1).double()
+        snap = instrumentation.snapshot()
+    finally:
+        instrumentation.disable()
+    assert R.Ok.__init__ is init
+    assert "__del__" not in R.Ok.__dict__
+    assert not instrumentation.is_enabled()
+
+    r_stats = snap[f"{Result.__module__}.Result[int,str]"]
+    assert r_stats["fields"]["Ok"] == {
+        "constructed": 3,
+        "unchecked": 0,
+        "type_errors": 1,
+        "live_estimate": 3,
+    }
+    assert r_stats["fields"]["Error"]["unchecked"] == 1
+    adt_stats = snap[f"{__name__}.test_instrumentation.<locals>._ADT"]
+    assert adt_stats["fields"]["foo"]["constructed"] == 2
+    assert adt_stats["fields"]["foo"]["live_estimate"] == 0
+    assert adt_stats["fieldmethods"]["double"]["calls"] == 1
+    assert adt_stats["fieldmethods"]["double"]["seconds"] > 0
+
+    text = instrumentation.to_prometheus(snap)
+    assert "# TYPE adt_constructed_total counter" in text
+    assert (
+        f'adt_constructed_total{{adt="{Result.__module__}.Result[int,str]",'
+        'field="Ok"} 3'
+    ) in text
+    # Counts are kept after disabling until reset.
+    R.Ok(1)
+    assert instrumentation.snapshot() == snap
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
+    del values
+
+
+def test_instrumentation_shared_instances():
+    class _Result(metaclass=adt.ADTMeta):
+        Empty: ()
+        Error: (str,)
+
+    init = _Result.Error.__init__
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        _Result.flyweight("Error")
+        errors = [_Result.Error("timeout") for _ in range(100)]
+        empties = [_Result.Empty() for _ in range(100)]
+        with pytest.raises(TypeError):
+            _Result.Error(1)
+        snap = instrumentation.snapshot()
+    finally:
+        instrumentation.disable()
+    # Only new instances are counted.
+    fields = snap[f"{__name__}.{_Result.__qualname__}"]["fields"]
+    assert fields == {
+        "Error": {
+            "constructed": 1,
+            "unchecked": 0,
+            "type_errors": 1,
+            "live_estimate": 1,
+        }
+    }
+    # Sharing instances still checks the args once, and isn't counted, after
+    # disabling.
+    assert _Result.Error.__init__ is not init
+    assert _Result.Error("other") is _Result.Error("other")
+    with pytest.raises(TypeError):
+        _Result.Error(1)
+    assert instrumentation.snapshot()[f"{__name__}.{_Result.__qualname__}"] == {
+        "fields": fields,
+        "fieldmethods": {},
+    }
+    _Result.flyweight("Error", maxsize=0)
+    assert _Result.Error.__init__ is init
+    instrumentation.reset()
+    del errors, empties
+
+
+def test_instrumentation_generic():
+    class _Result(metaclass=adt.ADTMeta):
+        T = TypeVar("T")
+
+        Ok: (T,)
+
+    R = _Result[int]
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        values = [R.Ok(1), R.Ok._unchecked(2)]
+        with pytest.raises(TypeError):
+            R.Ok("1")
+        snap = instrumentation.snapshot()
+    finally:
+        instrumentation.disable()
+    # Only the specialisation's counts change, not the generic class's.
+    assert snap[f"{__name__}.{R.__qualname__}"]["fields"] == {
+        "Ok": {"constructed": 1, "unchecked": 1, "type_errors": 1, "live_estimate": 2}
+    }
+    assert f"{__name__}.{_Result.__qualname__}" not in snap
+    instrumentation.reset()
+    del values